@@ -10,3 +10,34 @@
 
 __version__ = "1.0.0"
 __author__ = "Haro Fan"
+
+import importlib
+
+# 按需导入的公共名称（PEP 562）：import haropet 不会加载PyQt5，
+# 只有第一次访问 haropet.HaroPet 等属性时才导入对应模块
+_LAZY_ATTRIBUTES = {
+    "HaroPet": "haropet.haro_pet",
+    "HaroSystemTray": "haropet.system_tray",
+    "UserPanel": "haropet.user_panel",
+    "AnimationManager": "haropet.animation_manager",
+    "InteractionManager": "haropet.interaction_manager",
+    "IconManager": "haropet.icon_manager",
+    "MenuManager": "haropet.menu_manager",
+    "HaroResources": "haropet.resources",
+}
+
+__all__ = ["__version__", "__author__", *_LAZY_ATTRIBUTES]
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    # 缓存到模块字典，之后的访问不再经过 __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -4,78 +4,96 @@
 负责管理宠物的所有动画效果
 """
 
-import math
+import time
 import logging
-from typing import Optional
+from typing import Optional, Dict
 
 from PyQt5.QtCore import Qt, QTimer, QPoint
 from PyQt5.QtGui import QPixmap
 
 from haropet.config_manager import config_manager
-from haropet.resources import HaroResources
+from haropet.frame_clock import ORDER_ANIMATION
+from haropet.timeline import Timeline, get_timeline
 
 logger = logging.getLogger('Haropet.AnimationManager')
 
 class AnimationManager:
     """动画管理器"""
     
-    def __init__(self, pet_widget):
+    def __init__(self, pet_widget, frame_clock):
         self.pet_widget = pet_widget
+        self._frame_clock = frame_clock
         self._is_turning = False
         self._is_swaying = False
-        self._turn_animation_frame = 0
-        self._sway_frame = 0
+        # 动画开始时间（单调时钟，秒）
+        self._turn_start = 0.0
+        self._sway_start = 0.0
+        self._last_tick: Optional[float] = None
         
-        # 定时器 - 降低刷新率以减少CPU占用
-        self._animation_timer = QTimer(self.pet_widget)
-        self._animation_timer.timeout.connect(self._update_animations)
-        self._animation_timer.start(33)  # ~30 FPS，平衡流畅度和性能
+        # 动画时间轴，首次播放时加载
+        self._turn_timeline: Optional[Timeline] = None
+        self._sway_timeline: Optional[Timeline] = None
+        
+        # 唤醒和丢帧统计
+        self._wakeup_count = 0
+        self._dropped_frames = 0
+        self._stats_start = time.monotonic()
+        
+        # 在共享帧时钟上订阅 - 按需启动，空闲时不产生任何唤醒
+        self._frame_clock.add("animation", self._update_animations,
+                              ORDER_ANIMATION, config_manager.ANIMATION_FRAME_INTERVAL)
+    
+    def _arm_timer(self):
+        """有动画开始时开始接收帧"""
+        if not self._frame_clock.is_active("animation"):
+            self._frame_clock.start("animation")
+            logger.debug("动画帧订阅已启动")
+    
+    def _disarm_timer(self):
+        """没有活动动画时停止接收帧"""
+        if self._frame_clock.is_active("animation"):
+            self._frame_clock.stop("animation")
+            logger.debug("动画帧订阅已停止")
+        self._last_tick = None
     
-    def _update_animations(self):
-        """更新所有动画"""
+    def _count_dropped_frames(self, now: float) -> None:
+        """根据两次唤醒的间隔统计被跳过的帧"""
+        if self._last_tick is not None:
+            interval = config_manager.ANIMATION_FRAME_INTERVAL / 1000.0
+            missed = int(round((now - self._last_tick) / interval)) - 1
+            if missed > 0:
+                self._dropped_frames += missed
+        self._last_tick = now
+    
+    def _update_animations(self, now: float):
+        """更新所有动画，进度由真实流逝时间决定，卡顿时直接跳到当前帧"""
+        self._wakeup_count += 1
+        self._count_dropped_frames(now)
+        
         if self._is_turning:
-            self._update_turn_animation()
+            self._update_turn_animation(now)
         elif self._is_swaying:
-            self._update_sway_animation()
+            self._update_sway_animation(now)
+        
+        if not self.is_animating():
+            self._disarm_timer()
     
-    def _update_turn_animation(self):
+    def _update_turn_animation(self, now: float):
         """更新转身动画"""
-        self._turn_animation_frame += 1
-        total_frames = config_manager.TURN_ANIMATION_TOTAL_FRAMES
+        elapsed_ms = (now - self._turn_start) * 1000.0
         
         # 计算动画进度（0.0 - 1.0）
-        progress = min(self._turn_animation_frame / total_frames, 1.0)
-        offset_y = 0
+        progress = min(elapsed_ms / config_manager.TURN_ANIMATION_DURATION, 1.0)
         
-        # 计算跳跃高度和偏移，分为起跳、空中、落地三个阶段
-        if progress < 0.3:
-            # 起跳阶段（0-30%）
-            jump_progress = progress / 0.3
-            jump_height = 50 * (1 - (1 - jump_progress) ** 2)
-            offset_y = -int(jump_height)
-        elif progress < 0.7:
-            # 空中阶段（30%-70%）
-            air_progress = (progress - 0.3) / 0.4
-            jump_height = 50 * (1 - air_progress ** 2)
-            offset_y = -int(jump_height)
-        else:
-            # 落地阶段（70%-100%）
-            land_progress = (progress - 0.7) / 0.3
-            jump_height = 10 * (1 - land_progress)
-            offset_y = -int(jump_height)
+        # 跳跃高度由时间轴采样表给出（起跳、空中、落地三个阶段见 animations/turn.json）
+        offset_y = int(self._turn_timeline.value("y", progress))
         
-        # 更新宠物标签位置
-        pet_label = self.pet_widget.get_pet_label()
-        if pet_label:
-            pet_label.move(100, 100 + offset_y)
+        # 更新宠物标签位置（帧结束时统一提交）
+        self._frame_clock.move_label(100, 100 + offset_y)
         
         # 动画完成，更新状态
-        if self._turn_animation_frame >= total_frames:
-            self._turn_animation_frame = 0
-            
-            pet_label = self.pet_widget.get_pet_label()
-            if pet_label:
-                pet_label.move(100, 100)
+        if progress >= 1.0:
+            self._frame_clock.move_label(100, 100)
             
             # 切换状态
             current_state = self.pet_widget.get_state()
@@ -88,33 +106,44 @@ class AnimationManager:
             
             self._is_turning = False
     
-    def _update_sway_animation(self):
+    def _update_sway_animation(self, now: float):
         """更新摇摆动画"""
-        self._sway_frame += 1
+        elapsed_ms = (now - self._sway_start) * 1000.0
+        progress = elapsed_ms / config_manager.SWAY_DURATION_MS
         
         # 摇摆动画完成，重置状态
-        if self._sway_frame >= config_manager.SWAY_DURATION:
-            self._sway_frame = 0
+        if progress >= 1.0:
             self._is_swaying = False
-            self.pet_widget._pet_label.move(100, 100)
+            self._frame_clock.move_label(100, 100)
         else:
-            # 计算摇摆偏移，使用正弦函数生成平滑的摇摆效果
-            progress = self._sway_frame / config_manager.SWAY_DURATION
-            sway_angle = math.sin(progress * math.pi * 4) * config_manager.SWAY_AMPLITUDE
-            self.pet_widget._pet_label.move(100 + int(sway_angle), 100)
+            # 摇摆偏移由时间轴采样表给出（见 animations/sway.json）
+            sway_angle = self._sway_timeline.value("x", progress) * config_manager.SWAY_AMPLITUDE
+            self._frame_clock.move_label(100 + int(sway_angle), 100)
     
     def start_turn_animation(self):
         """开始转身动画"""
         if not self._is_turning:
+            try:
+                self._turn_timeline = get_timeline("turn")
+            except Exception as e:
+                logger.error(f"加载转身动画失败: {e}")
+                return
             self._is_turning = True
-            self._turn_animation_frame = 0
+            self._turn_start = time.monotonic()
+            self._arm_timer()
             logger.info("开始转身动画")
     
     def start_sway_animation(self):
         """开始摇摆动画"""
         if not self._is_swaying and not self._is_turning:
+            try:
+                self._sway_timeline = get_timeline("sway")
+            except Exception as e:
+                logger.error(f"加载摇摆动画失败: {e}")
+                return
             self._is_swaying = True
-            self._sway_frame = 0
+            self._sway_start = time.monotonic()
+            self._arm_timer()
             logger.info("开始摇摆动画")
     
     def turn_back(self):
@@ -130,12 +159,29 @@ class AnimationManager:
         """停止所有动画"""
         self._is_turning = False
         self._is_swaying = False
-        self._turn_animation_frame = 0
-        self._sway_frame = 0
-        
-        # 使用公共方法获取宠物标签
-        pet_label = self.pet_widget.get_pet_label()
-        if pet_label:
-            pet_label.move(100, 100)
+        self._disarm_timer()
+        self._frame_clock.move_label(100, 100)
         
         logger.info("停止所有动画")
+    
+    def get_timer_stats(self) -> Dict[str, float]:
+        """
+        获取定时器唤醒统计
+        
+        Returns:
+            包含唤醒次数、丢帧数、统计时长、每秒唤醒次数和定时器是否运行的字典
+        """
+        elapsed = max(time.monotonic() - self._stats_start, 1e-6)
+        return {
+            "wakeups": self._wakeup_count,
+            "dropped_frames": self._dropped_frames,
+            "elapsed": elapsed,
+            "wakeups_per_second": self._wakeup_count / elapsed,
+            "timer_active": self._frame_clock.is_active("animation"),
+        }
+    
+    def reset_timer_stats(self) -> None:
+        """重置定时器唤醒统计"""
+        self._wakeup_count = 0
+        self._dropped_frames = 0
+        self._stats_start = time.monotonic()
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+资源清单模块
+启动时扫描一次资源目录，把状态映射到图标文件或"render"（需要绘制），
+目录变化时由QFileSystemWatcher触发重建，查找时不再访问文件系统
+"""
+
+import os
+import logging
+from typing import Dict, List, Optional
+
+from PyQt5.QtCore import QObject, QFileSystemWatcher, pyqtSignal
+from PyQt5.QtGui import QIcon
+
+logger = logging.getLogger('Haropet.AssetManifest')
+
+# 没有图标文件、需要绘制的状态
+RENDER = "render"
+
+# 状态图标文件命名规则（按优先级排列），支持ICO和PNG格式
+STATE_ICON_NAMES: Dict[str, List[str]] = {
+    "normal": ["new_haro_icon.png", "icon.png", "icon.ico", "haropet.png", "haropet.ico"],
+    "happy": ["icon_happy.png", "icon_happy.ico", "haropet_happy.png", "haropet_happy.ico"],
+    "excited": ["icon_excited.png", "icon_excited.ico", "haropet_excited.png", "haropet_excited.ico"],
+    "sleeping": ["icon_sleeping.png", "icon_sleeping.ico", "haropet_sleeping.png", "haropet_sleeping.ico"],
+}
+
+# 托盘默认图标文件（按优先级排列）
+TRAY_ICON_NAMES: List[str] = [
+    "new_haro_icon.png",
+    "icon.ico",
+    "icon_backup.ico",
+    "haropet.ico",
+    "icon.png",
+    "haropet.png",
+]
+
+
+class AssetManifest(QObject):
+    """
+    资源清单
+
+    Args:
+        asset_dir: 图标文件所在目录
+        parent: 父对象
+    """
+
+    changed = pyqtSignal()
+
+    def __init__(self, asset_dir: str, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.asset_dir = asset_dir
+        self._entries: Dict[str, str] = {}
+        self._tray_icon_file: Optional[str] = None
+        self._icons: Dict[str, QIcon] = {}
+
+        self._watcher = QFileSystemWatcher(self)
+        if os.path.isdir(asset_dir):
+            self._watcher.addPath(asset_dir)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """扫描一次资源目录并重建清单"""
+        try:
+            files = {entry.name for entry in os.scandir(self.asset_dir) if entry.is_file()}
+        except OSError as e:
+            logger.warning(f"扫描资源目录失败: {e}")
+            files = set()
+
+        entries = {}
+        for state, names in STATE_ICON_NAMES.items():
+            entries[state] = next(
+                (os.path.join(self.asset_dir, name) for name in names if name in files), RENDER
+            )
+        tray_icon_file = next(
+            (os.path.join(self.asset_dir, name) for name in TRAY_ICON_NAMES if name in files), None
+        )
+
+        self._entries = entries
+        self._tray_icon_file = tray_icon_file
+        self._icons = {}
+        logger.debug(f"资源清单: {entries}, 托盘图标: {tray_icon_file}")
+
+    def _on_directory_changed(self, path: str) -> None:
+        """资源目录变化时重建清单"""
+        logger.info(f"资源目录已变化，重建资源清单: {path}")
+        self.rebuild()
+        self.changed.emit()
+
+    def resolve(self, pet_state: str) -> str:
+        """
+        解析状态对应的资源
+
+        Args:
+            pet_state: 宠物状态，未知状态按normal处理
+
+        Returns:
+            图标文件路径，或RENDER表示需要绘制
+        """
+        entry = self._entries.get(pet_state)
+        if entry is None:
+            entry = self._entries.get("normal", RENDER)
+        return entry
+
+    def icon(self, pet_state: str) -> Optional[QIcon]:
+        """
+        获取状态对应的文件图标（缓存QIcon对象）
+
+        Args:
+            pet_state: 宠物状态
+
+        Returns:
+            QIcon对象，如果该状态需要绘制或文件无效则返回None
+        """
+        path = self.resolve(pet_state)
+        if path == RENDER:
+            return None
+
+        icon = self._icons.get(path)
+        if icon is None:
+            icon = QIcon(path)
+            self._icons[path] = icon
+        return None if icon.isNull() else icon
+
+    def tray_icon_file(self) -> Optional[str]:
+        """获取托盘默认图标文件路径"""
+        return self._tray_icon_file
+
+
+_manifest: Optional[AssetManifest] = None
+
+
+def get_asset_manifest() -> AssetManifest:
+    """获取全局资源清单（首次调用时扫描资源目录）"""
+    global _manifest
+    if _manifest is None:
+        asset_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        _manifest = AssetManifest(asset_dir)
+    return _manifest
@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+"""
+性能基准测试
+用于测量热点路径的耗时，验证性能优化效果
+"""
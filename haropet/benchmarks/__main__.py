@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+"""
+运行离屏基准测试套件: python -m haropet.benchmarks
+"""
+
+import sys
+
+from haropet.benchmarks.suite import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+事件总线基准测试
+测量不同订阅者数量下 EventBus.publish 的吞吐量
+
+用法: python -m haropet.benchmarks.event_bus_bench [--publishes N]
+"""
+
+import sys
+import time
+import argparse
+from typing import Dict, List
+
+from haropet.event_bus import EventBus
+
+SUBSCRIBER_COUNTS = (1, 10, 100)
+
+
+def bench_publish(subscriber_count: int, publishes: int, repeats: int = 5) -> Dict[str, float]:
+    """
+    测量发布吞吐量
+
+    Args:
+        subscriber_count: 订阅者数量
+        publishes: 每轮发布次数
+        repeats: 重复轮数，取最快一轮
+
+    Returns:
+        包含每次发布耗时（微秒）和每秒发布次数的字典
+    """
+    bus = EventBus()
+    bus.clear()
+    event_type = "bench_event"
+
+    def _callback(**kwargs):
+        pass
+
+    for i in range(subscriber_count):
+        bus.subscribe(event_type, _callback, priority=i % 3)
+
+    publish = bus.publish
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(publishes):
+            publish(event_type, state="normal")
+        best = min(best, time.perf_counter() - start)
+
+    bus.clear()
+    return {
+        "subscribers": subscriber_count,
+        "us_per_publish": best / publishes * 1e6,
+        "publishes_per_second": publishes / best,
+    }
+
+
+def run(publishes: int = 20000) -> List[Dict[str, float]]:
+    """运行所有订阅者数量的基准测试"""
+    return [bench_publish(count, publishes) for count in SUBSCRIBER_COUNTS]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="EventBus.publish 吞吐量基准测试")
+    parser.add_argument("--publishes", type=int, default=20000, help="每轮发布次数")
+    args = parser.parse_args(argv)
+
+    print(f"{'订阅者':>8} {'us/次':>10} {'次/秒':>14}")
+    for result in run(args.publishes):
+        print(f"{result['subscribers']:>8} {result['us_per_publish']:>10.2f} {result['publishes_per_second']:>14.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
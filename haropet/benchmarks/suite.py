@@ -0,0 +1,388 @@
+# -*- coding: utf-8 -*-
+"""
+离屏基准测试套件
+在 QT_QPA_PLATFORM=offscreen 下测量热点路径，输出包含中位数和百分位数的JSON，
+并与保存的基线比较，中位数变慢超过阈值时以非零退出码结束
+
+用法: python -m haropet.benchmarks [--quick] [--only PREFIX] [--output PATH]
+                                   [--baseline PATH] [--save-baseline] [--threshold 0.5]
+
+所有配置和缓存都写入临时目录，不影响用户的真实配置。
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+from typing import Callable, Dict, List, Optional
+
+# 默认基线文件（与本模块放在一起）
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# 每个基准的默认采样数和预热次数
+DEFAULT_SAMPLES = 200
+QUICK_SAMPLES = 30
+WARMUP = 5
+
+# 默认回归阈值：中位数比基线慢50%以上（共享机器上中位数的波动可达30%）；
+# 绝对差小于 MIN_DELTA_US 时视为噪声
+DEFAULT_THRESHOLD = 0.5
+MIN_DELTA_US = 5.0
+
+DRAW_SIZES = (48, 100, 200, 400)
+SUBSCRIBER_COUNTS = (1, 10, 100)
+# 发布和入队等微秒级操作每个样本内重复的次数，减小计时误差
+BATCH = 200
+
+
+def measure(fn: Callable[[], None], samples: int, setup: Optional[Callable[[], None]] = None,
+            inner: int = 1, warmup: int = WARMUP) -> List[float]:
+    """
+    逐样本计时
+
+    Args:
+        fn: 被测函数
+        samples: 样本数
+        setup: 每个样本前调用（不计时），用于清空缓存等
+        inner: 每个样本内调用fn的次数，结果取平均
+        warmup: 预热次数（不记录）
+
+    Returns:
+        每次调用的耗时（微秒）
+    """
+    for _ in range(warmup):
+        if setup is not None:
+            setup()
+        fn()
+
+    timings = []
+    perf_counter_ns = time.perf_counter_ns
+    for _ in range(samples):
+        if setup is not None:
+            setup()
+        start = perf_counter_ns()
+        for _ in range(inner):
+            fn()
+        timings.append((perf_counter_ns() - start) / 1000.0 / inner)
+    return timings
+
+
+def summarize(timings: List[float]) -> Dict[str, float]:
+    """计算中位数、百分位数等统计量（微秒）"""
+    ordered = sorted(timings)
+    if len(ordered) >= 2:
+        cuts = statistics.quantiles(ordered, n=100, method="inclusive")
+        p90, p99 = cuts[89], cuts[98]
+    else:
+        p90 = p99 = ordered[0]
+    return {
+        "unit": "us",
+        "n": len(ordered),
+        "median": statistics.median(ordered),
+        "p90": p90,
+        "p99": p99,
+        "min": ordered[0],
+        "max": ordered[-1],
+        "mean": statistics.fmean(ordered),
+    }
+
+
+# ----------------------------------------------------------------------
+# 基准测试
+# ----------------------------------------------------------------------
+
+def bench_draw_haro(samples: int) -> Dict[str, List[float]]:
+    """HaroResources.draw_haro 在不同尺寸下的绘制耗时"""
+    from PyQt5.QtGui import QImage
+    from haropet.resources import HaroResources
+
+    results = {}
+    for size in DRAW_SIZES:
+        image = QImage(size, size, QImage.Format_ARGB32_Premultiplied)
+        results[f"draw_haro.{size}"] = measure(lambda: HaroResources.draw_haro(image), samples)
+    return results
+
+
+def _render_state(icon_manager) -> str:
+    """选择一个需要绘制的状态（有文件图标的状态不经过缓存）"""
+    from haropet.asset_manifest import RENDER
+
+    for state in ("happy", "excited", "sleeping", "normal"):
+        if icon_manager.manifest.resolve(state) == RENDER:
+            return state
+    return "happy"
+
+
+def bench_icon_cache(samples: int) -> Dict[str, List[float]]:
+    """IconManager.get_icon 内存命中、磁盘命中和未命中的耗时"""
+    from haropet.icon_manager import IconManager
+    from haropet.render_cache import render_cache
+
+    icon_manager = IconManager()
+    state = _render_state(icon_manager)
+    get_icon = lambda: icon_manager.get_icon(state)
+
+    def clear_memory() -> None:
+        render_cache.clear("icon")
+
+    def clear_all() -> None:
+        render_cache.clear("icon")
+        icon_manager.disk_cache.clear()
+
+    return {
+        "icon.get.miss": measure(get_icon, samples, setup=clear_all),
+        "icon.get.disk_hit": measure(get_icon, samples, setup=clear_memory),
+        "icon.get.hit": measure(get_icon, samples),
+    }
+
+
+def bench_animated_icon(samples: int) -> Dict[str, List[float]]:
+    """get_animated_icon 按过渡帧数扫一遍进度的耗时（冷缓存和热缓存）"""
+    from haropet.config_manager import config_manager
+    from haropet.icon_manager import IconManager
+    from haropet.render_cache import transition_cache
+
+    icon_manager = IconManager()
+    frames = config_manager.TRANSITION_FRAMES
+    progresses = [i / (frames - 1) for i in range(frames)]
+
+    def sweep() -> None:
+        for progress in progresses:
+            icon_manager.get_animated_icon("normal", "happy", progress)
+
+    return {
+        "animated_icon.sweep_cold": measure(sweep, samples, setup=transition_cache.clear),
+        "animated_icon.sweep_warm": measure(sweep, samples),
+    }
+
+
+def bench_event_bus(samples: int) -> Dict[str, List[float]]:
+    """EventBus.publish 在不同订阅者数量下的耗时"""
+    from haropet.event_bus import EventBus
+
+    bus = EventBus()
+    results = {}
+    for count in SUBSCRIBER_COUNTS:
+        bus.clear()
+        for i in range(count):
+            bus.subscribe("bench_event", lambda **kwargs: None, priority=i % 3)
+        publish = lambda: bus.publish("bench_event", state="normal")
+        results[f"event_bus.publish.{count}"] = measure(publish, samples, inner=BATCH)
+    bus.clear()
+    return results
+
+
+def bench_config_io(samples: int) -> Dict[str, List[float]]:
+    """配置修改（延迟写入入队）和立即保存的耗时"""
+    from haropet.config_manager import config_manager
+
+    counter = [0]
+
+    def set_position() -> None:
+        counter[0] += 1
+        config_manager.set_position(counter[0] % 500, 100)
+
+    results = {
+        "config.set_position": measure(set_position, samples, inner=BATCH),
+        "config.save_position": measure(config_manager.save_position_config, samples),
+        "config.save_user": measure(config_manager.save_user_config, samples),
+    }
+    config_manager.flush()
+    return results
+
+
+def bench_follow_tick(samples: int) -> Dict[str, List[float]]:
+    """跟随模式下一帧（鼠标采样、弹簧积分、屏幕限制、位置提交）的耗时"""
+    from PyQt5.QtGui import QCursor
+    from haropet.haro_pet import HaroPet
+
+    pet = HaroPet()
+    pet.set_follow_enabled(True)
+    clock = pet.frame_clock
+
+    positions = [(200 + (i * 37) % 600, 200 + (i * 53) % 400) for i in range(64)]
+    index = [0]
+    # 计时循环中不处理事件，定时器不会触发；由合成时间逐帧驱动，
+    # 每个样本前进一个跟随帧间隔，弹簧每帧都会积分并移动窗口
+    now = [time.monotonic()]
+
+    def next_frame() -> None:
+        index[0] = (index[0] + 1) % len(positions)
+        QCursor.setPos(*positions[index[0]])
+        now[0] += clock.interval("follow") / 1000.0
+
+    def tick() -> None:
+        clock.tick(now[0])
+
+    commits_before = clock.get_stats()["window_commits"]
+    results = {"follow.tick": measure(tick, samples, setup=next_frame)}
+    commits = clock.get_stats()["window_commits"] - commits_before
+    # 开始几帧和鼠标落在窗口内的帧不会移动窗口；大部分帧都不移动说明测到的不是完整的一帧
+    if commits < samples // 2:
+        print(f"警告: follow.tick 的 {samples + WARMUP} 帧中只有 {commits} 帧移动了窗口",
+              file=sys.stderr)
+
+    pet.set_follow_enabled(False)
+    clock.stop_all()
+    pet.close()
+    return results
+
+
+BENCHMARKS = (
+    ("draw_haro", bench_draw_haro),
+    ("icon", bench_icon_cache),
+    ("animated_icon", bench_animated_icon),
+    ("event_bus", bench_event_bus),
+    ("config", bench_config_io),
+    ("follow", bench_follow_tick),
+)
+
+
+# ----------------------------------------------------------------------
+# 运行和比较
+# ----------------------------------------------------------------------
+
+def _isolate_environment(root: str) -> None:
+    """把配置目录和临时目录指向root，必须在创建配置管理器之前调用"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    home = os.path.join(root, "home")
+    temp = os.path.join(root, "tmp")
+    os.makedirs(home, exist_ok=True)
+    os.makedirs(temp, exist_ok=True)
+    os.environ["HOME"] = home
+    os.environ["APPDATA"] = home
+    os.environ["DOCUMENTS"] = home
+    os.environ["TMPDIR"] = temp
+    tempfile.tempdir = temp
+
+
+def run(samples: int = DEFAULT_SAMPLES, only: Optional[List[str]] = None) -> Dict[str, object]:
+    """
+    运行基准测试
+
+    Args:
+        samples: 每个基准的样本数
+        only: 只运行名称以这些前缀开头的基准
+
+    Returns:
+        包含环境信息和各基准统计量的报告
+    """
+    from PyQt5.QtCore import PYQT_VERSION_STR, QT_VERSION_STR
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+
+    results: Dict[str, Dict[str, float]] = {}
+    for group, bench in BENCHMARKS:
+        if only and not any(group.startswith(prefix) or prefix.startswith(group) for prefix in only):
+            continue
+        for name, timings in bench(samples).items():
+            if only and not any(name.startswith(prefix) for prefix in only):
+                continue
+            results[name] = summarize(timings)
+        app.processEvents()
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "qt": QT_VERSION_STR,
+            "pyqt": PYQT_VERSION_STR,
+            "platform": platform.platform(),
+            "qpa": os.environ.get("QT_QPA_PLATFORM", ""),
+            "samples": samples,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(report: Dict[str, object], baseline: Dict[str, object],
+            threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, object]]:
+    """
+    与基线比较中位数
+
+    Returns:
+        每个基准的比较结果，regression为True表示变慢超过阈值
+    """
+    rows = []
+    base_results = baseline.get("results", {})
+    for name, stats in report["results"].items():
+        base = base_results.get(name)
+        if base is None:
+            rows.append({"name": name, "median": stats["median"], "baseline": None,
+                         "ratio": None, "regression": False})
+            continue
+        ratio = stats["median"] / base["median"] if base["median"] > 0 else float("inf")
+        regression = (ratio > 1.0 + threshold and
+                      stats["median"] - base["median"] >= MIN_DELTA_US)
+        rows.append({"name": name, "median": stats["median"], "baseline": base["median"],
+                     "ratio": ratio, "regression": regression})
+    return rows
+
+
+def format_table(report: Dict[str, object], rows: Optional[List[Dict[str, object]]]) -> str:
+    """生成文字表格"""
+    lines = [f"{'基准':<28} {'中位数us':>11} {'p90':>11} {'p99':>11} {'基线us':>11} {'比值':>7}"]
+    comparison = {row["name"]: row for row in rows or []}
+    for name, stats in report["results"].items():
+        row = comparison.get(name)
+        base = f"{row['baseline']:>11.1f}" if row and row["baseline"] is not None else f"{'-':>11}"
+        ratio = f"{row['ratio']:>7.2f}" if row and row["ratio"] is not None else f"{'-':>7}"
+        flag = "  << 回归" if row and row["regression"] else ""
+        lines.append(f"{name:<28} {stats['median']:>11.1f} {stats['p90']:>11.1f} "
+                     f"{stats['p99']:>11.1f} {base} {ratio}{flag}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="哈罗离屏基准测试套件")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help="每个基准的样本数")
+    parser.add_argument("--quick", action="store_true", help=f"快速模式（{QUICK_SAMPLES} 个样本）")
+    parser.add_argument("--only", nargs="+", metavar="PREFIX", help="只运行名称以这些前缀开头的基准")
+    parser.add_argument("--output", metavar="PATH", help="把JSON报告写入文件（默认输出到标准输出）")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, metavar="PATH", help="基线文件")
+    parser.add_argument("--save-baseline", action="store_true", help="用本次结果覆盖基线文件")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="中位数相对基线变慢多少视为回归（0.25 即 25%%）")
+    args = parser.parse_args(argv)
+
+    samples = QUICK_SAMPLES if args.quick else args.samples
+    root = tempfile.mkdtemp(prefix="haropet_bench_")
+    try:
+        _isolate_environment(root)
+        report = run(samples, args.only)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    rows = None
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            rows = compare(report, json.load(f), args.threshold)
+        report["comparison"] = rows
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"基线已保存: {args.baseline}", file=sys.stderr)
+
+    # 表格输出到标准错误，标准输出保持为纯JSON
+    print(format_table(report, rows), file=sys.stderr)
+
+    regressions = [row["name"] for row in rows or [] if row["regression"]]
+    if regressions:
+        print(f"发现 {len(regressions)} 项性能回归: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+时间轴基准测试
+测量大量轨道的编译耗时和逐帧求值耗时
+
+用法: python -m haropet.benchmarks.timeline_bench [--tracks N] [--ticks N]
+"""
+
+import sys
+import time
+import random
+import argparse
+from typing import Dict, Tuple
+
+from haropet.timeline import EASINGS, TRACK_NAMES, Timeline, compile_track
+
+
+def build_timeline(track_count: int, keyframes: int = 6, seed: int = 0) -> Tuple[Timeline, float]:
+    """
+    生成并编译随机轨道
+
+    Args:
+        track_count: 轨道数量
+        keyframes: 每条轨道的关键帧数
+        seed: 随机种子
+
+    Returns:
+        (时间轴, 编译耗时秒数)
+    """
+    rng = random.Random(seed)
+    easing_names = list(EASINGS)
+    start = time.perf_counter()
+    tracks = {}
+    for i in range(track_count):
+        frames = [[k / (keyframes - 1), rng.uniform(-50, 50), rng.choice(easing_names)]
+                  for k in range(keyframes)]
+        name = f"{TRACK_NAMES[i % len(TRACK_NAMES)]}{i}"
+        tracks[name] = compile_track(name, frames)
+    elapsed = time.perf_counter() - start
+    return Timeline("bench", tracks, len(next(iter(tracks.values())).values)), elapsed
+
+
+def bench_evaluate(timeline: Timeline, ticks: int) -> float:
+    """逐帧求值所有轨道，返回总耗时秒数"""
+    start = time.perf_counter()
+    for tick in range(ticks):
+        timeline.evaluate(tick / ticks)
+    return time.perf_counter() - start
+
+
+def run(track_count: int = 5000, ticks: int = 60) -> Dict[str, float]:
+    """运行基准测试"""
+    timeline, compile_seconds = build_timeline(track_count)
+    evaluate_seconds = bench_evaluate(timeline, ticks)
+    return {
+        "tracks": track_count,
+        "ticks": ticks,
+        "compile_ms": compile_seconds * 1e3,
+        "ms_per_tick": evaluate_seconds / ticks * 1e3,
+        "ns_per_track_sample": evaluate_seconds / (ticks * track_count) * 1e9,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="时间轴编译和求值基准测试")
+    parser.add_argument("--tracks", type=int, default=5000, help="轨道数量")
+    parser.add_argument("--ticks", type=int, default=60, help="求值帧数")
+    args = parser.parse_args(argv)
+
+    result = run(args.tracks, args.ticks)
+    print(f"轨道数: {result['tracks']}, 帧数: {result['ticks']}")
+    print(f"编译: {result['compile_ms']:.1f} ms")
+    print(f"每帧求值: {result['ms_per_tick']:.3f} ms ({result['ns_per_track_sample']:.0f} ns/轨道)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+气泡消息队列
+按优先级排队，合并相同的待显示消息，连击时显示"哈罗×3"，
+并保证两个气泡之间至少间隔 BUBBLE_MIN_INTERVAL，无论消息来得多快界面工作量都有上限
+"""
+
+import time
+import logging
+from typing import Callable, Dict, List, Optional
+
+from PyQt5.QtCore import QObject, QTimer
+
+from haropet.config_manager import config_manager
+
+logger = logging.getLogger('Haropet.BubbleQueue')
+
+
+class _PendingBubble:
+    """排队中的气泡"""
+
+    __slots__ = ("key", "text", "burst_text", "count", "priority", "seq")
+
+    def __init__(self, key: str, text: str, burst_text: str, priority: int, seq: int):
+        self.key = key
+        self.text = text
+        self.burst_text = burst_text
+        self.count = 1
+        self.priority = priority
+        self.seq = seq
+
+    def display_text(self) -> str:
+        """要显示的文本，合并了多次时显示次数"""
+        if self.count == 1:
+            return self.text
+        return f"{self.burst_text}×{self.count}"
+
+
+class BubbleQueue(QObject):
+    """
+    气泡消息队列
+
+    Args:
+        display: 显示气泡的回调，参数为要显示的文本
+        parent: 父对象
+    """
+
+    def __init__(self, display: Callable[[str], None], parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._display = display
+        self._pending: List[_PendingBubble] = []
+        self._seq = 0
+        self._last_shown = float("-inf")
+        self._stats = {"posted": 0, "shown": 0, "coalesced": 0, "dropped": 0}
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._show_next)
+
+    def post(self, message: str, priority: int = 0, coalesce_key: Optional[str] = None,
+             burst_text: Optional[str] = None) -> None:
+        """
+        提交气泡消息
+
+        Args:
+            message: 消息文本
+            priority: 优先级，值越小越先显示
+            coalesce_key: 合并键，相同键的待显示消息合并为一条；默认为消息文本
+            burst_text: 合并后显示的文本前缀（如"哈罗"显示为"哈罗×3"）；默认为消息文本
+        """
+        self._stats["posted"] += 1
+        key = coalesce_key or message
+
+        for pending in self._pending:
+            if pending.key == key:
+                pending.count += 1
+                pending.priority = min(pending.priority, priority)
+                self._stats["coalesced"] += 1
+                return
+
+        self._seq += 1
+        self._pending.append(_PendingBubble(key, message, burst_text or message, priority, self._seq))
+
+        if len(self._pending) > config_manager.BUBBLE_QUEUE_SIZE:
+            # 丢弃优先级最低、最晚提交的消息
+            dropped = max(self._pending, key=lambda p: (p.priority, p.seq))
+            self._pending.remove(dropped)
+            self._stats["dropped"] += 1
+            logger.debug(f"气泡队列已满，丢弃: {dropped.text}")
+
+        self._schedule()
+
+    def clear(self) -> None:
+        """清空待显示的消息"""
+        self._pending.clear()
+        self._timer.stop()
+
+    def pending_count(self) -> int:
+        """待显示的消息数"""
+        return len(self._pending)
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取提交、显示、合并、丢弃次数"""
+        return dict(self._stats, pending=len(self._pending))
+
+    def _schedule(self) -> None:
+        """距离上一个气泡足够久时立即显示，否则等到间隔结束"""
+        if not self._pending or self._timer.isActive():
+            return
+        wait_ms = config_manager.BUBBLE_MIN_INTERVAL - (time.monotonic() - self._last_shown) * 1000
+        if wait_ms <= 0:
+            self._show_next()
+        else:
+            self._timer.start(int(wait_ms) + 1)
+
+    def _show_next(self) -> None:
+        """显示优先级最高的消息"""
+        if not self._pending:
+            return
+        bubble = min(self._pending, key=lambda p: (p.priority, p.seq))
+        self._pending.remove(bubble)
+
+        self._last_shown = time.monotonic()
+        self._stats["shown"] += 1
+        try:
+            self._display(bubble.display_text())
+        except Exception as e:
+            logger.error(f"显示气泡失败: {e}")
+
+        self._schedule()
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+气泡控件模块
+自绘圆角气泡，文字用QStaticText排版；渲染结果按消息文本缓存在
+渲染缓存中，重复的问候只需贴图，不再应用样式表和重新布局
+"""
+
+import logging
+from typing import Optional
+
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtCore import Qt, QPointF, QRectF, QSize
+from PyQt5.QtGui import QColor, QFont, QPainter, QPen, QPixmap, QStaticText, QTransform
+
+from haropet.render_cache import render_cache, palette_hash
+
+logger = logging.getLogger('Haropet.BubbleWidget')
+
+# 气泡样式（与原样式表一致）
+BUBBLE_STYLE = {
+    "text": QColor(0x33, 0x33, 0x33),
+    "background": QColor(255, 255, 255, 200),
+    "border": QColor(80, 180, 80, 200),
+}
+BUBBLE_FONT_FAMILY = "Microsoft YaHei"
+BUBBLE_FONT_SIZE = 10
+BUBBLE_RADIUS = 12
+BUBBLE_BORDER_WIDTH = 2
+BUBBLE_PADDING_X = 14
+BUBBLE_PADDING_Y = 8
+
+
+class BubbleWidget(QWidget):
+    """
+    气泡控件
+
+    show_message() 设置消息并调整大小；paintEvent 只绘制缓存的图像。
+    """
+
+    # 字体和样式哈希在首次使用时解析一次，之后所有气泡共用
+    _font: Optional[QFont] = None
+    _style_key: Optional[str] = None
+
+    def __init__(self, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setVisible(False)
+        self._text = ""
+        self._pixmap: Optional[QPixmap] = None
+
+    @classmethod
+    def bubble_font(cls) -> QFont:
+        """气泡字体（只解析一次，避免每次问候都触发字体回退查找）"""
+        if cls._font is None:
+            cls._font = QFont(BUBBLE_FONT_FAMILY, BUBBLE_FONT_SIZE)
+            cls._style_key = palette_hash(dict(
+                BUBBLE_STYLE, font=cls._font.toString(), radius=BUBBLE_RADIUS,
+                border=BUBBLE_BORDER_WIDTH, padding=(BUBBLE_PADDING_X, BUBBLE_PADDING_Y),
+            ))
+        return cls._font
+
+    def text(self) -> str:
+        """当前消息"""
+        return self._text
+
+    def show_message(self, message: str) -> None:
+        """
+        设置消息，调整大小并重绘
+
+        Args:
+            message: 消息文本
+        """
+        self._text = message
+        self._pixmap = self._get_pixmap(message)
+        size = self._pixmap.size() / self._pixmap.devicePixelRatio()
+        self.resize(size)
+        self.update()
+
+    def clear(self) -> None:
+        """清除消息"""
+        self._text = ""
+        self._pixmap = None
+        self.update()
+
+    def sizeHint(self) -> QSize:
+        if self._pixmap is None:
+            return QSize(0, 0)
+        return self._pixmap.size() / self._pixmap.devicePixelRatio()
+
+    def paintEvent(self, event) -> None:
+        """绘制缓存的气泡图像"""
+        if self._pixmap is None:
+            return
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._pixmap)
+        painter.end()
+
+    def _get_pixmap(self, message: str) -> QPixmap:
+        """从渲染缓存获取气泡图像，未命中时绘制"""
+        font = self.bubble_font()
+        dpr = self.devicePixelRatioF()
+        key = render_cache.make_key("bubble", message, 0, dpr, self._style_key)
+        pixmap = render_cache.get(key)
+        if pixmap is None:
+            pixmap = self.render_bubble(message, font, dpr)
+            render_cache.put(key, pixmap)
+        return pixmap
+
+    @staticmethod
+    def render_bubble(message: str, font: QFont, dpr: float = 1.0) -> QPixmap:
+        """
+        绘制气泡
+
+        Args:
+            message: 消息文本
+            font: 字体
+            dpr: 设备像素比
+
+        Returns:
+            设置好设备像素比的QPixmap
+        """
+        static_text = QStaticText(message)
+        static_text.setTextFormat(Qt.PlainText)
+        static_text.prepare(QTransform(), font)
+        text_size = static_text.size()
+
+        width = int(text_size.width()) + 2 * (BUBBLE_PADDING_X + BUBBLE_BORDER_WIDTH) + 1
+        height = int(text_size.height()) + 2 * (BUBBLE_PADDING_Y + BUBBLE_BORDER_WIDTH) + 1
+
+        pixmap = QPixmap(int(width * dpr), int(height * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+
+        painter = QPainter(pixmap)
+        try:
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setRenderHint(QPainter.TextAntialiasing)
+
+            half = BUBBLE_BORDER_WIDTH / 2
+            painter.setPen(QPen(BUBBLE_STYLE["border"], BUBBLE_BORDER_WIDTH))
+            painter.setBrush(BUBBLE_STYLE["background"])
+            painter.drawRoundedRect(QRectF(half, half, width - BUBBLE_BORDER_WIDTH, height - BUBBLE_BORDER_WIDTH),
+                                    BUBBLE_RADIUS, BUBBLE_RADIUS)
+
+            painter.setFont(font)
+            painter.setPen(BUBBLE_STYLE["text"])
+            painter.drawStaticText(QPointF(BUBBLE_PADDING_X + BUBBLE_BORDER_WIDTH,
+                                           BUBBLE_PADDING_Y + BUBBLE_BORDER_WIDTH), static_text)
+        finally:
+            painter.end()
+
+        logger.debug(f"绘制气泡: {message}")
+        return pixmap
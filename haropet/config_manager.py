@@ -6,66 +6,103 @@
 
 import os
 import json
+import time
+import atexit
 import logging
-from typing import Dict, Optional
+import threading
+from typing import Dict, List, Optional
 
 logger = logging.getLogger('Haropet.ConfigManager')
 
-class ConfigManager:
-    """配置管理器，使用单例模式"""
+# 解析出的配置目录，进程内只解析一次
+_resolved_config_dir: Optional[str] = None
+_config_dir_lock = threading.Lock()
+# 单例创建锁，配置写入线程和GUI线程可能同时首次访问
+_instance_lock = threading.RLock()
+
+
+def _candidate_config_dirs() -> List[str]:
+    """按优先级排列的候选配置目录"""
+    app_config_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config')
+    config_dirs = []
     
-    _instance = None
+    if os.name == 'nt':  # Windows
+        # 首选：APPDATA目录
+        appdata = os.environ.get('APPDATA')
+        if appdata:
+            config_dirs.append(os.path.join(appdata, 'Haropet'))
+        # 备选：文档目录
+        docs = os.environ.get('DOCUMENTS', os.path.join(os.path.expanduser("~"), 'Documents'))
+        config_dirs.append(os.path.join(docs, 'Haropet'))
+        # 备选：应用程序当前目录
+        config_dirs.append(app_config_dir)
+    elif os.name == 'posix':  # Linux/Mac
+        # 首选：用户主目录
+        config_dirs.append(os.path.join(os.path.expanduser("~"), '.haropet'))
+        # 备选：应用程序当前目录
+        config_dirs.append(app_config_dir)
+    else:
+        # 其他系统：当前目录
+        config_dirs.append(app_config_dir)
+    return config_dirs
+
+
+def is_writable_dir(path: str) -> bool:
+    """
+    检查目录是否可写，只调用os.access，不创建任何文件
     
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(ConfigManager, cls).__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
+    目录不存在时检查最近的已存在上级目录，即能否在需要时创建它。
+    """
+    while not os.path.isdir(path):
+        if os.path.exists(path):
+            # 同名文件挡住了目录
+            return False
+        parent = os.path.dirname(path)
+        if parent == path:
+            return False
+        path = parent
+    return os.access(path, os.W_OK | os.X_OK)
+
+
+def resolve_config_dir() -> str:
+    """
+    选择第一个可写的候选配置目录，结果在进程内缓存
     
-    def _get_config_dir(self):
-        """获取适合当前系统的配置目录"""
-        # 尝试多个备选目录
-        config_dirs = []
+    目录本身推迟到第一次保存配置时才创建，启动过程不写磁盘。
+    """
+    global _resolved_config_dir
+    with _config_dir_lock:
+        if _resolved_config_dir is not None:
+            return _resolved_config_dir
         
-        if os.name == 'nt':  # Windows
-            # 首选：APPDATA目录
-            appdata = os.environ.get('APPDATA')
-            if appdata:
-                config_dirs.append(os.path.join(appdata, 'Haropet'))
-            # 备选：文档目录
-            docs = os.environ.get('DOCUMENTS', os.path.join(os.path.expanduser("~"), 'Documents'))
-            config_dirs.append(os.path.join(docs, 'Haropet'))
-            # 备选：应用程序当前目录
-            config_dirs.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config'))
-        elif os.name == 'posix':  # Linux/Mac
-            # 首选：用户主目录
-            config_dirs.append(os.path.join(os.path.expanduser("~"), '.haropet'))
-            # 备选：应用程序当前目录
-            config_dirs.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config'))
-        else:
-            # 其他系统：当前目录
-            config_dirs.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config'))
-        
-        # 选择第一个可写的目录
-        for config_dir in config_dirs:
-            try:
-                # 尝试创建目录
-                os.makedirs(config_dir, exist_ok=True)
-                # 检查权限
-                test_file = os.path.join(config_dir, 'test_permission.txt')
-                with open(test_file, 'w') as f:
-                    f.write('test')
-                os.remove(test_file)
+        for config_dir in _candidate_config_dirs():
+            if is_writable_dir(config_dir):
                 logger.info(f"选择配置目录: {config_dir}")
+                _resolved_config_dir = config_dir
                 return config_dir
-            except Exception as e:
-                logger.warning(f"配置目录不可用: {config_dir}, 错误: {e}")
-                continue
+            logger.warning(f"配置目录不可用: {config_dir}")
         
         # 如果所有目录都失败，返回当前目录
         fallback_dir = os.path.dirname(os.path.abspath(__file__))
         logger.warning(f"所有配置目录都不可用，使用回退目录: {fallback_dir}")
+        _resolved_config_dir = fallback_dir
         return fallback_dir
+
+class ConfigManager:
+    """配置管理器，使用单例模式"""
+    
+    _instance = None
+    
+    def __new__(cls):
+        with _instance_lock:
+            if cls._instance is None:
+                cls._instance = super(ConfigManager, cls).__new__(cls)
+                cls._instance._initialized = False
+        return cls._instance
+    
+    def _get_config_dir(self):
+        """获取适合当前系统的配置目录（进程内只解析一次）"""
+        return resolve_config_dir()
     
     def __init__(self):
         if self._initialized:
@@ -81,26 +118,52 @@ class ConfigManager:
         self.PET_SIZE = 200
         
         # 动画相关常量
-        self.TURN_ANIMATION_TOTAL_FRAMES = 16
+        self.ANIMATION_FRAME_INTERVAL = 33  # ms，~30 FPS，仅在有动画时运行
+        # 动画按单调时钟计时，时长与帧率无关
         self.TURN_ANIMATION_DURATION = 800  # ms
-        self.SWAY_DURATION = 40
+        self.SWAY_DURATION_MS = 1320  # ms
         self.SWAY_AMPLITUDE = 15
         self.BUBBLE_DURATION = 2000  # ms
+        self.BUBBLE_MIN_INTERVAL = 600  # ms，两个气泡之间的最短间隔
+        self.BUBBLE_QUEUE_SIZE = 8  # 最多排队的气泡数
         
-        # 跟随相关常量
-        self.FOLLOW_DISTANCE_THRESHOLD_CLOSE = 100
-        self.FOLLOW_DISTANCE_THRESHOLD_MEDIUM = 300
-        self.FOLLOW_EASING_CLOSE = 0.05
-        self.FOLLOW_EASING_MEDIUM = 0.03
-        self.FOLLOW_EASING_FAR = 0.02
+        # 跟随相关常量（临界阻尼弹簧）
+        self.FOLLOW_SPRING_OMEGA = 5.0  # rad/s，越大跟得越紧
+        self.FOLLOW_SPRING_STEP_MS = 8  # 固定积分步长
+        self.FOLLOW_LEAD_TIME = 0.08  # 秒，按鼠标速度提前量
+        self.FOLLOW_REST_DISTANCE = 0.5  # 像素，小于该距离且速度很小时视为静止
+        self.FOLLOW_REST_SPEED = 2.0  # 像素/秒
         self.MOUSE_MOVEMENT_THRESHOLD = 10
         self.FOLLOW_MARGIN = 50
         
+        # 拖动相关常量
+        self.DRAG_FRAME_INTERVAL = 16  # ms，拖动时每帧最多移动一次窗口
+        self.DRAG_NOTIFY_INTERVAL = 50  # ms，mouse_move 信号的最小间隔
+        self.DRAG_VELOCITY_SAMPLES = 8  # 拖动速度环形缓冲区大小
+        
+        # 甩出滑行相关常量
+        self.GLIDE_MIN_SPEED = 300.0  # 像素/秒，松开时低于该速度不滑行
+        self.GLIDE_MAX_SPEED = 4000.0  # 像素/秒
+        self.GLIDE_FRICTION = 3.0  # 每秒速度衰减系数（指数）
+        self.GLIDE_BOUNCE = 0.6  # 碰到屏幕边缘时保留的速度比例
+        self.GLIDE_STOP_SPEED = 20.0  # 像素/秒，低于该速度时停止
+        
+        # 鼠标采样相关常量（自适应轮询）
+        self.MOUSE_POLL_INTERVAL_ACTIVE = 16  # ms，~60 FPS，鼠标移动时
+        self.MOUSE_POLL_INTERVAL_IDLE = 250  # ms，鼠标静止时
+        self.MOUSE_IDLE_TIMEOUT = 1000  # ms，鼠标静止多久后降频
+        
         # 点击相关常量
         self.CLICK_DOUBLE_THRESHOLD = 0.5  # seconds
         self.CLICK_RESET_TIMEOUT = 1500  # ms
         self.CLICK_COUNT_FOR_TURN_AROUND = 3
         
+        # 渲染缓存字节预算（图标、资源、托盘共享）
+        self.RENDER_CACHE_MAX_BYTES = 8 * 1024 * 1024
+        # 状态过渡帧条的独立预算，避免过渡动画挤掉静态图标
+        self.TRANSITION_CACHE_MAX_BYTES = 1024 * 1024
+        self.TRANSITION_FRAMES = 12  # 每个过渡的固定帧数
+        
         # 颜色配置
         self.COLORS = {
             "body": (80, 180, 80),
@@ -132,10 +195,26 @@ class ConfigManager:
             "state": "normal"
         }
         
-        # 初始化
-        self._create_config_dir()
+        # 延迟写入（write-behind）相关
+        self.SAVE_DELAY = 0.5  # 秒，合并该时间窗口内的多次修改
+        self.SAVE_FSYNC = False  # 是否在替换文件前fsync
+        self._config_files = {
+            "user": (self._user_config_file, lambda: self.user_config),
+            "position": (self._position_config_file, lambda: self.position_config),
+        }
+        self._dirty = set()
+        self._last_dirty_time = 0.0
+        self._save_cond = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._writer_thread = None
+        self._write_stats = {"requested": 0, "written": 0}
+        
+        # 初始化（配置目录在第一次保存时才创建）
         self.load_config()
         
+        # 确保进程退出前写入所有未保存的修改
+        atexit.register(self.flush)
+        
         self._initialized = True
     
     def _create_config_dir(self):
@@ -174,51 +253,115 @@ class ConfigManager:
         except Exception as e:
             logger.error(f"加载位置配置失败: {e}")
     
-    def save_user_config(self):
-        """保存用户配置"""
-        try:
-            # 确保目录存在
-            self._create_config_dir()
-            
-            # 使用临时文件写入，避免写入失败导致文件损坏
-            temp_file = self._user_config_file + '.tmp'
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(self.user_config, f, ensure_ascii=False, indent=2)
-            
-            # 重命名临时文件为目标文件
-            if os.path.exists(self._user_config_file):
-                try:
-                    os.remove(self._user_config_file)
-                except Exception as e:
-                    logger.warning(f"删除旧配置文件失败: {e}")
-            
-            os.rename(temp_file, self._user_config_file)
-            logger.info(f"保存用户配置: {self._user_config_file}")
-        except Exception as e:
-            logger.error(f"保存用户配置失败: {e}")
+    def _write_json_atomic(self, path: str, data: dict) -> None:
+        """原子地写入JSON文件：写临时文件后用os.replace替换"""
+        temp_file = path + '.tmp'
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            if self.SAVE_FSYNC:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_file, path)
     
-    def save_position_config(self):
-        """保存位置配置"""
-        try:
-            # 确保目录存在
-            self._create_config_dir()
-            
-            # 使用临时文件写入，避免写入失败导致文件损坏
-            temp_file = self._position_config_file + '.tmp'
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(self.position_config, f, ensure_ascii=False, indent=2)
-            
-            # 重命名临时文件为目标文件
-            if os.path.exists(self._position_config_file):
-                try:
-                    os.remove(self._position_config_file)
-                except Exception as e:
-                    logger.warning(f"删除旧配置文件失败: {e}")
+    def _write_configs(self, names) -> bool:
+        """写入指定的配置文件（调用方需持有_io_lock），全部成功时返回True"""
+        ok = True
+        for name in sorted(names):
+            path, get_data = self._config_files[name]
+            # 在锁外修改的字典可能正被GUI线程更新，先复制一份
+            data = dict(get_data())
+            try:
+                # 确保目录存在
+                self._create_config_dir()
+                self._write_json_atomic(path, data)
+                with self._save_cond:
+                    self._write_stats["written"] += 1
+                logger.info(f"保存配置: {path}")
+            except Exception as e:
+                logger.error(f"保存配置失败 {path}: {e}")
+                ok = False
+        return ok
+    
+    def _take_dirty(self) -> set:
+        """取出并清空待写入的配置集合"""
+        with self._save_cond:
+            names = self._dirty
+            self._dirty = set()
+            return names
+    
+    def _schedule_save(self, name: str) -> None:
+        """
+        标记配置为待写入，由后台线程合并后统一写入
+        
+        :param name: 配置名称（"user" 或 "position"）
+        """
+        with self._save_cond:
+            self._dirty.add(name)
+            self._last_dirty_time = time.monotonic()
+            self._write_stats["requested"] += 1
+            if self._writer_thread is None:
+                self._writer_thread = threading.Thread(
+                    target=self._writer_loop, name="HaropetConfigWriter", daemon=True
+                )
+                self._writer_thread.start()
+            self._save_cond.notify()
+    
+    def _writer_loop(self) -> None:
+        """后台写入线程：等待修改平静SAVE_DELAY秒后写入一次"""
+        while True:
+            with self._save_cond:
+                while not self._dirty:
+                    self._save_cond.wait()
+                # 在延迟窗口内持续有修改时继续等待，合并为一次写入
+                while self._dirty:
+                    remaining = self._last_dirty_time + self.SAVE_DELAY - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._save_cond.wait(remaining)
             
-            os.rename(temp_file, self._position_config_file)
-            logger.info(f"保存位置配置: {self._position_config_file}")
-        except Exception as e:
-            logger.error(f"保存位置配置失败: {e}")
+            with self._io_lock:
+                names = self._take_dirty()
+                if names:
+                    self._write_configs(names)
+    
+    def flush(self) -> None:
+        """立即同步写入所有待保存的配置（退出前调用）"""
+        with self._io_lock:
+            names = self._take_dirty()
+            if names:
+                self._write_configs(names)
+    
+    def get_write_stats(self) -> Dict[str, int]:
+        """
+        获取配置写入统计
+        
+        :return: 包含请求次数、实际写入次数、被合并省去的写入次数和待写入数量的字典
+        """
+        with self._save_cond:
+            requested = self._write_stats["requested"]
+            written = self._write_stats["written"]
+            return {
+                "requested": requested,
+                "written": written,
+                "avoided": max(requested - written, 0),
+                "pending": len(self._dirty),
+            }
+    
+    def save_user_config(self) -> bool:
+        """立即保存用户配置，返回是否成功"""
+        with self._io_lock:
+            with self._save_cond:
+                self._dirty.discard("user")
+                self._write_stats["requested"] += 1
+            return self._write_configs(["user"])
+    
+    def save_position_config(self) -> bool:
+        """立即保存位置配置，返回是否成功"""
+        with self._io_lock:
+            with self._save_cond:
+                self._dirty.discard("position")
+                self._write_stats["requested"] += 1
+            return self._write_configs(["position"])
     
     def get(self, key, default=None):
         """获取配置值"""
@@ -227,7 +370,7 @@ class ConfigManager:
     def set(self, key, value):
         """设置配置值"""
         self.user_config[key] = value
-        self.save_user_config()
+        self._schedule_save("user")
     
     def get_user_name(self) -> str:
         """获取用户名"""
@@ -236,7 +379,7 @@ class ConfigManager:
     def set_user_name(self, name: str):
         """设置用户名"""
         self.user_config["user_name"] = name
-        self.save_user_config()
+        self._schedule_save("user")
     
     def get_follow_enabled(self) -> bool:
         """获取跟随模式状态"""
@@ -245,7 +388,7 @@ class ConfigManager:
     def set_follow_enabled(self, enabled: bool):
         """设置跟随模式状态"""
         self.user_config["follow_enabled"] = enabled
-        self.save_user_config()
+        self._schedule_save("user")
     
     def get_position(self) -> Dict[str, int]:
         """获取位置配置"""
@@ -258,7 +401,7 @@ class ConfigManager:
         """设置位置配置"""
         self.position_config["x"] = x
         self.position_config["y"] = y
-        self.save_position_config()
+        self._schedule_save("position")
     
     def get_state(self) -> str:
         """获取宠物状态"""
@@ -267,11 +410,28 @@ class ConfigManager:
     def set_state(self, state: str):
         """设置宠物状态"""
         self.position_config["state"] = state
-        self.save_position_config()
+        self._schedule_save("position")
     
     def get_app_data_path(self) -> str:
         """获取应用数据路径"""
         return self._config_dir
+    
+    def is_config_dir_writable(self) -> bool:
+        """配置目录是否可写（os.access检查，不写测试文件）"""
+        return is_writable_dir(self._config_dir)
+
+
+def get_config_manager() -> ConfigManager:
+    """获取全局配置管理器（首次调用时创建并加载配置）"""
+    with _instance_lock:
+        return ConfigManager()
+
 
-# 创建全局配置管理器实例
-config_manager = ConfigManager()
+def __getattr__(name):
+    # 全局实例在第一次访问 config_manager 时才创建（PEP 562），
+    # 导入本模块本身不读取配置也不探测目录
+    if name == "config_manager":
+        instance = get_config_manager()
+        globals()["config_manager"] = instance
+        return instance
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -25,18 +25,39 @@ class EventBus:
         if self._initialized:
             return
         
-        # 事件订阅者字典
-        # 格式: {event_type: [(callback, priority, unique_id), ...]}
-        self._subscribers: Dict[str, List[Tuple[Callable, int, str]]] = {}
+        # 事件订阅者字典，值为按优先级降序排列的不可变元组
+        # 格式: {event_type: ((callback, priority, unique_id), ...)}
+        # 修改时整体替换元组（写时复制），publish无需加锁即可安全读取
+        self._subscribers: Dict[str, Tuple[Tuple[Callable, int, str], ...]] = {}
+        
+        # 订阅ID索引，用于O(1)定位订阅
+        # 格式: {unique_id: (event_type, index)}
+        self._callback_index: Dict[str, Tuple[str, int]] = {}
         
         # 用于生成唯一ID的计数器
         self._callback_id_counter = 0
         
-        # 线程锁，确保线程安全
+        # 写锁，只保护订阅和取消订阅
         self._lock = threading.RLock()
         
         self._initialized = True
     
+    def _replace_subscribers(self, event_type: str, subscribers: Tuple[Tuple[Callable, int, str], ...], start: int = 0) -> None:
+        """
+        替换事件的订阅者元组并更新索引（调用方需持有写锁）
+        
+        :param event_type: 事件类型
+        :param subscribers: 新的订阅者元组
+        :param start: 从该位置起的订阅位置发生了变化
+        """
+        if subscribers:
+            self._subscribers[event_type] = subscribers
+        else:
+            self._subscribers.pop(event_type, None)
+        
+        for i in range(start, len(subscribers)):
+            self._callback_index[subscribers[i][2]] = (event_type, i)
+    
     def subscribe(self, event_type: str, callback: Callable, priority: int = 0) -> str:
         """
         订阅事件
@@ -51,16 +72,19 @@ class EventBus:
             self._callback_id_counter += 1
             callback_id = f"callback_{self._callback_id_counter}"
             
-            # 添加到订阅者列表
-            if event_type not in self._subscribers:
-                self._subscribers[event_type] = []
-            
-            self._subscribers[event_type].append((callback, priority, callback_id))
+            # 插入到同优先级订阅者之后，保持已排序且稳定的顺序
+            subscribers = self._subscribers.get(event_type, ())
+            position = len(subscribers)
+            for i, (_, existing_priority, _) in enumerate(subscribers):
+                if existing_priority < priority:
+                    position = i
+                    break
             
-            # 按优先级排序
-            self._subscribers[event_type].sort(key=lambda x: x[1], reverse=True)
+            new_subscribers = subscribers[:position] + ((callback, priority, callback_id),) + subscribers[position:]
+            self._replace_subscribers(event_type, new_subscribers, position)
             
-            logger.debug(f"订阅事件: {event_type}, 回调ID: {callback_id}, 优先级: {priority}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("订阅事件: %s, 回调ID: %s, 优先级: %s", event_type, callback_id, priority)
             return callback_id
     
     def unsubscribe(self, callback_id: str) -> bool:
@@ -71,18 +95,19 @@ class EventBus:
         :return: 是否取消成功
         """
         with self._lock:
-            for event_type, subscribers in self._subscribers.items():
-                for i, (_, _, id) in enumerate(subscribers):
-                    if id == callback_id:
-                        del subscribers[i]
-                        logger.debug(f"取消订阅事件: {event_type}, 回调ID: {callback_id}")
-                        # 如果该事件类型没有订阅者了，删除该事件类型
-                        if not subscribers:
-                            del self._subscribers[event_type]
-                        return True
+            location = self._callback_index.pop(callback_id, None)
+            if location is None:
+                logger.warning("未找到订阅ID: %s", callback_id)
+                return False
             
-            logger.warning(f"未找到订阅ID: {callback_id}")
-            return False
+            event_type, index = location
+            subscribers = self._subscribers[event_type]
+            # 如果该事件类型没有订阅者了，_replace_subscribers会删除该事件类型
+            self._replace_subscribers(event_type, subscribers[:index] + subscribers[index + 1:], index)
+            
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("取消订阅事件: %s, 回调ID: %s", event_type, callback_id)
+            return True
     
     def unsubscribe_by_event_type(self, event_type: str, callback: Callable) -> bool:
         """
@@ -94,24 +119,22 @@ class EventBus:
         """
         with self._lock:
             if event_type not in self._subscribers:
-                logger.warning(f"未找到事件类型: {event_type}")
+                logger.warning("未找到事件类型: %s", event_type)
                 return False
             
-            original_length = len(self._subscribers[event_type])
-            self._subscribers[event_type] = [
-                (cb, prio, id) for cb, prio, id in self._subscribers[event_type] 
-                if cb is not callback
-            ]
-            
-            # 如果该事件类型没有订阅者了，删除该事件类型
-            if not self._subscribers[event_type]:
-                del self._subscribers[event_type]
+            subscribers = self._subscribers[event_type]
+            remaining = tuple(entry for entry in subscribers if entry[0] is not callback)
             
-            is_removed = len(self._subscribers.get(event_type, [])) < original_length
+            is_removed = len(remaining) < len(subscribers)
             if is_removed:
-                logger.debug(f"取消订阅事件类型: {event_type}, 回调: {callback.__name__}")
+                for entry in subscribers:
+                    if entry[0] is callback:
+                        del self._callback_index[entry[2]]
+                # 如果该事件类型没有订阅者了，_replace_subscribers会删除该事件类型
+                self._replace_subscribers(event_type, remaining)
+                logger.debug("取消订阅事件类型: %s, 回调: %s", event_type, getattr(callback, '__name__', callback))
             else:
-                logger.warning(f"未找到回调函数: {callback.__name__} 订阅事件类型: {event_type}")
+                logger.warning("未找到回调函数: %s 订阅事件类型: %s", getattr(callback, '__name__', callback), event_type)
             
             return is_removed
     
@@ -119,22 +142,25 @@ class EventBus:
         """
         发布事件
         
+        读取路径不加锁：订阅者元组不可变，订阅变化时整体替换，
+        因此发布期间订阅或取消订阅不会影响本次分发。
+        
         :param event_type: 事件类型
         :param kwargs: 事件数据
         """
-        logger.debug(f"发布事件: {event_type}, 数据: {kwargs}")
+        subscribers = self._subscribers.get(event_type)
         
-        with self._lock:
-            subscribers = self._subscribers.get(event_type, [])
-            # 创建订阅者列表的副本，以防止在处理事件时修改列表
-            subscribers_copy = subscribers.copy()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("发布事件: %s, 数据: %s", event_type, kwargs)
+        
+        if not subscribers:
+            return
         
-        # 在锁外执行回调，避免死锁
-        for callback, _, callback_id in subscribers_copy:
+        for callback, _, callback_id in subscribers:
             try:
                 callback(**kwargs)
             except Exception as e:
-                logger.error(f"处理事件 {event_type} 时出错，回调ID: {callback_id}: {e}", exc_info=True)
+                logger.error("处理事件 %s 时出错，回调ID: %s: %s", event_type, callback_id, e, exc_info=True)
     
     def get_subscriber_count(self, event_type: str = None) -> int:
         """
@@ -145,8 +171,8 @@ class EventBus:
         """
         with self._lock:
             if event_type is None:
-                return sum(len(subscribers) for subscribers in self._subscribers.values())
-            return len(self._subscribers.get(event_type, []))
+                return len(self._callback_index)
+            return len(self._subscribers.get(event_type, ()))
     
     def list_event_types(self) -> List[str]:
         """
@@ -165,11 +191,13 @@ class EventBus:
         """
         with self._lock:
             if event_type is None:
-                self._subscribers.clear()
+                self._subscribers = {}
+                self._callback_index.clear()
                 logger.info("清除所有事件订阅")
             else:
                 if event_type in self._subscribers:
-                    del self._subscribers[event_type]
+                    for _, _, callback_id in self._subscribers.pop(event_type):
+                        self._callback_index.pop(callback_id, None)
                     logger.info(f"清除事件类型 {event_type} 的所有订阅")
 
 # 创建全局事件总线实例
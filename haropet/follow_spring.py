@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+跟随弹簧模块
+临界阻尼弹簧以固定步长积分，位置和速度用浮点保存（亚像素），
+只有整数位置变化时才需要移动窗口，到达目标后进入静止状态
+"""
+
+import logging
+from typing import Optional, Tuple
+
+from haropet.config_manager import config_manager
+
+logger = logging.getLogger('Haropet.FollowSpring')
+
+# 单帧最多积分的时长（秒），避免长时间卡顿后一次跳过去
+_MAX_FRAME_TIME = 0.1
+
+
+class SpringFollower:
+    """
+    临界阻尼弹簧跟随器
+
+    加速度 a = ω²(target - x) - 2ωv，ω 为 FOLLOW_SPRING_OMEGA；
+    使用半隐式欧拉法按 FOLLOW_SPRING_STEP_MS 固定步长积分，与帧率无关。
+    """
+
+    def __init__(self):
+        self._x = 0.0
+        self._y = 0.0
+        self._vx = 0.0
+        self._vy = 0.0
+        self._target_x = 0.0
+        self._target_y = 0.0
+        self._accumulator = 0.0
+        self._last_time: Optional[float] = None
+        self._at_rest = True
+
+        # 鼠标速度估计（用于提前量）
+        self._cursor_x: Optional[float] = None
+        self._cursor_y = 0.0
+        self._cursor_time = 0.0
+        self._cursor_vx = 0.0
+        self._cursor_vy = 0.0
+
+    def reset(self, x: int, y: int) -> None:
+        """把跟随器同步到窗口的当前位置并停止"""
+        self._x = self._target_x = float(x)
+        self._y = self._target_y = float(y)
+        self._vx = self._vy = 0.0
+        self._accumulator = 0.0
+        self._last_time = None
+        self._at_rest = True
+
+    def sync_position(self, x: int, y: int) -> None:
+        """
+        采用窗口的实际位置，保留速度和目标
+
+        Args:
+            x: 窗口x坐标
+            y: 窗口y坐标
+        """
+        self._x = float(x)
+        self._y = float(y)
+
+    def track_cursor(self, x: int, y: int, now: float) -> Tuple[float, float]:
+        """
+        记录鼠标位置并估计速度
+
+        Args:
+            x: 鼠标x坐标
+            y: 鼠标y坐标
+            now: 单调时钟时间（秒）
+
+        Returns:
+            加上提前量后的鼠标位置
+        """
+        if self._cursor_x is not None:
+            dt = now - self._cursor_time
+            if 0.0 < dt < 0.5:
+                # 指数平滑，避免单次采样抖动
+                self._cursor_vx += ((x - self._cursor_x) / dt - self._cursor_vx) * 0.5
+                self._cursor_vy += ((y - self._cursor_y) / dt - self._cursor_vy) * 0.5
+            else:
+                self._cursor_vx = self._cursor_vy = 0.0
+        self._cursor_x, self._cursor_y, self._cursor_time = float(x), float(y), now
+
+        lead = config_manager.FOLLOW_LEAD_TIME
+        return x + self._cursor_vx * lead, y + self._cursor_vy * lead
+
+    def set_target(self, x: float, y: float) -> None:
+        """设置目标位置，目标变化时离开静止状态"""
+        if x != self._target_x or y != self._target_y:
+            self._target_x = x
+            self._target_y = y
+            self._at_rest = False
+
+    def step(self, now: float) -> Tuple[int, int]:
+        """
+        推进到指定时间
+
+        Args:
+            now: 单调时钟时间（秒）
+
+        Returns:
+            取整后的位置
+        """
+        if self._at_rest:
+            self._last_time = now
+            return self.position()
+
+        if self._last_time is None:
+            self._last_time = now
+        self._accumulator += min(now - self._last_time, _MAX_FRAME_TIME)
+        self._last_time = now
+
+        omega = config_manager.FOLLOW_SPRING_OMEGA
+        k = omega * omega
+        c = 2.0 * omega
+        dt = config_manager.FOLLOW_SPRING_STEP_MS / 1000.0
+        while self._accumulator >= dt:
+            self._vx += (k * (self._target_x - self._x) - c * self._vx) * dt
+            self._vy += (k * (self._target_y - self._y) - c * self._vy) * dt
+            self._x += self._vx * dt
+            self._y += self._vy * dt
+            self._accumulator -= dt
+
+        rest_distance = config_manager.FOLLOW_REST_DISTANCE
+        rest_speed = config_manager.FOLLOW_REST_SPEED
+        if abs(self._target_x - self._x) < rest_distance and abs(self._target_y - self._y) < rest_distance \
+                and abs(self._vx) < rest_speed and abs(self._vy) < rest_speed:
+            # 到达目标，停在目标位置
+            self._x, self._y = self._target_x, self._target_y
+            self._vx = self._vy = 0.0
+            self._accumulator = 0.0
+            self._at_rest = True
+
+        return self.position()
+
+    def position(self) -> Tuple[int, int]:
+        """取整后的当前位置"""
+        return int(round(self._x)), int(round(self._y))
+
+    def is_at_rest(self) -> bool:
+        """是否已静止"""
+        return self._at_rest
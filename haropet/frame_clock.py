@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+帧时钟模块
+所有逐帧更新（跟随、动画、特效）共用一个定时器，按固定顺序调用，
+每帧结束时统一提交一次窗口和宠物标签的位置
+"""
+
+import time
+import logging
+from typing import Callable, Dict, Optional, Tuple
+
+from PyQt5.QtCore import QObject, QTimer, QPoint, pyqtSignal
+
+logger = logging.getLogger('Haropet.FrameClock')
+
+# 订阅者调用顺序：先处理输入（跟随），再推进动画，最后是特效
+ORDER_INPUT = 0
+ORDER_ANIMATION = 10
+ORDER_EFFECTS = 20
+
+
+class _Subscriber:
+    """帧时钟订阅者"""
+
+    __slots__ = ("name", "callback", "order", "interval", "active", "next_due")
+
+    def __init__(self, name: str, callback: Callable[[float], None], order: int, interval: int):
+        self.name = name
+        self.callback = callback
+        self.order = order
+        self.interval = interval
+        self.active = False
+        # 下一次应调用的单调时钟时间（秒），0表示下一帧立即调用
+        self.next_due = 0.0
+
+
+class FrameClock(QObject):
+    """
+    帧时钟
+
+    订阅者用add()注册，start()/stop()切换是否需要逐帧回调。
+    定时器只在有活动订阅者时运行，间隔取活动订阅者中最短的一个；
+    每个订阅者只在距上次调用达到自己的间隔时才被调用，
+    例如动画全速运行时，降频的鼠标采样仍按自己的间隔运行。
+    所有订阅者都停止后定时器随之停止，空闲时不产生唤醒。
+
+    订阅者在回调中通过move_window()/move_label()提交位置，
+    同一帧内多次提交只保留最后一次，帧结束时才真正移动控件。
+
+    Args:
+        window: 宠物窗口
+        label: 宠物图像标签，可以稍后用set_label()设置
+        parent: 父对象
+    """
+
+    frame_done = pyqtSignal(float)
+
+    def __init__(self, window, label=None, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._window = window
+        self._label = label
+
+        self._subscribers: Dict[str, _Subscriber] = {}
+        # 按顺序排好的订阅者，注册时重建
+        self._ordered: Tuple[_Subscriber, ...] = ()
+
+        self._in_frame = False
+        self._pending_window_pos: Optional[QPoint] = None
+        self._pending_label_pos: Optional[QPoint] = None
+
+        self._stats = {"frames": 0, "window_commits": 0, "label_commits": 0}
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.tick)
+
+    # ------------------------------------------------------------------
+    # 订阅
+    # ------------------------------------------------------------------
+
+    def add(self, name: str, callback: Callable[[float], None], order: int, interval: int) -> None:
+        """
+        注册订阅者（初始为停止状态）
+
+        Args:
+            name: 订阅者名称
+            callback: 每帧调用，参数为单调时钟时间（秒）
+            order: 调用顺序，值越小越先调用
+            interval: 期望的帧间隔（毫秒）
+        """
+        self._subscribers[name] = _Subscriber(name, callback, order, interval)
+        self._ordered = tuple(sorted(self._subscribers.values(), key=lambda s: s.order))
+
+    def remove(self, name: str) -> None:
+        """注销订阅者"""
+        if self._subscribers.pop(name, None) is not None:
+            self._ordered = tuple(sorted(self._subscribers.values(), key=lambda s: s.order))
+            self._update_timer()
+
+    def start(self, name: str, interval: Optional[int] = None) -> None:
+        """
+        开始向订阅者发送帧
+
+        Args:
+            name: 订阅者名称
+            interval: 新的帧间隔（毫秒），为None时保持不变
+        """
+        subscriber = self._subscribers[name]
+        if interval is not None and interval != subscriber.interval:
+            subscriber.interval = interval
+            subscriber.next_due = 0.0
+        if not subscriber.active:
+            subscriber.active = True
+            subscriber.next_due = 0.0
+        self._update_timer()
+
+    def stop(self, name: str) -> None:
+        """停止向订阅者发送帧"""
+        subscriber = self._subscribers.get(name)
+        if subscriber is not None and subscriber.active:
+            subscriber.active = False
+            self._update_timer()
+
+    def is_active(self, name: str) -> bool:
+        """订阅者是否在接收帧"""
+        subscriber = self._subscribers.get(name)
+        return subscriber is not None and subscriber.active
+
+    def interval(self, name: str) -> int:
+        """订阅者期望的帧间隔（毫秒）"""
+        return self._subscribers[name].interval
+
+    def stop_all(self) -> None:
+        """停止所有订阅者和定时器"""
+        for subscriber in self._ordered:
+            subscriber.active = False
+        self._timer.stop()
+
+    # ------------------------------------------------------------------
+    # 位置提交
+    # ------------------------------------------------------------------
+
+    def set_label(self, label) -> None:
+        """设置宠物图像标签"""
+        self._label = label
+
+    def move_window(self, x: int, y: int) -> None:
+        """提交窗口位置，帧内调用时推迟到帧结束"""
+        if self._in_frame:
+            self._pending_window_pos = QPoint(x, y)
+        elif self._window.pos() != QPoint(x, y):
+            self._window.move(x, y)
+            self._stats["window_commits"] += 1
+
+    def move_label(self, x: int, y: int) -> None:
+        """提交宠物标签位置，帧内调用时推迟到帧结束"""
+        if self._label is None:
+            return
+        if self._in_frame:
+            self._pending_label_pos = QPoint(x, y)
+        elif self._label.pos() != QPoint(x, y):
+            self._label.move(x, y)
+            self._stats["label_commits"] += 1
+
+    def window_pos(self) -> QPoint:
+        """窗口位置（包括本帧尚未提交的位置）"""
+        # QPoint(0, 0) 的布尔值为False，必须显式与None比较
+        if self._pending_window_pos is not None:
+            return self._pending_window_pos
+        return self._window.pos()
+
+    # ------------------------------------------------------------------
+    # 帧循环
+    # ------------------------------------------------------------------
+
+    def _update_timer(self) -> None:
+        """根据活动订阅者启动、停止定时器或调整间隔"""
+        intervals = [s.interval for s in self._ordered if s.active]
+        if not intervals:
+            if self._timer.isActive():
+                self._timer.stop()
+                logger.debug("帧时钟已停止")
+            return
+
+        interval = min(intervals)
+        if not self._timer.isActive():
+            self._timer.start(interval)
+            logger.debug(f"帧时钟已启动，间隔 {interval}ms")
+        elif self._timer.interval() != interval:
+            self._timer.setInterval(interval)
+
+    def tick(self, now: Optional[float] = None) -> None:
+        """
+        运行一帧：按顺序调用活动订阅者，然后统一提交位置
+
+        Args:
+            now: 本帧的单调时钟时间（秒），默认为当前时间；
+                 基准测试可以传入合成时间，不依赖定时器逐帧驱动
+        """
+        if now is None:
+            now = time.monotonic()
+        # 允许提前半个定时器间隔，定时器抖动时与定时器同频的订阅者不会被跳过
+        tolerance = self._timer.interval() / 2000.0 if self._timer.isActive() else 0.0
+        self._stats["frames"] += 1
+        self._in_frame = True
+        try:
+            for subscriber in self._ordered:
+                if not subscriber.active or now + tolerance < subscriber.next_due:
+                    continue
+                subscriber.next_due = now + subscriber.interval / 1000.0
+                try:
+                    subscriber.callback(now)
+                except Exception as e:
+                    logger.error(f"帧回调 {subscriber.name} 失败: {e}")
+        finally:
+            self._in_frame = False
+            self._commit()
+
+        self.frame_done.emit(now)
+
+    def _commit(self) -> None:
+        """一次性应用本帧的窗口和标签位置"""
+        window_pos, self._pending_window_pos = self._pending_window_pos, None
+        label_pos, self._pending_label_pos = self._pending_label_pos, None
+
+        if label_pos is not None and label_pos != self._label.pos():
+            self._label.move(label_pos)
+            self._stats["label_commits"] += 1
+        if window_pos is not None and window_pos != self._window.pos():
+            self._window.move(window_pos)
+            self._stats["window_commits"] += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取帧数和位置提交次数"""
+        return dict(self._stats, timer_active=self._timer.isActive(),
+                    interval=self._timer.interval() if self._timer.isActive() else 0)
@@ -6,6 +6,8 @@
 
 import sys
 import os
+import time
+from collections import deque
 from typing import Optional, Tuple
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -14,11 +16,17 @@ from PyQt5.QtWidgets import QWidget
 from PyQt5.QtCore import Qt, QPoint, pyqtSignal
 from PyQt5.QtGui import QPainter, QColor, QCursor
 
+from haropet.config_manager import config_manager
+from haropet.frame_clock import FrameClock, ORDER_INPUT
+
 
 class FramelessWindow(QWidget):
     """
     无边框透明窗口基类
     支持鼠标拖拽移动窗口
+    
+    拖动时只记录最新的鼠标位置，由帧时钟每帧最多移动一次窗口，
+    mouse_move 信号按 DRAG_NOTIFY_INTERVAL 节流。
     """
     
     # 拖拽信号
@@ -28,9 +36,16 @@ class FramelessWindow(QWidget):
     
     def __init__(self, parent: Optional[QWidget] = None):
         super().__init__(parent)
+        # 窗口内所有逐帧更新共用的帧时钟
+        self._frame_clock = FrameClock(self, parent=self)
         self._init_window()
         self._setup_drag()
     
+    @property
+    def frame_clock(self) -> FrameClock:
+        """窗口的共享帧时钟"""
+        return self._frame_clock
+    
     def _init_window(self) -> None:
         """初始化窗口属性"""
         self.setAttribute(Qt.WA_TranslucentBackground, True)
@@ -45,29 +60,84 @@ class FramelessWindow(QWidget):
         """设置拖拽相关变量"""
         self._is_dragging = False
         self._drag_position = QPoint()
+        self._pending_drag_pos: Optional[QPoint] = None  # 尚未应用的最新鼠标位置
+        self._last_notified_pos: Optional[QPoint] = None
+        self._last_notify_time = 0.0
+        # (时间, 全局位置) 环形缓冲区，用于计算拖动速度
+        self._drag_samples = deque(maxlen=config_manager.DRAG_VELOCITY_SAMPLES)
+        self._frame_clock.add("drag", self._apply_drag, ORDER_INPUT, config_manager.DRAG_FRAME_INTERVAL)
     
     def mousePressEvent(self, event) -> None:
         """鼠标按下事件"""
         if event.button() == Qt.LeftButton:
             self._is_dragging = True
             self._drag_position = event.globalPos() - self.frameGeometry().topLeft()
+            self._pending_drag_pos = None
+            self._last_notified_pos = None
+            self._drag_samples.clear()
+            self._drag_samples.append((time.monotonic(), event.globalPos()))
+            self._frame_clock.start("drag")
             self.mouse_press.emit(self._drag_position)
         super().mousePressEvent(event)
     
     def mouseMoveEvent(self, event) -> None:
-        """鼠标移动事件"""
+        """鼠标移动事件，只记录位置，窗口在下一帧移动"""
         if self._is_dragging:
-            self.move(event.globalPos() - self._drag_position)
-            self.mouse_move.emit(event.globalPos())
+            self._pending_drag_pos = event.globalPos()
+            self._drag_samples.append((time.monotonic(), self._pending_drag_pos))
         super().mouseMoveEvent(event)
     
     def mouseReleaseEvent(self, event) -> None:
         """鼠标释放事件"""
-        if event.button() == Qt.LeftButton:
+        if event.button() == Qt.LeftButton and self._is_dragging:
+            # 立即应用最后的位置，不等下一帧
+            self._apply_drag(time.monotonic(), force_notify=True)
+            self._frame_clock.stop("drag")
             self._is_dragging = False
             self.mouse_release.emit()
         super().mouseReleaseEvent(event)
     
+    def _apply_drag(self, now: float, force_notify: bool = False) -> None:
+        """
+        应用最新的拖动位置（帧时钟回调）
+        
+        Args:
+            now: 单调时钟时间（秒）
+            force_notify: 忽略节流，发出最后一次 mouse_move
+        """
+        pos, self._pending_drag_pos = self._pending_drag_pos, None
+        if pos is not None:
+            target = pos - self._drag_position
+            self._frame_clock.move_window(target.x(), target.y())
+        elif force_notify and len(self._drag_samples) > 1:
+            # 被节流掉的最后一个位置
+            pos = self._drag_samples[-1][1]
+        
+        if pos is None or pos == self._last_notified_pos:
+            return
+        if force_notify or (now - self._last_notify_time) * 1000 >= config_manager.DRAG_NOTIFY_INTERVAL:
+            self._last_notified_pos = pos
+            self._last_notify_time = now
+            self.mouse_move.emit(pos)
+    
+    def drag_velocity(self) -> Tuple[float, float]:
+        """
+        根据最近的拖动采样计算速度
+        
+        Returns:
+            (vx, vy)，单位为像素/秒；采样不足时为 (0.0, 0.0)
+        """
+        if len(self._drag_samples) < 2:
+            return 0.0, 0.0
+        (t0, p0), (t1, p1) = self._drag_samples[0], self._drag_samples[-1]
+        # 停住一段时间后再松开，视为静止
+        if time.monotonic() - t1 > 0.1:
+            return 0.0, 0.0
+        dt = t1 - t0
+        if dt <= 0:
+            return 0.0, 0.0
+        return (p1.x() - p0.x()) / dt, (p1.y() - p0.y()) / dt
+    
     def mouseDoubleClickEvent(self, event) -> None:
         """双击事件 - 可以在子类中重写"""
         if event.button() == Qt.LeftButton:
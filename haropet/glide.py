@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+甩出滑行模块
+松开拖动时按拖动速度让哈罗继续滑行，受摩擦减速并在屏幕边缘反弹；
+只在运动期间订阅帧时钟，静止后不产生任何唤醒
+"""
+
+import math
+import logging
+from typing import Callable, Optional
+
+from haropet.config_manager import config_manager
+from haropet.frame_clock import ORDER_INPUT
+from haropet.screen_layout import get_screen_layout
+
+logger = logging.getLogger('Haropet.Glide')
+
+# 单帧最多积分的时长（秒），避免卡顿后一次滑出很远
+_MAX_FRAME_TIME = 0.05
+
+
+class GlideMotion:
+    """
+    滑行运动
+
+    Args:
+        window: 宠物窗口
+        frame_clock: 帧时钟
+        on_rest: 滑行结束（静止）时调用
+    """
+
+    def __init__(self, window, frame_clock, on_rest: Optional[Callable[[], None]] = None):
+        self._window = window
+        self._frame_clock = frame_clock
+        self._on_rest = on_rest
+        self._x = 0.0
+        self._y = 0.0
+        self._vx = 0.0
+        self._vy = 0.0
+        self._last_time: Optional[float] = None
+        self._frame_clock.add("glide", self._step, ORDER_INPUT, config_manager.DRAG_FRAME_INTERVAL)
+
+    def start(self, vx: float, vy: float) -> bool:
+        """
+        以指定速度开始滑行
+
+        Args:
+            vx: x方向速度（像素/秒）
+            vy: y方向速度（像素/秒）
+
+        Returns:
+            是否开始滑行（速度太小时不滑行）
+        """
+        speed = math.hypot(vx, vy)
+        if speed < config_manager.GLIDE_MIN_SPEED:
+            return False
+
+        if speed > config_manager.GLIDE_MAX_SPEED:
+            scale = config_manager.GLIDE_MAX_SPEED / speed
+            vx, vy = vx * scale, vy * scale
+
+        pos = self._frame_clock.window_pos()
+        self._x, self._y = float(pos.x()), float(pos.y())
+        self._vx, self._vy = vx, vy
+        self._last_time = None
+        self._frame_clock.start("glide")
+        logger.debug(f"开始滑行: 速度 ({vx:.0f}, {vy:.0f})")
+        return True
+
+    def stop(self) -> None:
+        """立即停止滑行（不触发on_rest）"""
+        self._vx = self._vy = 0.0
+        self._frame_clock.stop("glide")
+
+    def is_active(self) -> bool:
+        """是否正在滑行"""
+        return self._frame_clock.is_active("glide")
+
+    def _step(self, now: float) -> None:
+        """推进一帧（帧时钟回调）"""
+        if self._last_time is None:
+            self._last_time = now
+            return
+        dt = min(now - self._last_time, _MAX_FRAME_TIME)
+        self._last_time = now
+
+        # 指数摩擦，与帧率无关
+        decay = math.exp(-config_manager.GLIDE_FRICTION * dt)
+        self._vx *= decay
+        self._vy *= decay
+        self._x += self._vx * dt
+        self._y += self._vy * dt
+
+        # 在所有屏幕的外接矩形内反弹
+        bounds = get_screen_layout().union()
+        left = bounds.left()
+        top = bounds.top()
+        right = max(left, bounds.right() - self._window.width() + 1)
+        bottom = max(top, bounds.bottom() - self._window.height() + 1)
+        bounce = config_manager.GLIDE_BOUNCE
+        if self._x < left or self._x > right:
+            self._x = min(max(self._x, left), right)
+            self._vx = -self._vx * bounce
+        if self._y < top or self._y > bottom:
+            self._y = min(max(self._y, top), bottom)
+            self._vy = -self._vy * bounce
+
+        if math.hypot(self._vx, self._vy) < config_manager.GLIDE_STOP_SPEED:
+            self._settle()
+            return
+
+        self._frame_clock.move_window(int(round(self._x)), int(round(self._y)))
+
+    def _settle(self) -> None:
+        """停止滑行，确保停在某个屏幕内"""
+        x, y = get_screen_layout().clamp_rect(
+            self._x, self._y, self._window.width(), self._window.height()
+        )
+        self._frame_clock.move_window(int(round(x)), int(round(y)))
+        self.stop()
+        logger.debug(f"滑行结束: ({int(round(x))}, {int(round(y))})")
+        if self._on_rest is not None:
+            self._on_rest()
@@ -16,9 +16,10 @@ from PyQt5.QtCore import Qt, QTimer, QPoint, pyqtSignal
 from PyQt5.QtGui import QPixmap
 
 from haropet.frameless_window import FramelessWindow
-from haropet.resources import HaroResources
-from haropet.animation_manager import AnimationManager
-from haropet.interaction_manager import InteractionManager
+from haropet.sprite_atlas import sprite_atlas
+from haropet.screen_layout import get_screen_layout
+from haropet.glide import GlideMotion
+from haropet.bubble_widget import BubbleWidget
 from haropet.config_manager import config_manager
 
 logger = logging.getLogger('Haropet.HaroPet')
@@ -39,15 +40,42 @@ class HaroPet(FramelessWindow):
         # 初始化UI
         self._setup_ui()
         
-        # 初始化管理器
-        self._animation_manager = AnimationManager(self)
-        self._interaction_manager = InteractionManager(self, self._pet_label, self._bubble_label)
+        # 动画、跟随和拖动共用基类的帧时钟，每帧只提交一次位置
+        self._frame_clock.set_label(self._pet_label)
+        
+        # 管理器在第一次使用时创建：动画管理器等到第一次转身或摇摆，
+        # 交互管理器在首帧绘制后创建（之前的鼠标事件会立即创建它）
+        self._animations = None
+        self._interactions = None
+        # 松开拖动后的滑行，只在运动时订阅帧时钟
+        self._glide = GlideMotion(self, self._frame_clock, self._on_glide_rest)
         
         # 加载配置
         self._load_config()
         
         # 显示宠物
         self._show()
+        QTimer.singleShot(0, self._ensure_interaction_manager)
+    
+    @property
+    def _animation_manager(self):
+        """动画管理器（首次访问时创建）"""
+        if self._animations is None:
+            from haropet.animation_manager import AnimationManager
+            self._animations = AnimationManager(self, self._frame_clock)
+        return self._animations
+    
+    @property
+    def _interaction_manager(self):
+        """交互管理器（首次访问时创建）"""
+        return self._ensure_interaction_manager()
+    
+    def _ensure_interaction_manager(self):
+        """创建交互管理器（跟随模式、气泡和点击处理）"""
+        if self._interactions is None:
+            from haropet.interaction_manager import InteractionManager
+            self._interactions = InteractionManager(self, self._pet_label, self._bubble_label, self._frame_clock)
+        return self._interactions
     
     def _setup_ui(self) -> None:
         """设置用户界面"""
@@ -61,10 +89,7 @@ class HaroPet(FramelessWindow):
         self._pet_label.setAttribute(Qt.WA_TranslucentBackground)
         self._pet_label.setStyleSheet("background: transparent;")
         
-        self._bubble_label = QLabel(self)
-        self._bubble_label.setAttribute(Qt.WA_TranslucentBackground)
-        self._bubble_label.setVisible(False)
-        self._bubble_label.setStyleSheet("background: transparent;")
+        self._bubble_label = BubbleWidget(self)
         
         self._update_pet_image()
     
@@ -72,7 +97,10 @@ class HaroPet(FramelessWindow):
         """加载配置"""
         # 加载位置配置
         position = config_manager.get_position()
-        self.move(position["x"], position["y"])
+        
+        # 保存位置所在的显示器可能已被移除，限制到当前屏幕范围内
+        x, y = get_screen_layout().clamp_rect(position["x"], position["y"], self.width(), self.height())
+        self.move(int(x), int(y))
     
     # 冒泡相关方法已移至InteractionManager
     
@@ -87,9 +115,9 @@ class HaroPet(FramelessWindow):
         if state is None:
             state = self._current_state
         
-        pixmap = QPixmap(config_manager.PET_SIZE, config_manager.PET_SIZE)
-        pixmap.fill(Qt.transparent)
-        HaroResources.draw_haro(pixmap, state)
+        # 从精灵图集截取对应帧，状态切换不再重新绘制
+        dpr = self._pet_label.devicePixelRatioF()
+        pixmap = sprite_atlas.frame(state, config_manager.PET_SIZE, dpr)
         self._pet_label.setPixmap(pixmap)
     
     # 动画相关方法已移至AnimationManager
@@ -138,6 +166,8 @@ class HaroPet(FramelessWindow):
     
     def mousePressEvent(self, event) -> None:
         """鼠标按下事件"""
+        # 接住正在滑行的宠物
+        self._glide.stop()
         self._interaction_manager.handle_mouse_press(event)
         
         # 更新拖动状态
@@ -153,11 +183,33 @@ class HaroPet(FramelessWindow):
     
     def mouseReleaseEvent(self, event) -> None:
         """鼠标释放事件"""
-        # 更新拖动状态
-        self._interaction_manager.set_dragging(False)
+        was_dragging = self._is_dragging and event.button() == Qt.LeftButton
         
-        # 调用父类的鼠标释放事件
+        # 调用父类的鼠标释放事件（应用最后的拖动位置）
         super().mouseReleaseEvent(event)
+        
+        # 甩出时继续滑行，静止后再结束拖动状态并保存位置
+        if was_dragging:
+            vx, vy = self.drag_velocity()
+            if not self._glide.start(vx, vy):
+                self._on_glide_rest()
+        else:
+            self._interaction_manager.set_dragging(False)
+    
+    def _on_glide_rest(self) -> None:
+        """拖动或滑行结束，宠物静止"""
+        self._interaction_manager.set_dragging(False)
+        self.save_position()
+    
+    def enterEvent(self, event) -> None:
+        """鼠标进入窗口，恢复全速鼠标采样"""
+        self._interaction_manager.wake_mouse_sampler()
+        super().enterEvent(event)
+    
+    def leaveEvent(self, event) -> None:
+        """鼠标离开窗口，恢复全速鼠标采样"""
+        self._interaction_manager.wake_mouse_sampler()
+        super().leaveEvent(event)
     
     def contextMenuEvent(self, event) -> None:
         """右键菜单事件"""
@@ -165,17 +217,22 @@ class HaroPet(FramelessWindow):
     
     def save_position(self) -> None:
         """保存当前位置"""
-        config_manager.set_position(self.x(), self.y())
+        # 包括本帧尚未提交的位置
+        pos = self._frame_clock.window_pos()
+        config_manager.set_position(pos.x(), pos.y())
         config_manager.set_state(self._current_state)
-        logger.info(f"保存位置: ({self.x()}, {self.y()})")
+        logger.info(f"保存位置: ({pos.x()}, {pos.y()})")
     
     def closeEvent(self, event) -> None:
         """关闭事件"""
-        # 保存位置
+        # 停止滑行，保存位置，并立即写入所有待保存的配置
+        self._glide.stop()
         self.save_position()
+        config_manager.flush()
         
         # 停止动画
-        self._animation_manager.stop_all_animations()
+        if self._animations is not None:
+            self._animations.stop_all_animations()
         
         # 清理资源
         self._cleanup_resources()
@@ -192,16 +249,17 @@ class HaroPet(FramelessWindow):
                 self._pet_label.clear()
             
             if hasattr(self, '_bubble_label'):
-                if self._bubble_label.pixmap():
-                    self._bubble_label.pixmap().detach()
                 self._bubble_label.clear()
             
             # 清理管理器资源
-            if hasattr(self, '_animation_manager'):
-                self._animation_manager.stop_all_animations()
+            if getattr(self, '_animations', None) is not None:
+                self._animations.stop_all_animations()
+            
+            if getattr(self, '_interactions', None) is not None:
+                self._interactions.cleanup()
             
-            if hasattr(self, '_interaction_manager'):
-                self._interaction_manager.cleanup()
+            if hasattr(self, '_frame_clock'):
+                self._frame_clock.stop_all()
             
             # 清理定时器
             for attr in dir(self):
@@ -9,18 +9,23 @@ import random
 import logging
 from typing import Optional, List
 
-from PyQt5.QtCore import Qt, QTimer, QPoint
-from PyQt5.QtGui import QFont, QCursor
+from PyQt5.QtCore import Qt, QTimer, QPoint, QRect
+from PyQt5.QtGui import QCursor
 
 from haropet.config_manager import config_manager
+from haropet.frame_clock import ORDER_INPUT
+from haropet.follow_spring import SpringFollower
+from haropet.screen_layout import get_screen_layout
+from haropet.bubble_queue import BubbleQueue
 
 logger = logging.getLogger('Haropet.InteractionManager')
 
 class InteractionManager:
     """交互管理器"""
     
-    def __init__(self, pet_window, pet_widget, bubble_widget):
+    def __init__(self, pet_window, pet_widget, bubble_widget, frame_clock):
         self.pet_window = pet_window
+        self._frame_clock = frame_clock
         self.pet_widget = pet_widget
         self.bubble_widget = bubble_widget
         
@@ -28,6 +33,13 @@ class InteractionManager:
         self._is_following = False
         self._follow_offset = QPoint(30, 30)
         self._last_mouse_pos = None
+        self._follower = SpringFollower()
+        self._follower_pos = None  # 弹簧上次给出的窗口位置
+        self._screen_layout = get_screen_layout()
+        
+        # 鼠标采样相关
+        self._last_sampled_pos = None
+        self._last_motion_time = 0.0
         
         # 点击相关
         self._click_count = 0
@@ -40,19 +52,21 @@ class InteractionManager:
         self._bubble_timer = QTimer(self.pet_window)
         self._bubble_timer.setSingleShot(True)
         self._bubble_timer.timeout.connect(self._hide_bubble)
+        # 气泡消息经过队列合并和限速后再显示
+        self._bubble_queue = BubbleQueue(self._show_bubble, self.pet_window)
         
         # 点击重置定时器
         self._click_reset_timer = QTimer(self.pet_window)
         self._click_reset_timer.setSingleShot(True)
         self._click_reset_timer.timeout.connect(self._reset_click_count)
         
-        # 鼠标跟踪定时器
-        self._mouse_timer = QTimer(self.pet_window)
-        self._mouse_timer.timeout.connect(self._check_mouse_position)
-        self._mouse_timer.start(16)  # ~60 FPS
+        # 鼠标跟踪 - 订阅共享帧时钟，仅在跟随模式下运行，鼠标静止时自动降频
+        self._frame_clock.add("follow", self._check_mouse_position,
+                              ORDER_INPUT, config_manager.MOUSE_POLL_INTERVAL_ACTIVE)
         
         # 加载配置
         self._is_following = config_manager.get_follow_enabled()
+        self._update_mouse_sampler()
     
     def _get_greet_messages(self) -> List[str]:
         """获取问候消息列表"""
@@ -66,18 +80,11 @@ class InteractionManager:
         return messages
     
     def _show_bubble(self, message: str) -> None:
-        """显示气泡消息"""
-        # 设置气泡内容和样式
-        self.bubble_widget.setText(message)
-        self.bubble_widget.setFont(QFont("Microsoft YaHei", 10))
-        self.bubble_widget.setStyleSheet("""
-            color: #333333;
-            background-color: rgba(255, 255, 255, 200);
-            border-radius: 12px;
-            padding: 8px 14px;
-            border: 2px solid rgba(80, 180, 80, 200);
-        """)
-        self.bubble_widget.adjustSize()
+        """显示气泡消息（由气泡队列调用）"""
+        logger.info(f"显示气泡: {message}")
+        
+        # 设置气泡内容（相同消息直接使用缓存的气泡图像）
+        self.bubble_widget.show_message(message)
         
         # 计算气泡位置
         bubble_width = self.bubble_widget.width()
@@ -104,76 +111,100 @@ class InteractionManager:
         """隐藏气泡"""
         self.bubble_widget.hide()
     
-    def _check_mouse_position(self) -> None:
-        """检查鼠标位置，实现跟随功能"""
+    def _update_mouse_sampler(self) -> None:
+        """根据跟随状态启动或停止鼠标采样"""
+        if self._is_following:
+            self.wake_mouse_sampler()
+        else:
+            self._frame_clock.stop("follow")
+            self._last_sampled_pos = None
+    
+    def wake_mouse_sampler(self) -> None:
+        """恢复全速鼠标采样（鼠标移动、进入或离开宠物窗口时调用）"""
         if not self._is_following:
             return
         
-        # 如果正在拖动，则暂停跟随更新
-        if self._is_dragging:
-            return
-        
-        screen = self.pet_window.screen().availableGeometry()
+        self._last_motion_time = time.monotonic()
+        if not self._frame_clock.is_active("follow") or \
+                self._frame_clock.interval("follow") != config_manager.MOUSE_POLL_INTERVAL_ACTIVE:
+            self._frame_clock.start("follow", config_manager.MOUSE_POLL_INTERVAL_ACTIVE)
+    
+    def _sample_cursor(self) -> QPoint:
+        """采样鼠标位置，并根据鼠标是否移动调整采样频率"""
         cursor_pos = QCursor.pos()
+        interval = self._frame_clock.interval("follow")
         
-        # 如果鼠标在宠物窗口内，则不跟随
-        if self.pet_window.geometry().contains(self.pet_window.mapFromGlobal(cursor_pos)):
-            self._last_mouse_pos = None
-            return
+        if cursor_pos != self._last_sampled_pos:
+            self._last_sampled_pos = cursor_pos
+            if interval != config_manager.MOUSE_POLL_INTERVAL_ACTIVE:
+                self.wake_mouse_sampler()
+            else:
+                self._last_motion_time = time.monotonic()
+        elif (interval != config_manager.MOUSE_POLL_INTERVAL_IDLE and
+              (time.monotonic() - self._last_motion_time) * 1000 >= config_manager.MOUSE_IDLE_TIMEOUT):
+            # 鼠标静止一段时间后降低采样频率（其他订阅者活动时帧时钟仍按最短间隔运行）
+            self._frame_clock.start("follow", config_manager.MOUSE_POLL_INTERVAL_IDLE)
         
-        # 第一次检测到鼠标位置
-        if self._last_mouse_pos is None:
-            self._last_mouse_pos = cursor_pos
+        return cursor_pos
+    
+    def _check_mouse_position(self, now: Optional[float] = None) -> None:
+        """检查鼠标位置，实现跟随功能（帧时钟回调）"""
+        if not self._is_following:
+            self._frame_clock.stop("follow")
             return
         
-        # 计算鼠标移动距离
-        dx = cursor_pos.x() - self._last_mouse_pos.x()
-        dy = cursor_pos.y() - self._last_mouse_pos.y()
-        mouse_delta = abs(dx) + abs(dy)
+        if now is None:
+            now = time.monotonic()
+        cursor_pos = self._sample_cursor()
         
-        # 鼠标移动太小则不跟随
-        if mouse_delta < config_manager.MOUSE_MOVEMENT_THRESHOLD:
+        # 如果正在拖动，则暂停跟随更新，结束后从新位置重新同步
+        if self._is_dragging:
+            self._follower_pos = None
             return
         
-        # 计算目标位置（鼠标位置加上偏移）
-        target_x = cursor_pos.x() + self._follow_offset.x()
-        target_y = cursor_pos.y() + self._follow_offset.y()
-        
-        # 确保目标位置在屏幕范围内
-        margin = config_manager.FOLLOW_MARGIN
-        target_x = max(screen.left() + margin, 
-                      min(screen.right() - self.pet_window.width() - margin, target_x))
-        target_y = max(screen.top() + margin, 
-                      min(screen.bottom() - self.pet_window.height() - margin, target_y))
+        window_pos = self._frame_clock.window_pos()
+        if self._follower_pos is None:
+            # 开始跟随或拖动结束，弹簧从当前位置静止开始
+            self._follower.reset(window_pos.x(), window_pos.y())
+        elif self._follower_pos != (window_pos.x(), window_pos.y()):
+            # 窗口管理器或屏幕限制调整了位置：采用实际位置但保留速度，
+            # 否则每帧被挪动1像素时弹簧每帧归零，宠物会卡在屏幕边缘
+            self._follower.sync_position(window_pos.x(), window_pos.y())
         
-        # 计算当前距离
-        current_x = self.pet_window.x()
-        current_y = self.pet_window.y()
-        
-        # 计算距离
-        distance = ((target_x - current_x) ** 2 + (target_y - current_y) ** 2) ** 0.5
-        
-        # 根据距离设置缓动系数
-        if distance < config_manager.FOLLOW_DISTANCE_THRESHOLD_CLOSE:
-            easing = config_manager.FOLLOW_EASING_CLOSE
-        elif distance < config_manager.FOLLOW_DISTANCE_THRESHOLD_MEDIUM:
-            easing = config_manager.FOLLOW_EASING_MEDIUM
-        else:
-            easing = config_manager.FOLLOW_EASING_FAR
+        # 按鼠标速度加上提前量
+        lead_x, lead_y = self._follower.track_cursor(cursor_pos.x(), cursor_pos.y(), now)
+        lead_pos = QPoint(int(lead_x), int(lead_y))
         
-        # 计算新位置
-        new_x = current_x + (target_x - current_x) * easing
-        new_y = current_y + (target_y - current_y) * easing
-        
-        # 确保新位置在屏幕范围内
-        new_x = max(screen.left(), min(screen.right() - self.pet_window.width(), new_x))
-        new_y = max(screen.top(), min(screen.bottom() - self.pet_window.height(), new_y))
+        if QRect(window_pos, self.pet_window.size()).contains(cursor_pos):
+            # 如果鼠标在宠物窗口内，则不更新目标
+            self._last_mouse_pos = None
+        elif self._last_mouse_pos is None:
+            # 第一次检测到鼠标位置
+            self._last_mouse_pos = lead_pos
+        elif (abs(lead_pos.x() - self._last_mouse_pos.x()) + abs(lead_pos.y() - self._last_mouse_pos.y())
+              >= config_manager.MOUSE_MOVEMENT_THRESHOLD):
+            # 鼠标移动足够远时更新目标（鼠标位置加上偏移）
+            target_x = lead_pos.x() + self._follow_offset.x()
+            target_y = lead_pos.y() + self._follow_offset.y()
+            
+            # 确保目标位置在屏幕范围内（所有显示器的并集，读取缓存的屏幕布局）
+            target_x, target_y = self._screen_layout.clamp_rect(
+                target_x, target_y, self.pet_window.width(), self.pet_window.height(),
+                config_manager.FOLLOW_MARGIN
+            )
+            
+            self._follower.set_target(target_x, target_y)
+            self._last_mouse_pos = lead_pos
         
-        # 移动宠物
-        self.pet_window.move(int(new_x), int(new_y))
+        # 弹簧按固定步长积分，整数位置变化时才移动窗口（帧结束时与动画一起提交）
+        new_x, new_y = self._follower.step(now)
+        self._follower_pos = (new_x, new_y)
+        if (new_x, new_y) != (window_pos.x(), window_pos.y()):
+            self._frame_clock.move_window(new_x, new_y)
         
-        # 更新上次鼠标位置
-        self._last_mouse_pos = cursor_pos
+        # 宠物还在移动时保持全速采样
+        if not self._follower.is_at_rest():
+            self._last_motion_time = time.monotonic()
     
     def _reset_click_count(self) -> None:
         """重置点击计数"""
@@ -213,6 +244,8 @@ class InteractionManager:
         config_manager.set_follow_enabled(enabled)
         if not enabled:
             self._last_mouse_pos = None
+            self._follower_pos = None
+        self._update_mouse_sampler()
         logger.info(f"跟随模式 {'启用' if enabled else '禁用'}")
     
     def is_follow_enabled(self) -> bool:
@@ -223,8 +256,9 @@ class InteractionManager:
         """让宠物打招呼"""
         messages = self._get_greet_messages()
         message = random.choice(messages)
-        self._show_bubble(message)
-        logger.info(f"打招呼: {message}")
+        # 连续打招呼合并为"哈罗×N"
+        self._bubble_queue.post(message, coalesce_key="greet", burst_text="哈罗")
+        logger.debug(f"打招呼: {message}")
     
     def update_user_name(self, name: str) -> None:
         """更新用户名"""
@@ -238,9 +272,9 @@ class InteractionManager:
         """设置拖动状态"""
         self._is_dragging = is_dragging
         if is_dragging:
-            logger.info("开始拖动宠物")
+            logger.debug("开始拖动宠物")
         else:
-            logger.info("结束拖动宠物")
+            logger.debug("结束拖动宠物")
     
     def cleanup(self) -> None:
         """清理资源"""
@@ -252,12 +286,15 @@ class InteractionManager:
             if hasattr(self, '_click_reset_timer'):
                 self._click_reset_timer.stop()
             
-            if hasattr(self, '_mouse_timer'):
-                self._mouse_timer.stop()
+            if hasattr(self, '_bubble_queue'):
+                self._bubble_queue.clear()
+            
+            self._frame_clock.stop("follow")
             
             # 清理状态
             self._is_following = False
             self._last_mouse_pos = None
+            self._last_sampled_pos = None
             self._click_count = 0
             self._last_click_time = None
             
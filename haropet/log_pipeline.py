@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+"""
+异步日志模块
+GUI线程只把日志记录放入队列（QueueHandler），文件和控制台输出由
+后台线程（QueueListener）完成；日志文件按大小和时间轮转。
+
+入队前按记录器限流，并把连续重复的消息合并为
+"上一条消息重复了 N 次"。运行时可以在安静和详细模式之间切换。
+"""
+
+import os
+import sys
+import time
+import queue
+import atexit
+import logging
+import threading
+import logging.handlers
+from typing import Dict, List, Optional
+
+# 日志格式
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# 单个日志文件的最大字节数和保留的旧文件数
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUP_COUNT = 3
+# 日志文件最长使用时间（秒），超过后即使未达到大小也轮转
+LOG_MAX_AGE = 7 * 24 * 3600
+# 每个记录器每秒允许的INFO及以下日志条数，以及允许的突发条数（WARNING及以上不限流）
+LOG_RATE_PER_SECOND = 5.0
+LOG_RATE_BURST = 20
+# 相同消息在该时间（秒）内重复出现时合并
+LOG_REPEAT_WINDOW = 30.0
+
+# 日志模式
+MODE_QUIET = "quiet"
+MODE_VERBOSE = "verbose"
+
+# 所有哈罗记录器的父记录器
+ROOT_LOGGER_NAME = 'Haropet'
+
+
+class SizeAndTimeRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """文件超过大小或使用时间超过 max_age 秒时轮转"""
+
+    def __init__(self, filename: str, max_bytes: int, backup_count: int, max_age: float,
+                 encoding: Optional[str] = 'utf-8'):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count,
+                         encoding=encoding, delay=True)
+        self._max_age = max_age
+        self._rollover_at = self._compute_rollover_at()
+
+    def _compute_rollover_at(self) -> float:
+        """按已有日志文件的修改时间计算下次轮转时间"""
+        try:
+            start = os.path.getmtime(self.baseFilename)
+        except OSError:
+            start = time.time()
+        return start + self._max_age
+
+    def shouldRollover(self, record) -> bool:
+        if time.time() >= self._rollover_at:
+            return True
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self) -> None:
+        super().doRollover()
+        self._rollover_at = time.time() + self._max_age
+
+
+class _LoggerState:
+    """单个记录器的限流和重复合并状态"""
+
+    __slots__ = ("last_key", "last_time", "last_record", "repeats", "tokens", "refill_time", "dropped")
+
+    def __init__(self, now: float):
+        self.last_key = None
+        self.last_time = 0.0
+        self.last_record: Optional[logging.LogRecord] = None
+        self.repeats = 0
+        self.tokens = float(LOG_RATE_BURST)
+        self.refill_time = now
+        self.dropped = 0
+
+
+class ThrottledQueueHandler(logging.handlers.QueueHandler):
+    """
+    限流并合并重复消息后放入队列
+
+    在调用日志的线程中运行，只做字典查找和入队，不做任何I/O。
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.throttle = True
+        self._states: Dict[str, _LoggerState] = {}
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if not self.throttle:
+            super().emit(record)
+            return
+        for item in self._throttle(record):
+            super().emit(item)
+
+    def set_throttle(self, enabled: bool) -> None:
+        """
+        打开或关闭限流
+
+        切换时先输出尚未报告的计数并清空状态，否则关闭期间的记录不会更新状态，
+        重新打开后新消息可能被误当成旧消息的重复。
+        """
+        if enabled == self.throttle:
+            return
+        self.acquire()
+        try:
+            self.flush_repeats()
+            self._states.clear()
+            self.throttle = enabled
+        finally:
+            self.release()
+
+    def flush_repeats(self) -> None:
+        """输出所有尚未报告的重复和限流计数"""
+        self.acquire()
+        try:
+            for state in self._states.values():
+                for item in self._summaries(state):
+                    super().emit(item)
+        finally:
+            self.release()
+
+    def _throttle(self, record: logging.LogRecord) -> List[logging.LogRecord]:
+        """返回需要入队的记录（可能包含之前的重复计数）"""
+        now = record.created
+        state = self._states.get(record.name)
+        if state is None:
+            state = self._states[record.name] = _LoggerState(now)
+
+        key = (record.levelno, record.getMessage())
+        if key == state.last_key and now - state.last_time <= LOG_REPEAT_WINDOW:
+            state.repeats += 1
+            state.last_time = now
+            return []
+
+        # WARNING及以上总是输出，其余按令牌桶限流
+        if record.levelno < logging.WARNING:
+            state.tokens = min(float(LOG_RATE_BURST),
+                               state.tokens + (now - state.refill_time) * LOG_RATE_PER_SECOND)
+            state.refill_time = now
+            if state.tokens < 1.0:
+                state.dropped += 1
+                return []
+            state.tokens -= 1.0
+
+        items = self._summaries(state)
+        state.last_key = key
+        state.last_time = now
+        state.last_record = record
+        items.append(record)
+        return items
+
+    @staticmethod
+    def _summaries(state: _LoggerState) -> List[logging.LogRecord]:
+        """生成重复和限流计数记录，并清零计数"""
+        items = []
+        last = state.last_record
+        if state.repeats and last is not None:
+            items.append(_make_record(last, last.levelno, f"上一条消息重复了 {state.repeats} 次"))
+            state.repeats = 0
+        if state.dropped and last is not None:
+            items.append(_make_record(last, logging.INFO, f"限流丢弃了 {state.dropped} 条日志"))
+            state.dropped = 0
+        return items
+
+
+def _make_record(template: logging.LogRecord, level: int, message: str) -> logging.LogRecord:
+    """以同一记录器的名义生成一条汇总记录"""
+    return logging.makeLogRecord({
+        "name": template.name,
+        "levelno": level,
+        "levelname": logging.getLevelName(level),
+        "msg": message,
+    })
+
+
+class LogPipeline:
+    """
+    日志管道：队列处理器 + 后台监听线程
+
+    Args:
+        log_file: 日志文件路径，为None时只输出到控制台
+        mode: 初始日志模式（MODE_QUIET 或 MODE_VERBOSE）
+    """
+
+    def __init__(self, log_file: Optional[str], mode: str = MODE_QUIET):
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self.queue_handler = ThrottledQueueHandler(self._queue)
+
+        formatter = logging.Formatter(LOG_FORMAT)
+        handlers: List[logging.Handler] = []
+
+        self.console_handler = logging.StreamHandler(sys.stdout)
+        self.console_handler.setFormatter(formatter)
+        handlers.append(self.console_handler)
+
+        self.file_handler: Optional[logging.Handler] = None
+        if log_file:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(log_file)), exist_ok=True)
+                self.file_handler = SizeAndTimeRotatingFileHandler(
+                    log_file, LOG_MAX_BYTES, LOG_BACKUP_COUNT, LOG_MAX_AGE)
+                self.file_handler.setFormatter(formatter)
+                handlers.append(self.file_handler)
+            except OSError as e:
+                print(f"无法打开日志文件 {log_file}: {e}")
+
+        self._listener = logging.handlers.QueueListener(
+            self._queue, *handlers, respect_handler_level=True)
+        self._lock = threading.Lock()
+        self._running = False
+        self.mode = mode
+
+    def start(self) -> None:
+        """安装到根记录器并启动后台线程"""
+        with self._lock:
+            if self._running:
+                return
+            root = logging.getLogger()
+            root.addHandler(self.queue_handler)
+            root.setLevel(logging.INFO)
+            self._listener.start()
+            self._running = True
+        self._apply_mode(self.mode)
+
+    def stop(self) -> None:
+        """输出剩余的重复计数，等待队列写完后停止后台线程"""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            self.queue_handler.flush_repeats()
+            logging.getLogger().removeHandler(self.queue_handler)
+            self._listener.stop()
+            for handler in self._listener.handlers:
+                handler.close()
+
+    def set_mode(self, mode: str) -> None:
+        """
+        切换日志模式
+
+        安静模式：哈罗日志记录INFO及以上，限流并合并重复，控制台只显示WARNING及以上。
+        详细模式：记录DEBUG，不限流，控制台显示全部。
+        """
+        if mode not in (MODE_QUIET, MODE_VERBOSE):
+            raise ValueError(f"未知的日志模式: {mode}")
+        if mode != self.mode:
+            self._apply_mode(mode)
+
+    def _apply_mode(self, mode: str) -> None:
+        """设置记录器级别、控制台级别和限流开关"""
+        verbose = mode == MODE_VERBOSE
+        self.mode = mode
+        logging.getLogger(ROOT_LOGGER_NAME).setLevel(logging.DEBUG if verbose else logging.INFO)
+        self.console_handler.setLevel(logging.DEBUG if verbose else logging.WARNING)
+        self.queue_handler.set_throttle(not verbose)
+        logging.getLogger(ROOT_LOGGER_NAME).info(f"日志模式: {'详细' if verbose else '安静'}")
+
+
+# 全局日志管道（setup_log_pipeline 创建）
+_pipeline: Optional[LogPipeline] = None
+
+
+def setup_log_pipeline(log_file: Optional[str], mode: str = MODE_QUIET) -> LogPipeline:
+    """
+    创建并启动全局日志管道（重复调用返回同一实例）
+
+    Args:
+        log_file: 日志文件路径
+        mode: 初始日志模式
+    """
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = LogPipeline(log_file, mode)
+        _pipeline.start()
+        # 进程退出前写完队列中的日志
+        atexit.register(_pipeline.stop)
+    return _pipeline
+
+
+def get_log_pipeline() -> Optional[LogPipeline]:
+    """获取全局日志管道，未创建时返回None"""
+    return _pipeline
+
+
+def set_log_mode(mode: str) -> None:
+    """运行时切换日志模式（日志管道未创建时只调整记录器级别）"""
+    if _pipeline is not None:
+        _pipeline.set_mode(mode)
+    else:
+        logging.getLogger(ROOT_LOGGER_NAME).setLevel(
+            logging.DEBUG if mode == MODE_VERBOSE else logging.INFO)
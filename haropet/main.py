@@ -6,38 +6,43 @@
 import sys
 import os
 import logging
-from typing import NoReturn
+import argparse
+import tempfile
+from typing import List, NoReturn, TYPE_CHECKING
 
 # 快速路径：首先检查命令行参数和基本环境
-if len(sys.argv) > 1:
-    # 处理命令行参数
-    pass
+# 启动分析只依赖标准库，需要在导入任何重量级模块之前启用
+from haropet.startup_profiler import startup_profiler
+from haropet.log_pipeline import MODE_QUIET, MODE_VERBOSE, setup_log_pipeline, set_log_mode
+
+if any(arg.startswith("--profile-startup") for arg in sys.argv[1:]):
+    startup_profiler.enable(imports="--profile-no-imports" not in sys.argv)
+
+# 启动分析报告的默认路径
+DEFAULT_PROFILE_PATH = os.path.join(tempfile.gettempdir(), "haropet_startup_profile.json")
 
 # 延迟导入重量级模块
 # 首先导入轻量级配置管理器
-from haropet.config_manager import config_manager
+with startup_profiler.phase("import_config"):
+    from haropet.config_manager import config_manager
 
 # 设置日志（优化版）
+def initial_log_mode(argv) -> str:
+    """命令行中的 --log verbose/quiet 在解析参数之前就要生效"""
+    for i, arg in enumerate(argv):
+        if arg == "--log" and i + 1 < len(argv):
+            return argv[i + 1]
+        if arg.startswith("--log="):
+            return arg.split("=", 1)[1]
+    return MODE_QUIET
+
+
 def setup_logging():
-    """设置日志系统"""
+    """设置日志系统：文件和控制台输出在后台线程完成，GUI线程只入队"""
     try:
-        # 使用更高效的日志配置
         log_file = os.path.join(os.path.dirname(__file__), 'haropet.log')
-        
-        # 确保日志目录存在
-        log_dir = os.path.dirname(log_file)
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir, exist_ok=True)
-        
-        # 配置日志
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file, encoding='utf-8', delay=True),  # 延迟创建文件
-                logging.StreamHandler(sys.stdout)
-            ]
-        )
+        mode = initial_log_mode(sys.argv[1:])
+        setup_log_pipeline(log_file, mode if mode in (MODE_QUIET, MODE_VERBOSE) else MODE_QUIET)
         return logging.getLogger('Haropet')
     except Exception as e:
         # 如果日志配置失败，使用简单的控制台输出
@@ -45,45 +50,20 @@ def setup_logging():
         return logging.getLogger('Haropet')
 
 # 设置日志
-logger = setup_logging()
+with startup_profiler.phase("setup_logging"):
+    logger = setup_logging()
 
 # 延迟导入PyQt5模块
 # 注意：在导入PyQt5之前，我们已经完成了所有轻量级的初始化工作
+# QtWidgets在确认本进程是主实例之后才导入，第二次启动只需要QtCore和QtNetwork
+with startup_profiler.phase("import_qt"):
+    from PyQt5.QtCore import QTimer
+    from haropet.single_instance import InstanceServer, forward_to_running_instance
 
+if TYPE_CHECKING:
+    from PyQt5.QtWidgets import QApplication
 
-
-# 延迟导入PyQt5模块
-from PyQt5.QtWidgets import QApplication
-from PyQt5.QtCore import QSharedMemory, QObject
-
-class InstanceManager(QObject):
-    """单实例管理器"""
-    
-    def __init__(self) -> None:
-        super().__init__()
-        self.shared_memory = QSharedMemory("Haropet_SingleInstance")
-        self.is_primary_instance = self._check_instance()
-    
-    def _check_instance(self) -> bool:
-        """检查是否已有一个实例在运行"""
-        if self.shared_memory.isAttached():
-            self.shared_memory.detach()
-        
-        if not self.shared_memory.create(1, QSharedMemory.ReadWrite):
-            logger.warning("检测到另一个哈罗实例已在运行")
-            return False
-        
-        logger.info("主实例启动成功")
-        return True
-    
-    def cleanup(self) -> None:
-        """清理资源"""
-        if self.shared_memory.isAttached():
-            self.shared_memory.detach()
-        logger.info("实例管理器清理完成")
-
-
-def configure_application(app: QApplication) -> None:
+def configure_application(app: 'QApplication') -> None:
     """配置应用程序基本设置"""
     # 使用配置管理器中的应用信息
     app.setApplicationName(config_manager.app_name)
@@ -97,71 +77,181 @@ def configure_application(app: QApplication) -> None:
     app.setAttribute(18)  # Qt.AA_UseHighDpiPixmaps
 
 
-def preload_resources():
-    """预加载资源（在后台线程中）"""
+def preload_resources(app: 'QApplication'):
+    """
+    启动后台预渲染服务（线程池中绘制QImage，GUI线程分批转换）
+    
+    当前状态的资源优先渲染，启动流程不会等待渲染完成。
+    
+    Returns:
+        预渲染服务，调用方需保持引用直到程序退出
+    """
     try:
-        import threading
-        
-        def _preload():
-            """后台预加载函数"""
-            try:
-                # 预加载图标
-                from haropet.icon_manager import IconManager
-                icon_manager = IconManager()
-                icon_manager.pre_cache_icons(["normal", "happy", "excited", "sleeping"])
-                logger.info("资源预加载完成")
-            except Exception as e:
-                logger.error(f"资源预加载失败: {e}")
-        
-        # 创建后台线程
-        preload_thread = threading.Thread(target=_preload, daemon=True)
-        preload_thread.start()
+        from haropet.prerender import PrerenderService
+        from haropet.icon_manager import IconManager
+        from haropet.sprite_atlas import sprite_atlas
+        
+        service = PrerenderService(app)
+        service.finished.connect(lambda: logger.info("资源预加载完成"))
+        
+        # 宠物精灵图集（当前屏幕的设备像素比）
+        screen = app.primaryScreen()
+        dpr = screen.devicePixelRatio() if screen else 1.0
+        jobs = [sprite_atlas.make_prerender_job(config_manager.PET_SIZE, dpr, priority=0)]
+        
+        # 托盘图标，当前状态优先
+        icon_states = ["normal", "happy", "excited", "sleeping"]
+        current_state = config_manager.get_state()
+        if current_state not in icon_states:
+            current_state = "normal"
+        icon_manager = IconManager()
+        for state in icon_states:
+            jobs.append(icon_manager.make_prerender_job(state, priority=0 if state == current_state else 1))
         
+        for job in jobs:
+            if job is not None:
+                service.submit(job)
+        
+        if service.is_idle():
+            logger.info("资源已全部缓存，无需预加载")
+        return service
+        
+    except Exception as e:
+        logger.error(f"启动预渲染服务失败: {e}")
+        return None
+
+
+def parse_arguments(argv):
+    """
+    解析命令行参数
+
+    未识别的参数原样保留，交给QApplication处理（如 -platform）
+
+    Returns:
+        (参数, 剩余的argv)
+    """
+    parser = argparse.ArgumentParser(prog="haropet", description="哈罗桌面宠物")
+    parser.add_argument("--profile-startup", nargs="?", const=DEFAULT_PROFILE_PATH, metavar="PATH",
+                        help="记录启动各阶段耗时，写入JSON报告并打印摘要")
+    parser.add_argument("--profile-no-imports", action="store_true",
+                        help="启动分析时不统计模块导入耗时")
+    parser.add_argument("--profile-exit", action="store_true",
+                        help="写出启动分析报告后立即退出（用于自动化检测启动回归）")
+    # 以下命令也可以在哈罗运行时再次启动程序传给它
+    parser.add_argument("--greet", action="store_true", help="让哈罗打招呼")
+    parser.add_argument("--follow", choices=("on", "off"), help="开启或关闭跟随指针")
+    parser.add_argument("--show", action="store_true", help="显示哈罗并置于最前")
+    parser.add_argument("--log", choices=(MODE_QUIET, MODE_VERBOSE),
+                        help="日志模式：quiet 限流并只在控制台显示警告，verbose 输出全部调试日志")
+    args, remaining = parser.parse_known_args(argv[1:])
+    return args, argv[:1] + remaining
+
+
+def execute_commands(args, pet, tray) -> None:
+    """
+    执行命令行中的宠物命令（本进程启动参数或其他实例转发的参数）
+    
+    Args:
+        args: parse_arguments 解析出的参数
+        pet: 哈罗宠物
+        tray: 系统托盘
+    """
+    try:
+        if args.log is not None:
+            set_log_mode(args.log)
+        if args.show:
+            tray.show_pet()
+        if args.follow is not None:
+            tray.set_follow_enabled(args.follow == "on")
+        if args.greet:
+            pet.greet()
+    except Exception as e:
+        logger.error(f"执行命令失败: {e}")
+
+
+def on_forwarded_command(argv: List[str], pet, tray) -> None:
+    """处理其他实例转发来的参数"""
+    args, _ = parse_arguments([sys.argv[0]] + argv)
+    # 没有指定命令时（直接再次启动）把已运行的哈罗显示到最前
+    if not (args.greet or args.show or args.follow is not None or args.log is not None):
+        args.show = True
+    execute_commands(args, pet, tray)
+
+
+def finish_startup_profile(app: 'QApplication', path: str, exit_after: bool) -> None:
+    """事件循环第一次空闲时写出启动分析报告"""
+    startup_profiler.mark("event_loop_idle")
+    startup_profiler.disable()
+    try:
+        report = startup_profiler.write_report(path)
+        print(startup_profiler.format_summary(report))
     except Exception as e:
-        logger.error(f"启动预加载线程失败: {e}")
+        logger.error(f"写入启动分析报告失败: {e}")
+    if exit_after:
+        app.quit()
 
 
 def main() -> NoReturn:
     """主函数（优化版）"""
     try:
         # 快速路径：检查命令行参数
-        if len(sys.argv) > 1:
-            # 处理命令行参数
-            pass
+        args, qt_argv = parse_arguments(sys.argv)
         
-        # 检查单实例（轻量级操作）
-        instance_manager = InstanceManager()
-        # 临时禁用单实例检查，用于测试
-        # if not instance_manager.is_primary_instance:
-        #     logger.info("由于检测到已有实例，程序退出")
-        #     sys.exit(1)
+        # 检查单实例：已有实例在运行时转发参数后立即退出
+        with startup_profiler.phase("instance_check"):
+            forwarded = forward_to_running_instance(sys.argv[1:])
+        if forwarded:
+            logger.info("哈罗已在运行，参数已转发给已运行的实例")
+            sys.exit(0)
         
         # 创建应用程序
-        app = QApplication(sys.argv)
-        configure_application(app)
+        with startup_profiler.phase("create_application"):
+            from PyQt5.QtWidgets import QApplication
+            app = QApplication(qt_argv)
+            configure_application(app)
+        
+        # 开始监听其他实例的命令（两个实例同时启动时，后监听的一方转发后退出）
+        instance_server = InstanceServer(parent=app)
+        if not instance_server.listen():
+            forward_to_running_instance(sys.argv[1:])
+            logger.info("哈罗已在运行，参数已转发给已运行的实例")
+            sys.exit(0)
         
-        # 启动资源预加载（后台线程）
-        preload_resources()
+        # 启动资源预渲染（线程池）
+        with startup_profiler.phase("start_prerender"):
+            prerender_service = preload_resources(app)
         
         # 延迟导入重量级组件
-        from haropet.haro_pet import HaroPet
-        from haropet.system_tray import HaroSystemTray
+        with startup_profiler.phase("import_components"):
+            from haropet.haro_pet import HaroPet
+            from haropet.system_tray import HaroSystemTray
         
         # 初始化组件
         logger.info("正在初始化哈罗宠物...")
-        pet = HaroPet()
+        with startup_profiler.phase("create_pet"):
+            pet = HaroPet()
         
         logger.info("正在初始化系统托盘...")
-        tray = HaroSystemTray(pet)
-        tray.show()
+        with startup_profiler.phase("create_tray"):
+            tray = HaroSystemTray(pet)
+            tray.show()
+        
+        # 执行本次启动参数中的命令，并接收之后其他实例转发的命令
+        execute_commands(args, pet, tray)
+        instance_server.command_received.connect(lambda argv: on_forwarded_command(argv, pet, tray))
         
         logger.info("哈罗桌面宠物启动完成")
+        startup_profiler.mark("startup_complete")
+        
+        if args.profile_startup:
+            # 首个事件循环空闲时窗口已完成首次绘制
+            QTimer.singleShot(0, lambda: finish_startup_profile(app, args.profile_startup, args.profile_exit))
         
         # 运行应用程序
         exit_code = app.exec_()
         
         # 清理资源
-        instance_manager.cleanup()
+        instance_server.close()
         
         logger.info(f"哈罗桌面宠物已关闭，退出代码: {exit_code}")
         sys.exit(exit_code)
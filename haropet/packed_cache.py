@@ -0,0 +1,363 @@
+# -*- coding: utf-8 -*-
+"""
+打包图标磁盘缓存
+单个文件保存索引和原始预乘ARGB32像素，启动时内存映射，
+条目从映射内存直接复制到QImage，不需要解码
+
+文件布局:
+    [文件头 32字节][像素数据块...][索引(JSON)]
+    文件头: 魔数, 版本, 保留, 索引偏移, 索引长度
+    索引:   {key: [offset, width, height, bytes_per_line, format, content_hash, seq]}
+
+追加时把新数据块和新索引写到文件末尾，最后才更新文件头，
+旧索引和被替换的数据块成为空洞，由后台压缩回收。
+"""
+
+import os
+import json
+import mmap
+import struct
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from PyQt5 import sip
+from PyQt5.QtGui import QImage
+
+logger = logging.getLogger('Haropet.PackedCache')
+
+_MAGIC = b"HAROPAK1"
+_VERSION = 1
+_HEADER = struct.Struct("<8sIIQQ")
+_ALIGN = 16
+_FORMAT = QImage.Format_ARGB32_Premultiplied
+
+# 空洞超过该字节数且超过有效数据时触发后台压缩
+COMPACT_MIN_DEAD_BYTES = 256 * 1024
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+class PackedIconCache:
+    """
+    打包图标缓存
+
+    Args:
+        path: 缓存文件路径
+        max_entries: 最多保留的条目数，超出时压缩会丢弃最旧的条目
+    """
+
+    def __init__(self, path: str, max_entries: int = 100):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.RLock()
+        self._file = None
+        self._mm: Optional[mmap.mmap] = None
+        self._index: Dict[str, List] = {}
+        self._index_end = _HEADER.size
+        self._seq = 0
+        self._compacting = False
+        self._stats = {"hits": 0, "misses": 0, "appends": 0, "skipped": 0, "compactions": 0}
+        self._open()
+
+    # ------------------------------------------------------------------
+    # 打开与映射
+    # ------------------------------------------------------------------
+
+    def _open(self) -> None:
+        """打开缓存文件并映射，文件无效时重建"""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            if not os.path.exists(self.path):
+                self._reset_file()
+            self._file = open(self.path, "r+b")
+            self._remap()
+            self._load_index()
+        except Exception as e:
+            logger.warning(f"打包缓存无效，将重建: {e}")
+            self._close()
+            try:
+                self._reset_file()
+                self._file = open(self.path, "r+b")
+                self._remap()
+                self._load_index()
+            except Exception as e:
+                logger.error(f"打开打包缓存失败: {e}")
+                self._close()
+
+    def _reset_file(self) -> None:
+        """写入只有文件头和空索引的新文件"""
+        index = b"{}"
+        with open(self.path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, 0, _HEADER.size, len(index)))
+            f.write(index)
+
+    def _remap(self) -> None:
+        """重新映射整个文件"""
+        if self._mm is not None:
+            self._mm.close()
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _load_index(self) -> None:
+        """从映射中读取文件头和索引"""
+        magic, version, _, index_offset, index_length = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("文件头不匹配")
+        if index_offset + index_length > len(self._mm):
+            raise ValueError("索引越界")
+        self._index = json.loads(self._mm[index_offset:index_offset + index_length].decode("utf-8"))
+        self._index_end = index_offset + index_length
+        self._seq = max((entry[6] for entry in self._index.values()), default=0)
+
+    def _close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self) -> None:
+        """关闭缓存文件"""
+        with self._lock:
+            self._close()
+
+    # ------------------------------------------------------------------
+    # 读写
+    # ------------------------------------------------------------------
+
+    def get_image(self, key: str) -> Optional[QImage]:
+        """
+        读取缓存图像
+
+        返回的QImage总是独立于映射内存：重新映射和后台压缩都会关闭旧映射
+        （Windows下替换文件前必须关闭），引用映射内存的图像会指向已释放的内存。
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            QImage，未命中时返回None；可以跨线程使用
+        """
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None or self._mm is None:
+                self._stats["misses"] += 1
+                return None
+
+            offset, width, height, stride, fmt = entry[:5]
+            size = stride * height
+            if offset + size > len(self._mm):
+                # 有新追加的数据尚未映射
+                self._remap()
+
+            view = memoryview(self._mm)[offset:offset + size]
+            try:
+                # 在锁内复制，此后映射被关闭也不影响返回的图像
+                image = QImage(sip.voidptr(view), width, height, stride, QImage.Format(fmt)).copy()
+            finally:
+                view.release()
+
+            self._stats["hits"] += 1
+            return image
+
+    def put(self, key: str, image: QImage) -> bool:
+        """
+        追加图像到缓存，内容未变化时跳过写入
+
+        Args:
+            key: 缓存键
+            image: 要缓存的图像（会转换为预乘ARGB32）
+
+        Returns:
+            是否写入了新数据
+        """
+        if image.format() != _FORMAT:
+            image = image.convertToFormat(_FORMAT)
+        ptr = image.constBits()
+        ptr.setsize(image.byteCount())
+        data = ptr.asstring()
+        content_hash = hashlib.sha1(data).hexdigest()[:16]
+
+        with self._lock:
+            if self._file is None:
+                return False
+
+            entry = self._index.get(key)
+            if entry is not None and entry[5] == content_hash \
+                    and entry[1:3] == [image.width(), image.height()]:
+                self._stats["skipped"] += 1
+                return False
+
+            try:
+                offset = _align(self._index_end)
+                self._seq += 1
+                self._index[key] = [offset, image.width(), image.height(), image.bytesPerLine(),
+                                    int(_FORMAT), content_hash, self._seq]
+                self._write_tail(offset, data)
+                self._stats["appends"] += 1
+            except Exception as e:
+                logger.error(f"写入打包缓存失败: {e}")
+                self._index.pop(key, None)
+                return False
+
+        self._maybe_compact()
+        return True
+
+    def _write_tail(self, offset: int, data: bytes) -> None:
+        """在文件末尾写入数据块和新索引，最后更新文件头（调用方需持有锁）"""
+        index = json.dumps(self._index, separators=(",", ":")).encode("utf-8")
+        index_offset = offset + len(data)
+
+        f = self._file
+        f.seek(offset)
+        f.write(data)
+        f.write(index)
+        f.truncate()
+        f.flush()
+
+        f.seek(0)
+        f.write(_HEADER.pack(_MAGIC, _VERSION, 0, index_offset, len(index)))
+        f.flush()
+        self._index_end = index_offset + len(index)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._close()
+            try:
+                self._reset_file()
+            except OSError as e:
+                logger.error(f"清空打包缓存失败: {e}")
+            self._index = {}
+            self._index_end = _HEADER.size
+            self._seq = 0
+            self._open()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取缓存统计信息"""
+        with self._lock:
+            live = sum(entry[3] * entry[2] for entry in self._index.values())
+            return dict(self._stats, entries=len(self._index), live_bytes=live,
+                        file_bytes=self._index_end)
+
+    # ------------------------------------------------------------------
+    # 压缩
+    # ------------------------------------------------------------------
+
+    def _maybe_compact(self) -> None:
+        """空洞过多或条目过多时启动后台压缩"""
+        with self._lock:
+            if self._compacting:
+                return
+            live = sum(entry[3] * entry[2] for entry in self._index.values())
+            dead = self._index_end - _HEADER.size - live
+            if len(self._index) <= self.max_entries and \
+                    (dead < COMPACT_MIN_DEAD_BYTES or dead < live):
+                return
+            self._compacting = True
+
+        threading.Thread(target=self._compact, name="HaropetCacheCompactor", daemon=True).start()
+
+    def compact(self) -> None:
+        """同步压缩缓存文件"""
+        with self._lock:
+            if self._compacting:
+                return
+            self._compacting = True
+        self._compact()
+
+    def _compact(self) -> None:
+        """
+        把有效条目复制到新文件后原子替换
+
+        复制在锁外进行，期间新追加的条目在替换前补写到新文件。
+        """
+        temp_path = self.path + ".compact"
+        try:
+            with self._lock:
+                snapshot = dict(self._index)
+            # 条目过多时保留最新的max_entries个
+            keep = sorted(snapshot.items(), key=lambda item: item[1][6])[-self.max_entries:]
+
+            new_index = {}
+            with open(self.path, "rb") as src, open(temp_path, "wb") as dst:
+                dst.write(b"\0" * _HEADER.size)
+                offset = _HEADER.size
+                for key, entry in keep:
+                    offset = _align(offset)
+                    size = entry[3] * entry[2]
+                    src.seek(entry[0])
+                    data = src.read(size)
+                    dst.seek(offset)
+                    dst.write(data)
+                    new_index[key] = [offset] + entry[1:]
+                    offset += size
+
+                with self._lock:
+                    # 补写压缩期间新追加或替换的条目
+                    for key, entry in self._index.items():
+                        if snapshot.get(key) is entry:
+                            continue
+                        offset = _align(offset)
+                        size = entry[3] * entry[2]
+                        src.seek(entry[0])
+                        data = src.read(size)
+                        dst.seek(offset)
+                        dst.write(data)
+                        new_index[key] = [offset] + entry[1:]
+                        offset += size
+
+                    index = json.dumps(new_index, separators=(",", ":")).encode("utf-8")
+                    dst.seek(offset)
+                    dst.write(index)
+                    dst.seek(0)
+                    dst.write(_HEADER.pack(_MAGIC, _VERSION, 0, offset, len(index)))
+                    dst.flush()
+                    os.fsync(dst.fileno())
+
+                    # Windows下需要先关闭映射才能替换文件
+                    self._close()
+                    src.close()
+                    os.replace(temp_path, self.path)
+                    self._file = open(self.path, "r+b")
+                    self._remap()
+                    self._load_index()
+                    self._stats["compactions"] += 1
+
+            logger.debug(f"打包缓存压缩完成，保留 {len(new_index)} 个条目")
+        except Exception as e:
+            logger.error(f"压缩打包缓存失败: {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            with self._lock:
+                if self._file is None:
+                    self._open()
+        finally:
+            with self._lock:
+                self._compacting = False
+
+
+_caches: Dict[str, PackedIconCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_packed_cache(path: str, max_entries: int = 100) -> PackedIconCache:
+    """获取指定路径的共享打包缓存（同一路径只映射一次）"""
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = PackedIconCache(path, max_entries)
+            _caches[path] = cache
+        return cache
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+后台预渲染服务
+在线程池中绘制QImage（线程安全），再分批在GUI线程转换为QPixmap并放入缓存
+"""
+
+import heapq
+import itertools
+import logging
+from typing import Callable, Hashable, List, Optional, Tuple
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+from PyQt5.QtGui import QImage
+
+logger = logging.getLogger('Haropet.Prerender')
+
+
+class PrerenderJob:
+    """
+    预渲染任务
+
+    Args:
+        key: 任务键，用于去重
+        render: 在工作线程中调用，返回QImage（不得使用QPixmap或控件）
+        install: 在GUI线程中调用，参数为render的结果
+        priority: 优先级，值越小越先渲染
+    """
+
+    __slots__ = ("key", "render", "install", "priority")
+
+    def __init__(self, key: Hashable, render: Callable[[], Optional[QImage]],
+                 install: Callable[[QImage], None], priority: int = 0):
+        self.key = key
+        self.render = render
+        self.install = install
+        self.priority = priority
+
+
+class _RenderSignals(QObject):
+    """工作线程向GUI线程回传结果的信号（跨线程自动排队）"""
+    rendered = pyqtSignal(object, object)
+
+
+class _RenderRunnable(QRunnable):
+    """在线程池中执行单个预渲染任务"""
+
+    def __init__(self, job: PrerenderJob, signals: _RenderSignals):
+        super().__init__()
+        self._job = job
+        self._signals = signals
+
+    def run(self) -> None:
+        try:
+            image = self._job.render()
+        except Exception as e:
+            logger.error(f"预渲染失败 {self._job.key}: {e}")
+            image = None
+        self._signals.rendered.emit(self._job, image)
+
+
+class PrerenderService(QObject):
+    """
+    预渲染服务
+
+    任务按优先级排队，最多同时运行max_threads个；渲染结果在GUI线程中
+    每批最多转换batch_size个，避免一次性阻塞事件循环。
+    所有任务完成后发出finished信号。
+    """
+
+    finished = pyqtSignal()
+    item_ready = pyqtSignal(object)
+
+    def __init__(self, parent: Optional[QObject] = None, max_threads: int = 1, batch_size: int = 4):
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max(1, max_threads))
+        self._max_in_flight = self._pool.maxThreadCount()
+        self._batch_size = max(1, batch_size)
+
+        self._queue: List[Tuple[int, int, PrerenderJob]] = []
+        self._counter = itertools.count()
+        self._known_keys = set()
+        self._in_flight = 0
+        self._results: List[Tuple[PrerenderJob, Optional[QImage]]] = []
+
+        self._signals = _RenderSignals(self)
+        self._signals.rendered.connect(self._on_rendered)
+
+        self._batch_timer = QTimer(self)
+        self._batch_timer.setSingleShot(True)
+        self._batch_timer.timeout.connect(self._install_batch)
+
+    def submit(self, job: PrerenderJob) -> bool:
+        """
+        提交预渲染任务
+
+        Args:
+            job: 预渲染任务
+
+        Returns:
+            是否加入队列（相同键的任务只会渲染一次）
+        """
+        if job.key in self._known_keys:
+            return False
+        self._known_keys.add(job.key)
+        heapq.heappush(self._queue, (job.priority, next(self._counter), job))
+        self._dispatch()
+        return True
+
+    def is_idle(self) -> bool:
+        """是否所有任务都已完成"""
+        return not self._queue and self._in_flight == 0 and not self._results
+
+    def wait_for_done(self, msecs: int = -1) -> bool:
+        """等待线程池中正在运行的任务结束（主要用于退出和测试）"""
+        return self._pool.waitForDone(msecs)
+
+    def _dispatch(self) -> None:
+        """按优先级把任务交给线程池"""
+        while self._queue and self._in_flight < self._max_in_flight:
+            _, _, job = heapq.heappop(self._queue)
+            self._in_flight += 1
+            self._pool.start(_RenderRunnable(job, self._signals))
+
+    def _on_rendered(self, job: PrerenderJob, image: Optional[QImage]) -> None:
+        """GUI线程中接收渲染结果"""
+        self._in_flight -= 1
+        self._results.append((job, image))
+        if not self._batch_timer.isActive():
+            self._batch_timer.start(0)
+        self._dispatch()
+
+    def _install_batch(self) -> None:
+        """在GUI线程中分批安装渲染结果"""
+        batch = self._results[:self._batch_size]
+        del self._results[:self._batch_size]
+
+        for job, image in batch:
+            if image is None or image.isNull():
+                continue
+            try:
+                job.install(image)
+                self.item_ready.emit(job.key)
+            except Exception as e:
+                logger.error(f"安装预渲染结果失败 {job.key}: {e}")
+
+        if self._results:
+            self._batch_timer.start(0)
+        elif self.is_idle():
+            logger.info("预渲染完成")
+            self.finished.emit()
@@ -3,7 +3,9 @@
 block_cipher = None
 
 # 项目文件列表
-added_files = []
+added_files = [
+    ('animations', 'haropet/animations'),  # 动画描述文件
+]
 
 a = Analysis(
     ['main.py'],
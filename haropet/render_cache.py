@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+渲染缓存模块
+进程内统一的图像缓存，按字节数做O(1) LRU淘汰
+"""
+
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from haropet.config_manager import config_manager
+
+logger = logging.getLogger('Haropet.RenderCache')
+
+
+def palette_hash(palette: Any) -> str:
+    """
+    计算调色板哈希
+
+    Args:
+        palette: 颜色字典，值可以是QColor或RGB(A)元组；None表示无调色板
+
+    Returns:
+        短哈希字符串
+    """
+    if palette is None:
+        return ""
+
+    def _encode(value):
+        # QColor等对象转换为RGBA元组
+        if hasattr(value, "getRgb"):
+            return value.getRgb()
+        return str(value)
+
+    payload = json.dumps(palette, sort_keys=True, default=_encode)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+class RenderCache:
+    """
+    渲染缓存
+
+    键为 (renderer, state, size, dpr, palette_hash)，值为QPixmap/QImage。
+    以 宽*高*4 字节（物理像素，即 w*h*4*dpr²）计算占用，超出预算时淘汰最久未使用的项。
+    """
+
+    def __init__(self, max_bytes: int, name: str = "render"):
+        self.name = name
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "inserts": 0}
+
+    @staticmethod
+    def make_key(renderer: str, state: str, size: int, dpr: float = 1.0, palette: Any = None) -> Tuple:
+        """
+        生成缓存键
+
+        Args:
+            renderer: 渲染器名称（如 "icon"、"resource"）
+            state: 状态或资源名
+            size: 逻辑尺寸
+            dpr: 设备像素比
+            palette: 调色板（字典）或已计算好的调色板哈希字符串
+
+        Returns:
+            缓存键元组
+        """
+        palette_key = palette if isinstance(palette, str) else palette_hash(palette)
+        return (renderer, state, size, round(dpr, 2), palette_key)
+
+    @staticmethod
+    def image_bytes(image: Any) -> int:
+        """计算图像占用的字节数（物理像素 * 4）"""
+        return max(image.width() * image.height() * 4, 0)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """获取缓存项，命中时移到最近使用位置"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[0]
+
+    def put(self, key: Hashable, image: Any) -> None:
+        """
+        添加缓存项，超出字节预算时淘汰最久未使用的项
+
+        Args:
+            key: make_key() 生成的键
+            image: QPixmap或QImage
+        """
+        size = self.image_bytes(image)
+        if size > self.max_bytes:
+            logger.debug(f"[{self.name}] 图像过大，不缓存: {key}")
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (image, size)
+            self._bytes += size
+            self._stats["inserts"] += 1
+
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._stats["evictions"] += 1
+
+    def discard(self, key: Hashable) -> None:
+        """删除指定缓存项"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry[1]
+
+    def clear(self, renderer: Optional[str] = None) -> None:
+        """
+        清除缓存
+
+        Args:
+            renderer: 只清除该渲染器的缓存项，为None时清除全部
+        """
+        with self._lock:
+            if renderer is None:
+                self._entries.clear()
+                self._bytes = 0
+                return
+            for key in [k for k in self._entries if isinstance(k, tuple) and k[0] == renderer]:
+                self._bytes -= self._entries.pop(key)[1]
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        """当前缓存占用的字节数"""
+        return self._bytes
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取命中、未命中、淘汰等统计信息"""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return dict(
+                self._stats,
+                entries=len(self._entries),
+                bytes=self._bytes,
+                max_bytes=self.max_bytes,
+                hit_rate=self._stats["hits"] / lookups if lookups else 0.0,
+            )
+
+# 创建全局渲染缓存实例
+render_cache = RenderCache(config_manager.RENDER_CACHE_MAX_BYTES)
+# 状态过渡帧条使用独立预算
+transition_cache = RenderCache(config_manager.TRANSITION_CACHE_MAX_BYTES, "transition")
@@ -9,16 +9,23 @@ import os
 import logging
 from typing import Optional, Dict
 
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QRectF
 from PyQt5.QtGui import QPixmap, QPainter, QColor, QRadialGradient, QImage
 
 from haropet.config_manager import config_manager
+from haropet.render_cache import render_cache
 
 logger = logging.getLogger('Haropet.Resources')
 
 class HaroResources:
     """资源管理器"""
     
+    # 所有可绘制的状态，新增表情时在此追加即可进入精灵图集
+    STATES = ("normal", "back")
+    
+    # 渲染器版本，修改绘制代码时递增以使磁盘上的图集失效
+    RENDERER_VERSION = 1
+    
     # 直接初始化静态颜色属性
     colors = config_manager.COLORS
     BODY_COLOR = QColor(*colors["body"])
@@ -29,20 +36,22 @@ class HaroResources:
     SHADOW_COLOR = QColor(*colors["shadow"])
     TEXT_COLOR = QColor(*colors["text"])
     
-    def __init__(self):
-        self._resource_cache = {}
-        self._cache_access_count = {}
-        self._max_cache_size = 20  # 最大缓存数量
-    
     @classmethod
     def draw_haro(cls, pixmap, state="normal"):
-        """绘制哈罗宠物形象"""
+        """绘制哈罗宠物形象（支持QPixmap和QImage，按逻辑尺寸绘制）"""
         pixmap.fill(Qt.transparent)
         painter = QPainter(pixmap)
         painter.setRenderHint(QPainter.Antialiasing)
         painter.setRenderHint(QPainter.SmoothPixmapTransform)
 
-        w, h = pixmap.width(), pixmap.height()
+        dpr = pixmap.devicePixelRatio()
+        cls.paint_haro(painter, int(pixmap.width() / dpr), int(pixmap.height() / dpr), state)
+
+        painter.end()
+    
+    @classmethod
+    def paint_haro(cls, painter, w, h, state="normal"):
+        """使用已激活的QPainter在 (0, 0, w, h) 区域内绘制哈罗"""
         center_x, center_y = w // 2, h // 2
         radius = min(w, h) // 2 - 8
 
@@ -53,15 +62,13 @@ class HaroResources:
             HaroResources._draw_back(painter, center_x, center_y, radius)
         else:
             HaroResources._draw_normal_face(painter, center_x, center_y, radius)
-
-        painter.end()
     
     @staticmethod
     def _draw_shadow(painter, x, y, radius):
         """绘制阴影"""
         painter.setPen(Qt.NoPen)
         painter.setBrush(QColor(0, 0, 0, 30))
-        painter.drawEllipse(x - radius, y - radius // 4, radius * 2, radius // 2)
+        painter.drawEllipse(QRectF(x - radius, y - radius // 4, radius * 2, radius // 2))
     
     @staticmethod
     def _draw_body(painter, x, y, radius):
@@ -92,7 +99,7 @@ class HaroResources:
             alpha = 60 if i == 0 else 40
             pen_color = QColor(60, 160, 60, alpha)
             painter.setPen(pen_color)
-            painter.drawArc(x - line_width // 2, line_y - radius // 12 + offset_y, line_width, radius // 6, 0, 180 * 16)
+            painter.drawArc(QRectF(x - line_width // 2, line_y - radius // 12 + offset_y, line_width, radius // 6), 0, 180 * 16)
 
     @staticmethod
     def _draw_back(painter, x, y, radius):
@@ -127,30 +134,29 @@ class HaroResources:
 
         painter.setPen(Qt.NoPen)
         painter.setBrush(HaroResources.BLUSH_COLOR)
-        painter.drawEllipse(x - blush_x_offset, blush_y - blush_radius, blush_radius * 2, blush_radius * 1.6)
-        painter.drawEllipse(x + blush_x_offset - blush_radius * 2, blush_y - blush_radius, blush_radius * 2, blush_radius * 1.6)
+        painter.drawEllipse(QRectF(x - blush_x_offset, blush_y - blush_radius, blush_radius * 2, blush_radius * 1.6))
+        painter.drawEllipse(QRectF(x + blush_x_offset - blush_radius * 2, blush_y - blush_radius, blush_radius * 2, blush_radius * 1.6))
     
     def load_pixmap(self, resource_name: str, size: Optional[int] = None) -> Optional[QPixmap]:
         """加载图像资源（带缓存管理）"""
-        cache_key = f"{resource_name}_{size}" if size else resource_name
+        is_builtin = resource_name in ("haro_normal", "haro_back")
+        cache_key = render_cache.make_key(
+            "resource", resource_name, size or 0, 1.0,
+            config_manager.COLORS if is_builtin else None
+        )
         
         # 检查缓存
-        if cache_key in self._resource_cache:
-            self._cache_access_count[cache_key] = self._cache_access_count.get(cache_key, 0) + 1
-            return self._resource_cache[cache_key]
+        cached = render_cache.get(cache_key)
+        if cached is not None:
+            return cached
         
         # 尝试加载资源
         try:
-            # 对于内置资源，使用绘制方式
-            if resource_name == "haro_normal":
-                pixmap = QPixmap(size or 200, size or 200)
-                self.draw_haro(pixmap, "normal")
-                self._add_to_cache(cache_key, pixmap)
-                return pixmap
-            elif resource_name == "haro_back":
-                pixmap = QPixmap(size or 200, size or 200)
-                self.draw_haro(pixmap, "back")
-                self._add_to_cache(cache_key, pixmap)
+            # 对于内置资源，从精灵图集中截取，避免重复绘制
+            if is_builtin:
+                from haropet.sprite_atlas import sprite_atlas
+                pixmap = sprite_atlas.frame(resource_name[len("haro_"):], size or 200)
+                render_cache.put(cache_key, pixmap)
                 return pixmap
             
             # 对于外部资源，尝试从文件加载
@@ -159,7 +165,7 @@ class HaroResources:
                 pixmap = QPixmap(resource_path)
                 if size and not pixmap.isNull():
                     pixmap = pixmap.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                self._add_to_cache(cache_key, pixmap)
+                render_cache.put(cache_key, pixmap)
                 return pixmap
             
             logger.warning(f"未找到资源: {resource_name}")
@@ -168,33 +174,6 @@ class HaroResources:
             logger.error(f"加载资源失败 {resource_name}: {e}")
             return None
     
-    def _add_to_cache(self, cache_key: str, pixmap: QPixmap):
-        """添加到缓存，自动清理旧缓存"""
-        # 如果缓存已满，清理最少使用的缓存
-        if len(self._resource_cache) >= self._max_cache_size:
-            self._cleanup_cache()
-        
-        self._resource_cache[cache_key] = pixmap
-        self._cache_access_count[cache_key] = 1
-    
-    def _cleanup_cache(self):
-        """清理最少使用的缓存项"""
-        if not self._resource_cache:
-            return
-        
-        # 找出最少使用的缓存项
-        min_count = min(self._cache_access_count.values())
-        keys_to_remove = [k for k, v in self._cache_access_count.items() if v == min_count]
-        
-        # 删除最少使用的项
-        for key in keys_to_remove[:len(keys_to_remove) // 2 + 1]:
-            if key in self._resource_cache:
-                del self._resource_cache[key]
-            if key in self._cache_access_count:
-                del self._cache_access_count[key]
-        
-        logger.info(f"清理了 {len(keys_to_remove)} 个缓存项")
-    
     def _get_resource_path(self, resource_name: str) -> Optional[str]:
         """获取资源文件路径"""
         resource_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources")
@@ -212,7 +191,7 @@ class HaroResources:
     
     def clear_cache(self):
         """清除资源缓存"""
-        self._resource_cache.clear()
+        render_cache.clear("resource")
         logger.info("资源缓存已清除")
 
 # 创建全局资源管理器实例
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+屏幕布局模块
+缓存所有屏幕的可用区域，只在屏幕增减或可用区域变化时重建，
+跟随和位置恢复时的屏幕查询都是缓存读取
+"""
+
+import bisect
+import logging
+from typing import List, Optional, Tuple
+
+from PyQt5.QtCore import QObject, QPoint, QRect, pyqtSignal
+from PyQt5.QtGui import QGuiApplication
+
+logger = logging.getLogger('Haropet.ScreenLayout')
+
+
+class ScreenLayout(QObject):
+    """
+    屏幕布局
+
+    屏幕按可用区域左边界排序，screen_at() 用二分查找定位候选屏幕；
+    clamp_rect() 把矩形限制在所有屏幕的并集内（选择位移最小的屏幕），
+    因此宠物可以在多个显示器之间移动。
+    """
+
+    changed = pyqtSignal()
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._rects: List[QRect] = []
+        self._lefts: List[int] = []
+        self._max_width = 0
+        self._union = QRect()
+
+        app = QGuiApplication.instance()
+        app.screenAdded.connect(self._on_screen_added)
+        app.screenRemoved.connect(self._on_screens_changed)
+        for screen in QGuiApplication.screens():
+            self._watch_screen(screen)
+
+        self.rebuild()
+
+    def _watch_screen(self, screen) -> None:
+        """监听单个屏幕的几何变化"""
+        screen.availableGeometryChanged.connect(self._on_screens_changed)
+        screen.geometryChanged.connect(self._on_screens_changed)
+
+    def _on_screen_added(self, screen) -> None:
+        self._watch_screen(screen)
+        self._on_screens_changed()
+
+    def _on_screens_changed(self, *args) -> None:
+        """屏幕变化时重建缓存"""
+        self.rebuild()
+        self.changed.emit()
+
+    def rebuild(self) -> None:
+        """重新读取所有屏幕的可用区域"""
+        rects = sorted((screen.availableGeometry() for screen in QGuiApplication.screens()),
+                       key=lambda rect: rect.left())
+        union = QRect()
+        for rect in rects:
+            union = union.united(rect)
+
+        self._rects = rects
+        self._lefts = [rect.left() for rect in rects]
+        self._max_width = max((rect.width() for rect in rects), default=0)
+        self._union = union
+        logger.debug(f"屏幕布局: {[(r.x(), r.y(), r.width(), r.height()) for r in rects]}")
+
+    def screens(self) -> List[QRect]:
+        """所有屏幕的可用区域"""
+        return list(self._rects)
+
+    def union(self) -> QRect:
+        """所有屏幕可用区域的外接矩形"""
+        return QRect(self._union)
+
+    def screen_at(self, point: QPoint) -> Optional[QRect]:
+        """
+        查找包含指定点的屏幕
+
+        Args:
+            point: 全局坐标
+
+        Returns:
+            屏幕可用区域，点不在任何屏幕上时返回None
+        """
+        x = point.x()
+        # 只有左边界在 [x - 最大宽度, x] 内的屏幕可能包含该点
+        end = bisect.bisect_right(self._lefts, x)
+        start = bisect.bisect_left(self._lefts, x - self._max_width + 1)
+        for rect in self._rects[start:end]:
+            if rect.contains(point):
+                return rect
+        return None
+
+    def clamp_rect(self, x: float, y: float, width: int, height: int, margin: int = 0) -> Tuple[float, float]:
+        """
+        把矩形限制在屏幕并集内
+
+        Args:
+            x: 矩形左上角x
+            y: 矩形左上角y
+            width: 矩形宽度
+            height: 矩形高度
+            margin: 与屏幕边缘保持的距离
+
+        Returns:
+            限制后的左上角坐标（选择位移最小的屏幕）
+        """
+        best = None
+        best_distance = None
+        for rect in self._rects:
+            left = rect.left() + margin
+            top = rect.top() + margin
+            right = max(left, rect.right() - width - margin)
+            bottom = max(top, rect.bottom() - height - margin)
+            cx = min(max(x, left), right)
+            cy = min(max(y, top), bottom)
+            distance = (cx - x) ** 2 + (cy - y) ** 2
+            if best_distance is None or distance < best_distance:
+                best, best_distance = (cx, cy), distance
+                if distance == 0:
+                    break
+        return best if best is not None else (x, y)
+
+
+_layout: Optional[ScreenLayout] = None
+
+
+def get_screen_layout() -> ScreenLayout:
+    """获取全局屏幕布局（首次调用时读取屏幕信息，需要已创建QApplication）"""
+    global _layout
+    if _layout is None:
+        _layout = ScreenLayout()
+    return _layout
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+单实例模块
+基于本地套接字（QLocalServer）：第二次启动时连接已运行的实例，
+把命令行参数转发过去后立即退出，整个过程不导入QtWidgets。
+进程崩溃后残留的套接字在确认无人监听时会被清除。
+"""
+
+import json
+import getpass
+import logging
+from typing import List, Optional
+
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtNetwork import QAbstractSocket, QLocalServer, QLocalSocket
+
+logger = logging.getLogger('Haropet.SingleInstance')
+
+# 连接和发送的超时（毫秒），服务端不存在时连接会立即失败
+CONNECT_TIMEOUT_MS = 500
+WRITE_TIMEOUT_MS = 500
+# 单条命令的最大长度，超过时丢弃连接
+MAX_MESSAGE_BYTES = 64 * 1024
+
+
+def server_name() -> str:
+    """本地套接字名称，按用户区分，多个用户可以各自运行一个实例"""
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = "default"
+    return f"Haropet_SingleInstance_{user}"
+
+
+def forward_to_running_instance(args: List[str], name: Optional[str] = None) -> bool:
+    """
+    尝试把命令行参数转发给已运行的实例
+
+    Args:
+        args: 命令行参数（不含程序名）
+        name: 套接字名称，默认为 server_name()
+
+    Returns:
+        是否有实例在运行并已收到参数
+    """
+    socket = QLocalSocket()
+    socket.connectToServer(name or server_name())
+    if not socket.waitForConnected(CONNECT_TIMEOUT_MS):
+        return False
+
+    payload = json.dumps(list(args), ensure_ascii=False).encode("utf-8") + b"\n"
+    socket.write(payload)
+    ok = socket.waitForBytesWritten(WRITE_TIMEOUT_MS)
+    socket.disconnectFromServer()
+    if socket.state() != QLocalSocket.UnconnectedState:
+        socket.waitForDisconnected(WRITE_TIMEOUT_MS)
+    if not ok:
+        logger.warning(f"向已运行的实例发送参数失败: {socket.errorString()}")
+    return ok
+
+
+class InstanceServer(QObject):
+    """
+    主实例的命令服务端
+
+    其他实例转发来的参数通过 command_received 信号发出。
+
+    Args:
+        name: 套接字名称，默认为 server_name()
+        parent: 父对象
+    """
+
+    command_received = pyqtSignal(list)
+
+    def __init__(self, name: Optional[str] = None, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._name = name or server_name()
+        # 不设置UserAccessOption：该选项下listen会直接替换已存在的套接字，
+        # 无法发现正在运行的实例
+        self._server = QLocalServer(self)
+        self._server.newConnection.connect(self._on_new_connection)
+
+    def listen(self) -> bool:
+        """
+        开始监听
+
+        套接字名已被占用时先确认是否真有实例在监听：
+        有则返回False（调用方应转发参数后退出），
+        没有则说明是崩溃残留，清除后重新监听。
+
+        Returns:
+            是否成为主实例
+        """
+        if self._server.listen(self._name):
+            logger.info("主实例启动成功")
+            return True
+
+        if self._server.serverError() != QAbstractSocket.AddressInUseError:
+            # 无法监听（例如权限问题）时仍然继续运行，只是不再保证单实例
+            logger.warning(f"单实例服务启动失败: {self._server.errorString()}")
+            return True
+
+        probe = QLocalSocket()
+        probe.connectToServer(self._name)
+        if probe.waitForConnected(CONNECT_TIMEOUT_MS):
+            probe.disconnectFromServer()
+            logger.warning("检测到另一个哈罗实例已在运行")
+            return False
+
+        logger.info("清除上次异常退出残留的单实例套接字")
+        QLocalServer.removeServer(self._name)
+        if not self._server.listen(self._name):
+            logger.warning(f"单实例服务启动失败: {self._server.errorString()}")
+        return True
+
+    def close(self) -> None:
+        """停止监听（Unix上同时删除套接字文件）"""
+        if self._server.isListening():
+            self._server.close()
+            logger.info("单实例服务已关闭")
+
+    def _on_new_connection(self) -> None:
+        """接收其他实例的连接"""
+        while self._server.hasPendingConnections():
+            socket = self._server.nextPendingConnection()
+            buffer = bytearray()
+            socket.readyRead.connect(lambda s=socket, b=buffer: self._on_ready_read(s, b))
+            socket.disconnected.connect(socket.deleteLater)
+
+    def _on_ready_read(self, socket: QLocalSocket, buffer: bytearray) -> None:
+        """读到完整的一行后解析参数"""
+        buffer.extend(bytes(socket.readAll()))
+        if len(buffer) > MAX_MESSAGE_BYTES:
+            logger.warning("收到的命令过长，已丢弃")
+            socket.abort()
+            return
+
+        newline = buffer.find(b"\n")
+        if newline < 0:
+            return
+        line = bytes(buffer[:newline])
+        socket.disconnectFromServer()
+
+        try:
+            args = json.loads(line.decode("utf-8"))
+        except (UnicodeDecodeError, ValueError) as e:
+            logger.warning(f"无法解析转发的参数: {e}")
+            return
+        if not isinstance(args, list) or not all(isinstance(a, str) for a in args):
+            logger.warning("转发的参数格式不正确")
+            return
+
+        logger.info(f"收到其他实例转发的参数: {args}")
+        self.command_received.emit(args)
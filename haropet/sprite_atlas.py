@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+"""
+精灵图集模块
+每种 (尺寸, DPR) 只绘制一次所有状态，持久化到磁盘，状态切换时仅做子区域拷贝
+"""
+
+import os
+import json
+import struct
+import hashlib
+import logging
+import tempfile
+import threading
+from concurrent.futures import Future
+from typing import Dict, Optional, Tuple
+
+from PyQt5.QtCore import Qt, QRect
+from PyQt5.QtGui import QPixmap, QPainter, QImage
+
+from haropet.config_manager import config_manager
+
+logger = logging.getLogger('Haropet.SpriteAtlas')
+
+# 磁盘文件头：魔数、宽、高、每行字节数
+_ATLAS_MAGIC = b"HAROATL1"
+_ATLAS_HEADER = struct.Struct("<8sIII")
+_ATLAS_FORMAT = QImage.Format_ARGB32_Premultiplied
+
+
+class SpriteAtlas:
+    """
+    精灵图集
+
+    所有状态横向排列在同一张图上，frame() 通过 QPixmap.copy(rect) 截取子区域。
+    图集以原始 ARGB32 数据保存，热启动时只需一次内存拷贝，无需重新绘制。
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir or os.path.join(tempfile.gettempdir(), "haropet", "sprite_atlas")
+        # {(size, dpr): (图集, {state: QRect})}
+        self._atlases: Dict[Tuple[int, float], Tuple[QPixmap, Dict[str, QRect]]] = {}
+        # 已提交给预渲染服务的图集，同步路径复用其结果而不是再绘制一次
+        self._pending: Dict[Tuple[int, float], Future] = {}
+        self._pending_lock = threading.Lock()
+        self._stats = {"rendered": 0, "loaded": 0, "frames": 0}
+
+    @staticmethod
+    def _states() -> Tuple[str, ...]:
+        from haropet.resources import HaroResources
+        return HaroResources.STATES
+
+    def atlas_key(self, size: int, dpr: float = 1.0) -> str:
+        """
+        生成图集键，颜色配置或渲染器版本变化时自动失效
+
+        Args:
+            size: 单帧逻辑尺寸
+            dpr: 设备像素比
+
+        Returns:
+            图集键字符串
+        """
+        from haropet.resources import HaroResources
+        payload = json.dumps({
+            "colors": config_manager.COLORS,
+            "renderer": HaroResources.RENDERER_VERSION,
+            "states": HaroResources.STATES,
+            "size": size,
+            "dpr": dpr,
+        }, sort_keys=True)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+    def frame(self, state: str, size: int, dpr: float = 1.0) -> QPixmap:
+        """
+        获取指定状态的帧
+
+        Args:
+            state: 宠物状态，未知状态回退到第一帧
+            size: 逻辑尺寸
+            dpr: 设备像素比
+
+        Returns:
+            设置好设备像素比的QPixmap
+        """
+        atlas, rects = self._get_atlas(size, dpr)
+        rect = rects.get(state) or rects[self._states()[0]]
+        pixmap = atlas.copy(rect)
+        pixmap.setDevicePixelRatio(dpr)
+        self._stats["frames"] += 1
+        return pixmap
+
+    def warm_up(self, size: int, dpr: float = 1.0) -> None:
+        """提前准备图集（从磁盘加载或绘制）"""
+        self._get_atlas(size, dpr)
+
+    def install_image(self, size: int, dpr: float, image: QImage) -> None:
+        """
+        安装在其他线程中绘制好的图集图像
+
+        Args:
+            size: 逻辑尺寸
+            dpr: 设备像素比
+            image: build_image() 的结果
+        """
+        dpr = round(dpr, 2)
+        self._atlases[(size, dpr)] = (QPixmap.fromImage(image), self._frame_rects(size, dpr))
+
+    def make_prerender_job(self, size: int, dpr: float = 1.0, priority: int = 0):
+        """
+        创建图集预渲染任务（工作线程中读取磁盘或绘制，GUI线程中安装）
+
+        Args:
+            size: 逻辑尺寸
+            dpr: 设备像素比
+            priority: 优先级，值越小越先渲染
+
+        Returns:
+            PrerenderJob，如果图集已在内存中则返回None
+        """
+        from haropet.prerender import PrerenderJob
+
+        dpr = round(dpr, 2)
+        with self._pending_lock:
+            if (size, dpr) in self._atlases or (size, dpr) in self._pending:
+                return None
+            future: Future = Future()
+            self._pending[(size, dpr)] = future
+
+        key = self.atlas_key(size, dpr)
+
+        def _render() -> Optional[QImage]:
+            # 同步路径在任务开始前取消了它，图集由GUI线程自己准备
+            if not future.set_running_or_notify_cancel():
+                return None
+            try:
+                image = self._load_or_build(key, size, dpr)
+            except BaseException as e:
+                future.set_exception(e)
+                raise
+            future.set_result(image)
+            return image
+
+        def _install(image: QImage) -> None:
+            with self._pending_lock:
+                self._pending.pop((size, dpr), None)
+            # 可能已被同步路径加载过
+            if (size, dpr) not in self._atlases:
+                self.install_image(size, dpr, image)
+
+        return PrerenderJob(("sprite_atlas", size, dpr), _render, _install, priority)
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取图集统计信息"""
+        return dict(self._stats, atlases=len(self._atlases))
+
+    def clear(self) -> None:
+        """清除内存中的图集"""
+        self._atlases.clear()
+        with self._pending_lock:
+            self._pending.clear()
+
+    def _frame_rects(self, size: int, dpr: float) -> Dict[str, QRect]:
+        """计算每个状态在图集中的物理像素区域"""
+        side = int(round(size * dpr))
+        return {state: QRect(i * side, 0, side, side) for i, state in enumerate(self._states())}
+
+    def _get_atlas(self, size: int, dpr: float) -> Tuple[QPixmap, Dict[str, QRect]]:
+        """获取图集（内存 -> 磁盘 -> 绘制）"""
+        dpr = round(dpr, 2)
+        entry = self._atlases.get((size, dpr))
+        if entry is not None:
+            return entry
+
+        image = self._take_pending(size, dpr)
+        if image is None:
+            image = self._load_or_build(self.atlas_key(size, dpr), size, dpr)
+
+        entry = (QPixmap.fromImage(image), self._frame_rects(size, dpr))
+        self._atlases[(size, dpr)] = entry
+        return entry
+
+    def _take_pending(self, size: int, dpr: float) -> Optional[QImage]:
+        """
+        取得预渲染任务的结果：任务已开始时等待它完成，尚未开始时取消它
+
+        Returns:
+            图集图像；没有任务、任务被取消或失败时返回None
+        """
+        with self._pending_lock:
+            future = self._pending.pop((size, dpr), None)
+        if future is None or future.cancel():
+            return None
+        try:
+            return future.result()
+        except Exception:
+            return None
+
+    def _load_or_build(self, key: str, size: int, dpr: float) -> QImage:
+        """从磁盘加载图集，没有时绘制并保存（只使用QImage，可在工作线程中调用）"""
+        image = self._load_from_disk(key, size, dpr)
+        if image is None:
+            image = self.build_image(size, dpr)
+            self._stats["rendered"] += 1
+            self._save_to_disk(key, size, dpr, image)
+        else:
+            self._stats["loaded"] += 1
+        return image
+
+    def build_image(self, size: int, dpr: float = 1.0) -> QImage:
+        """
+        绘制完整图集（只使用QImage，可在工作线程中调用）
+
+        Args:
+            size: 单帧逻辑尺寸
+            dpr: 设备像素比
+
+        Returns:
+            横向排列所有状态的QImage
+        """
+        from haropet.resources import HaroResources
+
+        states = HaroResources.STATES
+        side = int(round(size * dpr))
+        image = QImage(side * len(states), side, _ATLAS_FORMAT)
+        image.fill(Qt.transparent)
+
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        for i, state in enumerate(states):
+            painter.save()
+            painter.translate(i * side, 0)
+            painter.scale(dpr, dpr)
+            HaroResources.paint_haro(painter, size, size, state)
+            painter.restore()
+        painter.end()
+
+        logger.debug(f"绘制精灵图集: size={size}, dpr={dpr}, states={states}")
+        return image
+
+    def _atlas_file(self, size: int, dpr: float) -> str:
+        """图集文件路径前缀（不含键）"""
+        return os.path.join(self.cache_dir, f"atlas_{size}_{dpr:g}_")
+
+    def _load_from_disk(self, key: str, size: int, dpr: float) -> Optional[QImage]:
+        """从磁盘加载图集，尺寸不符或文件损坏时返回None"""
+        path = self._atlas_file(size, dpr) + f"{key}.bin"
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        try:
+            magic, width, height, stride = _ATLAS_HEADER.unpack_from(data)
+            side = int(round(size * dpr))
+            expected = (side * len(self._states()), side)
+            if magic != _ATLAS_MAGIC or (width, height) != expected \
+                    or len(data) != _ATLAS_HEADER.size + stride * height:
+                logger.warning(f"精灵图集文件无效，将重新绘制: {path}")
+                return None
+
+            # 从原始数据构造QImage后复制一份，使图像拥有独立内存
+            pixels = data[_ATLAS_HEADER.size:]
+            image = QImage(pixels, width, height, stride, _ATLAS_FORMAT).copy()
+            logger.debug(f"从磁盘加载精灵图集: {path}")
+            return image
+        except Exception as e:
+            logger.warning(f"加载精灵图集失败: {e}")
+            return None
+
+    def _save_to_disk(self, key: str, size: int, dpr: float, image: QImage) -> None:
+        """原子地保存图集，并删除同尺寸的过期图集"""
+        prefix = self._atlas_file(size, dpr)
+        path = prefix + f"{key}.bin"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+            ptr = image.constBits()
+            ptr.setsize(image.byteCount())
+            header = _ATLAS_HEADER.pack(_ATLAS_MAGIC, image.width(), image.height(), image.bytesPerLine())
+
+            # 临时文件名唯一，并发写入同一图集时不会读到对方写了一半的文件
+            fd, temp_file = tempfile.mkstemp(dir=self.cache_dir, prefix=os.path.basename(path) + ".",
+                                             suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(header)
+                    f.write(ptr.asstring())
+                os.replace(temp_file, path)
+            except BaseException:
+                try:
+                    os.remove(temp_file)
+                except OSError:
+                    pass
+                raise
+
+            # 颜色或渲染器变化后，旧图集不会再被使用（跳过其他写入者的临时文件）
+            base = os.path.basename(prefix)
+            for file_name in os.listdir(self.cache_dir):
+                if file_name.startswith(base) and file_name != os.path.basename(path) \
+                        and not file_name.endswith(".tmp"):
+                    try:
+                        os.remove(os.path.join(self.cache_dir, file_name))
+                    except OSError:
+                        pass
+        except Exception as e:
+            logger.warning(f"保存精灵图集失败: {e}")
+
+# 创建全局精灵图集实例
+sprite_atlas = SpriteAtlas()
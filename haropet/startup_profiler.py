@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+启动性能分析模块
+按阶段记录单调时钟时间戳，可选统计每个阶段中各模块的导入耗时，
+生成JSON报告和文字摘要（python main.py --profile-startup）
+
+本模块只依赖标准库，必须能在导入PyQt5之前使用。
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import importlib.abc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger('Haropet.StartupProfiler')
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# 每个阶段报告中保留的最慢模块数
+TOP_IMPORTS = 10
+
+
+def _peak_rss_kb() -> Optional[int]:
+    """进程峰值常驻内存（KB），平台不支持时返回None"""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS 以字节为单位，Linux 以KB为单位
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """包装原加载器，记录模块执行耗时"""
+
+    def __init__(self, loader, recorder: "_ImportRecorder"):
+        self._loader = loader
+        self._recorder = recorder
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._recorder.enter()
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._recorder.leave(module.__name__, time.perf_counter() - start)
+
+    def __getattr__(self, name):
+        # 其他属性（get_resource_reader等）交给原加载器
+        return getattr(self._loader, name)
+
+
+class _ImportRecorder(importlib.abc.MetaPathFinder):
+    """元路径查找器，统计每个模块的总耗时和自身耗时"""
+
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+        self._child_time: List[float] = []
+        self._finding = False
+
+    def find_spec(self, fullname, path, target=None):
+        if self._finding:
+            return None
+        self._finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                        spec.loader = _TimedLoader(spec.loader, self)
+                    return spec
+            return None
+        finally:
+            self._finding = False
+
+    def enter(self) -> None:
+        self._child_time.append(0.0)
+
+    def leave(self, name: str, elapsed: float) -> None:
+        children = self._child_time.pop()
+        if self._child_time:
+            self._child_time[-1] += elapsed
+        self.records.append({"module": name, "total_ms": elapsed * 1e3,
+                             "self_ms": (elapsed - children) * 1e3})
+
+
+class StartupProfiler:
+    """
+    启动性能分析器
+
+    未启用时所有方法都是空操作，可以无条件地留在启动代码中。
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.imports_enabled = False
+        self._origin = time.monotonic()
+        self._phases: List[Dict[str, Any]] = []
+        self._marks: List[Dict[str, Any]] = []
+        self._recorder: Optional[_ImportRecorder] = None
+
+    def enable(self, imports: bool = True) -> None:
+        """
+        启用分析
+
+        Args:
+            imports: 是否同时统计模块导入耗时
+        """
+        if self.enabled:
+            return
+        self.enabled = True
+        if imports:
+            self.imports_enabled = True
+            self._recorder = _ImportRecorder()
+            sys.meta_path.insert(0, self._recorder)
+
+    def disable(self) -> None:
+        """停止统计导入耗时"""
+        if self._recorder is not None and self._recorder in sys.meta_path:
+            sys.meta_path.remove(self._recorder)
+
+    def _now_ms(self) -> float:
+        return (time.monotonic() - self._origin) * 1e3
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        记录一个启动阶段
+
+        Args:
+            name: 阶段名
+        """
+        if not self.enabled:
+            yield
+            return
+
+        start = self._now_ms()
+        modules_before = len(sys.modules)
+        records_before = len(self._recorder.records) if self._recorder else 0
+        try:
+            yield
+        finally:
+            end = self._now_ms()
+            entry = {
+                "name": name,
+                "start_ms": start,
+                "end_ms": end,
+                "duration_ms": end - start,
+                "modules_imported": len(sys.modules) - modules_before,
+            }
+            if self._recorder is not None:
+                records = self._recorder.records[records_before:]
+                entry["slowest_imports"] = sorted(
+                    records, key=lambda r: r["self_ms"], reverse=True
+                )[:TOP_IMPORTS]
+            self._phases.append(entry)
+
+    def mark(self, name: str) -> None:
+        """记录一个时间点"""
+        if self.enabled:
+            self._marks.append({"name": name, "at_ms": self._now_ms(), "peak_rss_kb": _peak_rss_kb()})
+
+    def report(self) -> Dict[str, Any]:
+        """生成报告"""
+        return {
+            "python": sys.version.split()[0],
+            "platform": sys.platform,
+            "total_ms": self._now_ms(),
+            "process_time_ms": time.process_time() * 1e3,
+            "peak_rss_kb": _peak_rss_kb(),
+            "phases": list(self._phases),
+            "marks": list(self._marks),
+        }
+
+    def write_report(self, path: str) -> Dict[str, Any]:
+        """
+        把报告写入JSON文件
+
+        Args:
+            path: 报告文件路径
+
+        Returns:
+            报告内容
+        """
+        report = self.report()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        logger.info(f"启动分析报告已写入: {path}")
+        return report
+
+    @staticmethod
+    def format_summary(report: Dict[str, Any]) -> str:
+        """生成文字摘要"""
+        lines = [f"启动总耗时: {report['total_ms']:.1f} ms (CPU {report['process_time_ms']:.1f} ms)"]
+        for phase in report["phases"]:
+            lines.append(f"  {phase['name']:<20} {phase['duration_ms']:>8.1f} ms"
+                         f"  (+{phase['modules_imported']} 模块)")
+            for record in phase.get("slowest_imports", [])[:3]:
+                if record["self_ms"] >= 1.0:
+                    lines.append(f"      {record['module']:<30} {record['self_ms']:>7.1f} ms")
+        for mark in report["marks"]:
+            rss = f"  峰值内存 {mark['peak_rss_kb'] / 1024:.1f} MB" if mark["peak_rss_kb"] else ""
+            lines.append(f"  @ {mark['name']:<18} {mark['at_ms']:>8.1f} ms{rss}")
+        return "\n".join(lines)
+
+
+# 创建全局启动分析器实例（默认不启用）
+startup_profiler = StartupProfiler()
@@ -7,17 +7,22 @@
 import sys
 import os
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, TYPE_CHECKING
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from PyQt5.QtWidgets import QSystemTrayIcon, QMenu, QAction, QMessageBox, QApplication, QDialog
 from PyQt5.QtCore import Qt, QPoint, QTimer, pyqtSignal, QObject
 from PyQt5.QtGui import QIcon, QPixmap, QPainter, QColor, QCursor
-from haropet.haro_pet import HaroPet
-from haropet.user_panel import UserPanel
 from haropet.icon_manager import IconManager
-from haropet.menu_manager import MenuManager
+from haropet.render_cache import render_cache
+from haropet.asset_manifest import get_asset_manifest, RENDER
+
+# 用户面板和菜单管理器在第一次使用时才导入，不影响首帧绘制
+if TYPE_CHECKING:
+    from haropet.haro_pet import HaroPet
+    from haropet.user_panel import UserPanel
+    from haropet.menu_manager import MenuManager
 
 
 class HaroSystemTray(QSystemTrayIcon):
@@ -40,7 +45,7 @@ class HaroSystemTray(QSystemTrayIcon):
         pet: 哈罗宠物对象，可以为None（功能受限）
     """
     
-    def __init__(self, pet: Optional[HaroPet]) -> None:
+    def __init__(self, pet: Optional['HaroPet']) -> None:
         """
         初始化哈罗系统托盘
         
@@ -50,15 +55,12 @@ class HaroSystemTray(QSystemTrayIcon):
         super().__init__()
         self.pet = pet
         
-        # 初始化图标缓存
-        self._cached_icons = {}
-        
         # 初始化管理器
         self.icon_manager = IconManager()
-        self.menu_manager = MenuManager(self)
+        self._menu_manager: Optional['MenuManager'] = None
         
         # 性能优化：延迟初始化非关键资源
-        self._user_panel: Optional[QDialog] = None
+        self._user_panel: Optional['UserPanel'] = None
         
         # 立即设置基本图标，确保托盘显示正常
         self._setup_icon()
@@ -66,6 +68,23 @@ class HaroSystemTray(QSystemTrayIcon):
         # 延迟设置菜单和连接，优化启动时间
         QTimer.singleShot(0, self._delayed_setup)
     
+    @property
+    def menu_manager(self) -> 'MenuManager':
+        """菜单管理器（首次访问时创建）"""
+        if self._menu_manager is None:
+            from haropet.menu_manager import MenuManager
+            self._menu_manager = MenuManager(self)
+        return self._menu_manager
+    
+    def _get_user_panel(self) -> 'UserPanel':
+        """用户面板只创建一次，之后每次打开前重新读取配置"""
+        if self._user_panel is None:
+            from haropet.user_panel import UserPanel
+            self._user_panel = UserPanel(None)
+        else:
+            self._user_panel.reload()
+        return self._user_panel
+    
     def _delayed_setup(self) -> None:
         """
         延迟设置方法，优化启动性能
@@ -120,39 +139,13 @@ class HaroSystemTray(QSystemTrayIcon):
         """
         获取图标文件路径
         
-        尝试从多个位置寻找图标文件，返回第一个找到的有效路径。
-        支持ICO和PNG格式的图标文件。
+        从资源清单中读取启动时解析好的托盘图标，支持ICO和PNG格式。
         
         Returns:
             图标文件的完整路径，如果找不到则返回None
         """
         try:
-            # 获取当前文件的目录 - 使用可靠的方式获取程序目录
-            current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            self._log_debug(f"程序目录: {current_dir}")
-            
-            # 可能的图标文件路径列表 - 支持ICO和PNG格式
-            possible_paths = [
-                # 首先检查新创建的PNG图标
-                os.path.join(current_dir, "new_haro_icon.png"),
-                # 然后检查传统的ICO图标
-                os.path.join(current_dir, "icon.ico"),
-                os.path.join(current_dir, "icon_backup.ico"),
-                os.path.join(current_dir, "haropet.ico"),
-                # 检查PNG格式的图标
-                os.path.join(current_dir, "icon.png"),
-                os.path.join(current_dir, "haropet.png"),
-            ]
-            
-            # 尝试找到第一个存在的图标文件
-            for path in possible_paths:
-                self._log_debug(f"检查图标路径: {path}")
-                if os.path.exists(path) and os.path.isfile(path):
-                    self._log_debug(f"找到图标文件: {path}")
-                    return path
-            
-            self._log_debug("未找到任何图标文件")
-            return None
+            return get_asset_manifest().tray_icon_file()
         except Exception as e:
             self._log_error(f"获取图标路径失败: {e}")
             return None
@@ -183,7 +176,7 @@ class HaroSystemTray(QSystemTrayIcon):
         try:
             # 首先尝试使用现有的icon.ico文件
             icon_file_path = self._get_icon_file_path()
-            if icon_file_path and os.path.exists(icon_file_path):
+            if icon_file_path:
                 try:
                     # 使用现有的图标文件
                     icon = QIcon(icon_file_path)
@@ -241,70 +234,7 @@ class HaroSystemTray(QSystemTrayIcon):
     
     def _create_icon_traditional(self) -> None:
         """使用传统方法创建图标（回退方案）"""
-        try:
-            pixmap = QPixmap(48, 48)
-            if pixmap.isNull():
-                raise ValueError("无法创建QPixmap对象")
-            
-            pixmap.fill(Qt.transparent)
-            
-            painter = QPainter(pixmap)
-            if not painter.isActive():
-                raise RuntimeError("QPainter无法激活")
-                
-            painter.setRenderHint(QPainter.Antialiasing)
-            painter.setRenderHint(QPainter.SmoothPixmapTransform)
-            
-            # 使用传统绘制方法
-            self._draw_haro_to_painter(painter, "normal")
-            
-            painter.end()
-            self.setIcon(QIcon(pixmap))
-            
-        except Exception as e:
-            self._log_error(f"传统图标创建失败: {e}")
-            self.setIcon(self._create_fallback_icon())
-        finally:
-            if 'painter' in locals() and painter.isActive():
-                painter.end()
-    
-    def _setup_auto_cleanup(self) -> None:
-        """
-        设置自动缓存清理机制
-        
-        定期清理过期的缓存项，防止内存泄漏。
-        """
-        try:
-            # 每5分钟清理一次缓存
-            cleanup_timer = QTimer(self)
-            cleanup_timer.timeout.connect(self._cleanup_old_cache)
-            cleanup_timer.start(5 * 60 * 1000)  # 5分钟
-            
-            self._cleanup_timer = cleanup_timer
-            
-        except Exception as e:
-            self._log_warning(f"设置自动清理失败: {e}")
-    
-    def _cleanup_old_cache(self) -> None:
-        """
-        清理过期的缓存项
-        
-        保留最近使用的图标，清理旧的缓存项以防止内存泄漏。
-        """
-        try:
-            # 这里可以扩展为基于时间的缓存清理
-            # 当前实现基于数量限制，在_cache_icon方法中处理
-            
-            if len(self._cached_icons) > 5:
-                # 保留最新的5个，清除多余的
-                keys_to_remove = list(self._cached_icons.keys())[:-5]
-                for key in keys_to_remove:
-                    del self._cached_icons[key]
-                    
-                self._log_debug(f"清理了{len(keys_to_remove)}个过期缓存项")
-                
-        except Exception as e:
-            self._log_warning(f"清理缓存失败: {e}")
+        self._create_icon_traditional_for_state("normal")
     
     def _log_debug(self, message: str) -> None:
         """记录调试日志"""
@@ -381,7 +311,8 @@ class HaroSystemTray(QSystemTrayIcon):
             
             self.follow_action = QAction("跟随指针", self)
             self.follow_action.setCheckable(True)
-            self.follow_action.setChecked(False)
+            # 与宠物当前的跟随状态一致（配置或命令行可能已开启跟随）
+            self.follow_action.setChecked(self.pet is not None and self.pet.is_follow_enabled())
             self.menu.addAction(self.follow_action)
             
             self.menu.addSeparator()
@@ -439,19 +370,7 @@ class HaroSystemTray(QSystemTrayIcon):
             pet_state: 宠物状态（normal, happy, excited, sleeping等）
         """
         try:
-            # 首先尝试使用现有图标文件中的不同尺寸或状态
-            icon_file_path = self._get_state_icon_file_path(pet_state)
-            if icon_file_path and os.path.exists(icon_file_path):
-                try:
-                    icon = QIcon(icon_file_path)
-                    if not icon.isNull():
-                        self.setIcon(icon)
-                        self._log_debug(f"成功加载状态图标: {pet_state} from {icon_file_path}")
-                        return
-                except Exception as e:
-                    self._log_warning(f"加载状态图标失败: {e}")
-            
-            # 使用IconManager获取状态图标
+            # IconManager先查资源清单中的状态图标文件，再查渲染缓存
             icon = self.icon_manager.get_icon(pet_state)
             if not icon.isNull():
                 self.setIcon(icon)
@@ -476,28 +395,17 @@ class HaroSystemTray(QSystemTrayIcon):
         Returns:
             状态图标文件路径，如果不存在则返回None
         """
-        current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        
-        # 状态图标文件命名规则 - 支持ICO和PNG格式
-        state_icon_names = {
-            "normal": ["new_haro_icon.png", "icon.png", "icon.ico", "haropet.png", "haropet.ico"],
-            "happy": ["icon_happy.png", "icon_happy.ico", "haropet_happy.png", "haropet_happy.ico"],
-            "excited": ["icon_excited.png", "icon_excited.ico", "haropet_excited.png", "haropet_excited.ico"],
-            "sleeping": ["icon_sleeping.png", "icon_sleeping.ico", "haropet_sleeping.png", "haropet_sleeping.ico"],
-        }
-        
-        # 获取可能的状态图标文件列表
-        possible_names = state_icon_names.get(pet_state, state_icon_names["normal"])
-        
-        for name in possible_names:
-            icon_path = os.path.join(current_dir, name)
-            if os.path.exists(icon_path):
-                return icon_path
-        
-        return None
+        icon_file = get_asset_manifest().resolve(pet_state)
+        return None if icon_file == RENDER else icon_file
     
     def _create_icon_traditional_for_state(self, pet_state: str) -> None:
-        """为特定状态创建传统图标（回退方案）"""
+        """为特定状态创建传统图标（回退方案），结果存入全局渲染缓存"""
+        cache_key = render_cache.make_key("tray_fallback", pet_state, 48)
+        cached_pixmap = render_cache.get(cache_key)
+        if cached_pixmap is not None:
+            self.setIcon(QIcon(cached_pixmap))
+            return
+        
         try:
             pixmap = QPixmap(48, 48)
             if pixmap.isNull():
@@ -513,9 +421,10 @@ class HaroSystemTray(QSystemTrayIcon):
             painter.setRenderHint(QPainter.SmoothPixmapTransform)
             
             # 使用状态特定的绘制方法
-            self._draw_haro_to_painter(painter, pet_state)
+            self._draw_simple_haro_icon(painter, pet_state)
             
             painter.end()
+            render_cache.put(cache_key, pixmap)
             self.setIcon(QIcon(pixmap))
             self._log_debug(f"创建传统状态图标: {pet_state}")
             
@@ -563,12 +472,41 @@ class HaroSystemTray(QSystemTrayIcon):
             # 显示用户友好的错误提示
             QMessageBox.warning(None, "操作失败", "无法切换跟随模式，请重试")
     
+    def set_follow_enabled(self, enabled: bool) -> None:
+        """
+        设置跟随模式并同步菜单勾选状态（供命令行和其他实例转发的命令使用）
+        
+        Args:
+            enabled: 是否跟随
+        """
+        if self.pet is None:
+            self._log_warning("宠物对象不可用，无法切换跟随模式")
+            return
+        
+        self.pet.set_follow_enabled(enabled)
+        action = getattr(self, "follow_action", None)
+        if action is not None:
+            # 不触发toggled，避免重复设置
+            action.blockSignals(True)
+            action.setChecked(enabled)
+            action.blockSignals(False)
+    
+    def show_pet(self) -> None:
+        """显示宠物窗口并置于最前"""
+        if self.pet is None:
+            return
+        self.pet.show()
+        self.pet.raise_()
+        self.pet.activateWindow()
+    
     def _update_status(self, state) -> None:
         """更新状态显示，包含错误处理"""
         try:
             if self.status_action is None:
                 return  # 如果菜单还未初始化，跳过更新
-                
+            
+            # 宠物已创建，模块已在内存中，这里的导入不产生开销
+            from haropet.haro_pet import HaroPet
             state_names = {
                 HaroPet.STATE_NORMAL: "哈罗：正常",
                 HaroPet.STATE_BACK: "哈罗：背对",
@@ -640,7 +578,7 @@ class HaroSystemTray(QSystemTrayIcon):
             Exception: 如果用户面板创建失败或执行失败
         """
         try:
-            panel = UserPanel(None)
+            panel = self._get_user_panel()
             result = panel.exec_()
             
             if result == QDialog.Accepted:
@@ -673,13 +611,7 @@ class HaroSystemTray(QSystemTrayIcon):
         """
         try:
             # 清理缓存
-            self._cached_icons.clear()
-            self._cached_states.clear()
-            
-            # 停止自动清理计时器
-            if hasattr(self, '_cleanup_timer') and self._cleanup_timer:
-                self._cleanup_timer.stop()
-                self._cleanup_timer.deleteLater()
+            render_cache.clear("tray_fallback")
             
             # 清理用户面板
             if self._user_panel:
@@ -728,4 +660,10 @@ class HaroSystemTray(QSystemTrayIcon):
             # 即使保存失败，也应该退出应用程序
             pass
         finally:
+            # 退出前确保延迟写入的配置落盘
+            try:
+                from haropet.config_manager import config_manager
+                config_manager.flush()
+            except Exception as e:
+                self._log_error(f"写入配置失败: {e}")
             QApplication.quit()
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+关键帧时间轴模块
+动画以数据描述（haropet/animations/*.json），首次使用时加载并编译为
+定长采样表（array('f')），每帧求值只是一次下标查找
+"""
+
+import os
+import json
+import math
+import bisect
+import logging
+import threading
+from array import array
+from typing import Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger('Haropet.Timeline')
+
+# 动画描述文件目录
+ANIMATION_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "animations")
+
+# 支持的轨道
+TRACK_NAMES = ("x", "y", "scale", "opacity", "frame")
+
+# 默认采样点数（与动画时长无关，进度按 0.0 - 1.0 归一化）
+DEFAULT_SAMPLES = 256
+
+# 缓动函数，参数和返回值均为 0.0 - 1.0
+EASINGS: Dict[str, Callable[[float], float]] = {
+    "linear": lambda t: t,
+    "step": lambda t: 0.0,
+    "ease_in_quad": lambda t: t * t,
+    "ease_out_quad": lambda t: 1 - (1 - t) * (1 - t),
+    "ease_in_out_quad": lambda t: 2 * t * t if t < 0.5 else 1 - (-2 * t + 2) ** 2 / 2,
+    "ease_in_cubic": lambda t: t ** 3,
+    "ease_out_cubic": lambda t: 1 - (1 - t) ** 3,
+    "ease_in_sine": lambda t: 1 - math.cos(t * math.pi / 2),
+    "ease_out_sine": lambda t: math.sin(t * math.pi / 2),
+    "ease_in_out_sine": lambda t: -(math.cos(math.pi * t) - 1) / 2,
+}
+
+
+class Track:
+    """
+    编译后的单条轨道
+
+    Args:
+        name: 轨道名
+        values: 均匀采样的值
+    """
+
+    __slots__ = ("name", "values")
+
+    def __init__(self, name: str, values: array):
+        self.name = name
+        self.values = values
+
+    def sample(self, progress: float) -> float:
+        """按进度取最近的采样值"""
+        last = len(self.values) - 1
+        if progress <= 0.0:
+            return self.values[0]
+        if progress >= 1.0:
+            return self.values[last]
+        return self.values[int(progress * last + 0.5)]
+
+
+class Timeline:
+    """
+    编译后的时间轴，所有轨道采样点数相同
+
+    Args:
+        name: 动画名
+        tracks: {轨道名: Track}
+        samples: 采样点数
+    """
+
+    def __init__(self, name: str, tracks: Dict[str, Track], samples: int):
+        self.name = name
+        self.tracks = tracks
+        self.samples = samples
+        self._last = samples - 1
+
+    def index(self, progress: float) -> int:
+        """把进度转换为采样下标，同一帧的多条轨道可共用"""
+        if progress <= 0.0:
+            return 0
+        if progress >= 1.0:
+            return self._last
+        return int(progress * self._last + 0.5)
+
+    def value(self, track: str, progress: float, default: float = 0.0) -> float:
+        """
+        求单条轨道在指定进度的值
+
+        Args:
+            track: 轨道名
+            progress: 动画进度（0.0 - 1.0）
+            default: 轨道不存在时返回的值
+        """
+        compiled = self.tracks.get(track)
+        if compiled is None:
+            return default
+        return compiled.values[self.index(progress)]
+
+    def evaluate(self, progress: float) -> Dict[str, float]:
+        """求所有轨道在指定进度的值"""
+        i = self.index(progress)
+        return {name: track.values[i] for name, track in self.tracks.items()}
+
+
+def compile_track(name: str, keyframes: Sequence[Sequence], samples: int = DEFAULT_SAMPLES) -> Track:
+    """
+    把关键帧编译为采样表
+
+    关键帧格式为 [t, value, easing]，t为 0.0 - 1.0 的进度，easing作用于
+    到下一个关键帧之间的区间（省略时为linear）。相同t的两个关键帧表示跳变。
+
+    Args:
+        name: 轨道名
+        keyframes: 关键帧列表，按t升序
+        samples: 采样点数
+
+    Returns:
+        编译后的轨道
+    """
+    if not keyframes:
+        raise ValueError(f"轨道 {name} 没有关键帧")
+
+    times: List[float] = []
+    values: List[float] = []
+    easings: List[Callable[[float], float]] = []
+    for keyframe in keyframes:
+        t, value = float(keyframe[0]), float(keyframe[1])
+        easing_name = keyframe[2] if len(keyframe) > 2 else "linear"
+        easing = EASINGS.get(easing_name)
+        if easing is None:
+            raise ValueError(f"轨道 {name} 使用了未知的缓动函数: {easing_name}")
+        if times and t < times[-1]:
+            raise ValueError(f"轨道 {name} 的关键帧未按时间排序")
+        times.append(t)
+        values.append(value)
+        easings.append(easing)
+
+    table = array('f')
+    last = samples - 1
+    for i in range(samples):
+        t = i / last
+        # 相同t的关键帧取后一个，使跳变点落在新区间
+        k = bisect.bisect_right(times, t) - 1
+        if k < 0:
+            table.append(values[0])
+        elif k >= len(times) - 1:
+            table.append(values[-1])
+        else:
+            span = times[k + 1] - times[k]
+            local = (t - times[k]) / span
+            table.append(values[k] + (values[k + 1] - values[k]) * easings[k](local))
+    return Track(name, table)
+
+
+def compile_timeline(name: str, data: dict) -> Timeline:
+    """
+    编译动画描述
+
+    Args:
+        name: 动画名
+        data: 动画描述，格式见 haropet/animations/*.json
+
+    Returns:
+        编译后的时间轴
+    """
+    samples = int(data.get("samples", DEFAULT_SAMPLES))
+    if samples < 2:
+        raise ValueError(f"动画 {name} 的采样点数至少为2")
+
+    tracks = {}
+    for track_name, keyframes in data.get("tracks", {}).items():
+        if track_name not in TRACK_NAMES:
+            raise ValueError(f"动画 {name} 包含未知轨道: {track_name}")
+        tracks[track_name] = compile_track(track_name, keyframes, samples)
+    return Timeline(name, tracks, samples)
+
+
+_timelines: Dict[str, Timeline] = {}
+_timelines_lock = threading.Lock()
+
+
+def get_timeline(name: str) -> Timeline:
+    """
+    获取动画时间轴（首次使用时从JSON加载并编译）
+
+    Args:
+        name: 动画名，对应 haropet/animations/<name>.json
+
+    Returns:
+        编译后的时间轴
+    """
+    with _timelines_lock:
+        timeline = _timelines.get(name)
+        if timeline is None:
+            path = os.path.join(ANIMATION_DIR, f"{name}.json")
+            with open(path, "r", encoding="utf-8") as f:
+                timeline = compile_timeline(name, json.load(f))
+            _timelines[name] = timeline
+            logger.debug(f"加载动画 {name}: {len(timeline.tracks)} 条轨道, {timeline.samples} 个采样点")
+        return timeline
+
+
+def clear_timelines() -> None:
+    """清除已编译的时间轴（动画文件修改后重新加载）"""
+    with _timelines_lock:
+        _timelines.clear()
@@ -6,7 +6,6 @@
 
 import sys
 import os
-import json
 import logging
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -147,107 +146,42 @@ class UserPanel(QDialog):
         
         self.setLayout(layout)
     
+    def reload(self):
+        """重新读取用户名，面板重复打开时使用"""
+        self._user_name = ""
+        self._load_user_name()
+        # 内容不变时setText不会触发textChanged，因此显式更新预览
+        self._name_edit.setText(self._user_name)
+        self._update_preview(self._user_name)
+        self._name_edit.setFocus()
+    
     def _update_preview(self, text):
         display_name = text.strip() if text.strip() else "哈罗"
         self._preview_label.setText(f"打招呼时显示：你好，我是{display_name}！")
     
-    def _get_config_dir(self):
-        """获取适合当前系统的配置目录"""
-        # 尝试多个备选目录
-        config_dirs = []
-        
-        if os.name == 'nt':  # Windows
-            # 首选：APPDATA目录
-            appdata = os.environ.get('APPDATA')
-            if appdata:
-                config_dirs.append(os.path.join(appdata, 'Haropet'))
-            # 备选：文档目录
-            docs = os.environ.get('DOCUMENTS', os.path.join(os.path.expanduser("~"), 'Documents'))
-            config_dirs.append(os.path.join(docs, 'Haropet'))
-            # 备选：应用程序当前目录
-            config_dirs.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config'))
-        elif os.name == 'posix':  # Linux/Mac
-            # 首选：用户主目录
-            config_dirs.append(os.path.join(os.path.expanduser("~"), '.haropet'))
-            # 备选：应用程序当前目录
-            config_dirs.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config'))
-        else:
-            # 其他系统：当前目录
-            config_dirs.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config'))
-        
-        # 选择第一个可写的目录
-        for config_dir in config_dirs:
-            try:
-                # 尝试创建目录
-                os.makedirs(config_dir, exist_ok=True)
-                # 检查权限
-                test_file = os.path.join(config_dir, 'test_permission.txt')
-                with open(test_file, 'w') as f:
-                    f.write('test')
-                os.remove(test_file)
-                return config_dir
-            except:
-                continue
-        
-        # 如果所有目录都失败，返回当前目录
-        return os.path.dirname(os.path.abspath(__file__))
-    
-    def _check_permissions(self, directory):
-        """检查目录权限"""
-        try:
-            # 检查是否可写
-            test_file = os.path.join(directory, 'test_permission.txt')
-            with open(test_file, 'w') as f:
-                f.write('test')
-            os.remove(test_file)
-            return True
-        except:
-            return False
-    
     def _load_user_name(self):
-        config_dir = self._get_config_dir()
-        config_file = os.path.join(config_dir, "user_config.json")
-        
-        if os.path.exists(config_file):
-            try:
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                    self._user_name = config.get("user_name", "")
-            except Exception as e:
-                self._logger.warning(f"加载用户名失败: {e}")
-                self._user_name = ""
+        # 用户名已由配置管理器加载，打开面板不再读写配置目录
+        self._user_name = config_manager.get("user_name", "")
     
     def _save_user_name(self):
         user_name = self._name_edit.text().strip()
         
-        config_dir = self._get_config_dir()
-        
-        try:
-            # 确保目录存在
-            os.makedirs(config_dir, exist_ok=True)
-            
-            # 检查权限
-            if not self._check_permissions(config_dir):
-                self._logger.error(f"配置目录无写入权限: {config_dir}")
-                QMessageBox.warning(self, "权限错误", "无法保存设置：配置目录无写入权限。请检查文件夹权限设置。")
-                return
-            
-            config_file = os.path.join(config_dir, "user_config.json")
-            config = {
-                "user_name": user_name
-            }
-            
-            with open(config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, ensure_ascii=False, indent=2)
-            
-            # 更新ConfigManager中的内存数据，确保打招呼功能立即使用新名称
-            config_manager.set_user_name(user_name)
-            
-            self.accept()
-        except Exception as e:
-            self._logger.error(f"保存用户名失败: {e}")
-            error_msg = f"保存失败: {str(e)}\n\n请确保您有足够的权限访问用户目录。"
+        # 检查权限
+        if not config_manager.is_config_dir_writable():
+            self._logger.error(f"配置目录无写入权限: {config_manager.get_app_data_path()}")
+            QMessageBox.warning(self, "权限错误", "无法保存设置：配置目录无写入权限。请检查文件夹权限设置。")
+            return
+        
+        # 更新ConfigManager中的内存数据，确保打招呼功能立即使用新名称，并立即写入
+        config_manager.set_user_name(user_name)
+        if not config_manager.save_user_config():
+            self._logger.error("保存用户名失败")
+            error_msg = "保存失败\n\n请确保您有足够的权限访问用户目录。"
             QMessageBox.warning(self, "错误", error_msg)
+            return
+        
+        self._user_name = user_name
+        self.accept()
     
     def get_user_name(self):
         return self._user_name or "用户"
@@ -10,10 +10,11 @@ import logging
 import platform
 import time
 import random
-from typing import Optional, Tuple, Any, Dict
+from typing import Optional, Tuple, Any, Dict, TYPE_CHECKING
 
-from PyQt5.QtGui import QPixmap, QIcon, QImage
-from PyQt5.QtCore import Qt
+# PyQt5 只在图像和界面工具函数内部导入，文件、时间等工具不必加载Qt
+if TYPE_CHECKING:
+    from PyQt5.QtGui import QPixmap, QIcon, QImage
 
 logger = logging.getLogger('Haropet.Utils')
 
@@ -70,15 +71,18 @@ class FileUtils:
     
     @staticmethod
     def get_config_directory() -> str:
-        """获取配置文件目录"""
-        return os.path.join(os.path.expanduser("~"), ".haropet")
+        """获取配置文件目录（与配置管理器解析出的目录一致）"""
+        from haropet.config_manager import config_manager
+        return config_manager.get_app_data_path()
 
 class ImageUtils:
     """图像工具类"""
     
     @staticmethod
-    def load_pixmap(image_path: str, size: Optional[Tuple[int, int]] = None) -> Optional[QPixmap]:
+    def load_pixmap(image_path: str, size: Optional[Tuple[int, int]] = None) -> Optional['QPixmap']:
         """加载图像为QPixmap"""
+        from PyQt5.QtGui import QPixmap
+        from PyQt5.QtCore import Qt
         try:
             pixmap = QPixmap(image_path)
             if pixmap.isNull():
@@ -94,21 +98,23 @@ class ImageUtils:
             return None
     
     @staticmethod
-    def load_icon(icon_path: str, size: Optional[Tuple[int, int]] = None) -> Optional[QIcon]:
+    def load_icon(icon_path: str, size: Optional[Tuple[int, int]] = None) -> Optional['QIcon']:
         """加载图像为QIcon"""
+        from PyQt5.QtGui import QIcon
         pixmap = ImageUtils.load_pixmap(icon_path, size)
         if pixmap:
             return QIcon(pixmap)
         return None
     
     @staticmethod
-    def pixmap_to_image(pixmap: QPixmap) -> QImage:
+    def pixmap_to_image(pixmap: 'QPixmap') -> 'QImage':
         """将QPixmap转换为QImage"""
         return pixmap.toImage()
     
     @staticmethod
-    def image_to_pixmap(image: QImage) -> QPixmap:
+    def image_to_pixmap(image: 'QImage') -> 'QPixmap':
         """将QImage转换为QPixmap"""
+        from PyQt5.QtGui import QPixmap
         return QPixmap.fromImage(image)
 
 class SystemUtils:
@@ -178,8 +184,10 @@ class UIUtils:
         widget.move(x, y)
     
     @staticmethod
-    def create_transparent_pixmap(width: int, height: int) -> QPixmap:
+    def create_transparent_pixmap(width: int, height: int) -> 'QPixmap':
         """创建透明的QPixmap"""
+        from PyQt5.QtGui import QPixmap
+        from PyQt5.QtCore import Qt
         pixmap = QPixmap(width, height)
         pixmap.fill(Qt.transparent)
         return pixmap
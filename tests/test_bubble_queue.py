@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+气泡消息队列测试
+"""
+
+import os
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QApplication
+
+from haropet.bubble_queue import BubbleQueue
+from haropet.config_manager import config_manager
+
+INTERVAL = 30
+
+
+class BubbleQueueTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self._saved = (config_manager.BUBBLE_MIN_INTERVAL, config_manager.BUBBLE_QUEUE_SIZE)
+        config_manager.BUBBLE_MIN_INTERVAL = INTERVAL
+        config_manager.BUBBLE_QUEUE_SIZE = 3
+        self.shown = []
+        self.queue = BubbleQueue(self.shown.append)
+
+    def tearDown(self):
+        self.queue.clear()
+        config_manager.BUBBLE_MIN_INTERVAL, config_manager.BUBBLE_QUEUE_SIZE = self._saved
+
+    def _wait(self, bubbles: int = 1) -> None:
+        QTest.qWait(INTERVAL * bubbles + 50)
+
+    def test_first_bubble_is_shown_immediately(self):
+        self.queue.post("你好")
+        self.assertEqual(self.shown, ["你好"])
+
+    def test_repeated_posts_coalesce_with_count(self):
+        self.queue.post("第一条")
+        for _ in range(3):
+            self.queue.post("哈罗!", coalesce_key="greet", burst_text="哈罗")
+        self.assertEqual(self.queue.pending_count(), 1)
+
+        self._wait()
+
+        self.assertEqual(self.shown, ["第一条", "哈罗×3"])
+        self.assertEqual(self.queue.get_stats()["coalesced"], 2)
+
+    def test_single_pending_bubble_keeps_its_text(self):
+        self.queue.post("第一条")
+        self.queue.post("哈罗!", coalesce_key="greet", burst_text="哈罗")
+        self._wait()
+
+        self.assertEqual(self.shown, ["第一条", "哈罗!"])
+
+    def test_higher_priority_is_shown_first(self):
+        self.queue.post("第一条")
+        self.queue.post("普通", priority=1)
+        self.queue.post("重要", priority=0)
+        self._wait(2)
+
+        self.assertEqual(self.shown, ["第一条", "重要", "普通"])
+
+    def test_full_queue_drops_lowest_priority_newest(self):
+        self.queue.post("第一条")
+        self.queue.post("a", priority=0)
+        self.queue.post("b", priority=1)
+        self.queue.post("c", priority=0)
+        self.queue.post("d", priority=1)
+
+        self.assertEqual(self.queue.pending_count(), 3)
+        self.assertEqual(self.queue.get_stats()["dropped"], 1)
+        self._wait(3)
+        self.assertEqual(self.shown, ["第一条", "a", "c", "b"])
+
+    def test_bubbles_respect_min_interval(self):
+        self.queue.post("第一条")
+        self.queue.post("第二条")
+        self.assertEqual(self.shown, ["第一条"])
+
+        self._wait()
+        self.assertEqual(self.shown, ["第一条", "第二条"])
+
+
+if __name__ == "__main__":
+    unittest.main()
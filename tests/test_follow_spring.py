@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+跟随弹簧测试
+"""
+
+import unittest
+
+from haropet.follow_spring import SpringFollower
+
+FRAME = 0.016
+
+
+class SpringFollowerTest(unittest.TestCase):
+
+    def _run(self, follower: SpringFollower, frames: int, adjust=None):
+        now = 100.0
+        position = follower.position()
+        for _ in range(frames):
+            position = follower.step(now)
+            if adjust is not None:
+                position = adjust(position)
+                follower.sync_position(*position)
+            now += FRAME
+        return position
+
+    def test_reaches_target_and_rests(self):
+        follower = SpringFollower()
+        follower.reset(0, 0)
+        follower.set_target(200, 100)
+
+        position = self._run(follower, 180)
+
+        self.assertEqual(position, (200, 100))
+        self.assertTrue(follower.is_at_rest())
+
+    def test_no_overshoot(self):
+        follower = SpringFollower()
+        follower.reset(0, 0)
+        follower.set_target(200, 0)
+
+        now = 100.0
+        for _ in range(180):
+            x, _ = follower.step(now)
+            self.assertLessEqual(x, 200)
+            now += FRAME
+
+    def test_keeps_moving_when_window_is_nudged_every_frame(self):
+        follower = SpringFollower()
+        follower.reset(0, 0)
+        follower.set_target(200, 0)
+
+        # 窗口管理器每帧把窗口往回挪1像素
+        position = self._run(follower, 120, adjust=lambda p: (max(0, p[0] - 1), p[1]))
+
+        self.assertGreater(position[0], 150)
+
+    def test_reset_stops_motion(self):
+        follower = SpringFollower()
+        follower.reset(0, 0)
+        follower.set_target(200, 0)
+        self._run(follower, 10)
+
+        follower.reset(50, 50)
+
+        self.assertTrue(follower.is_at_rest())
+        self.assertEqual(self._run(follower, 10), (50, 50))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+帧时钟测试
+"""
+
+import os
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QPoint
+from PyQt5.QtWidgets import QApplication, QWidget
+
+from haropet.frame_clock import FrameClock
+
+
+class FrameClockTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_pending_move_to_origin_is_visible_in_frame(self):
+        window = QWidget()
+        window.move(50, 50)
+        clock = FrameClock(window)
+        seen = []
+        clock.add("mover", lambda now: clock.move_window(0, 0), 0, 16)
+        clock.add("reader", lambda now: seen.append(clock.window_pos()), 1, 16)
+        clock.start("mover")
+        clock.start("reader")
+
+        clock.tick()
+        clock.stop_all()
+
+        self.assertEqual(seen, [QPoint(0, 0)])
+        self.assertEqual(window.pos(), QPoint(0, 0))
+
+    def test_slow_subscriber_keeps_its_own_interval(self):
+        clock = FrameClock(QWidget())
+        calls = {"fast": 0, "slow": 0}
+        clock.add("fast", lambda now: calls.__setitem__("fast", calls["fast"] + 1), 0, 16)
+        clock.add("slow", lambda now: calls.__setitem__("slow", calls["slow"] + 1), 1, 250)
+        clock.start("fast")
+        clock.start("slow")
+
+        # 定时器按最短间隔运行，1秒约62帧
+        for i in range(62):
+            clock.tick(100.0 + i * 0.016)
+        clock.stop_all()
+
+        self.assertEqual(calls["fast"], 62)
+        self.assertEqual(calls["slow"], 4)
+
+    def test_restart_with_new_interval_is_due_immediately(self):
+        clock = FrameClock(QWidget())
+        calls = []
+        clock.add("follow", calls.append, 0, 250)
+        clock.start("follow")
+        clock.tick(100.0)
+        clock.start("follow", 16)
+        clock.tick(100.016)
+        clock.stop_all()
+
+        self.assertEqual(calls, [100.0, 100.016])
+
+
+if __name__ == "__main__":
+    unittest.main()
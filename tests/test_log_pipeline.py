@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+日志限流测试
+"""
+
+import queue
+import logging
+import unittest
+
+from haropet.log_pipeline import ThrottledQueueHandler
+
+
+class ThrottledQueueHandlerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.queue = queue.SimpleQueue()
+        self.handler = ThrottledQueueHandler(self.queue)
+
+    def _emit(self, message: str) -> None:
+        self.handler.handle(logging.makeLogRecord(
+            {"name": "Haropet", "levelno": logging.INFO, "levelname": "INFO", "msg": message}))
+
+    def _drain(self):
+        messages = []
+        while not self.queue.empty():
+            messages.append(self.queue.get().getMessage())
+        return messages
+
+    def test_toggling_throttle_does_not_swallow_next_message(self):
+        self._emit("日志模式: 安静")
+        self.handler.set_throttle(False)
+        self._emit("日志模式: 详细")
+        self.handler.set_throttle(True)
+        self._emit("日志模式: 安静")
+
+        self.assertEqual(self._drain(), ["日志模式: 安静", "日志模式: 详细", "日志模式: 安静"])
+
+    def test_toggling_throttle_flushes_pending_repeats(self):
+        for _ in range(3):
+            self._emit("same")
+        self.handler.set_throttle(False)
+
+        self.assertEqual(self._drain(), ["same", "上一条消息重复了 2 次"])
+
+
+if __name__ == "__main__":
+    unittest.main()
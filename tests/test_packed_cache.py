@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+打包图标缓存测试
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtGui import QColor, QImage
+
+from haropet.packed_cache import PackedIconCache
+
+
+def _solid_image(color: QColor, size: int = 48) -> QImage:
+    image = QImage(size, size, QImage.Format_ARGB32_Premultiplied)
+    image.fill(color)
+    return image
+
+
+class PackedIconCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix="haropet_pak_")
+        self.path = os.path.join(self.root, "icons.pak")
+        self.cache = PackedIconCache(self.path, max_entries=4)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_round_trip(self):
+        red = _solid_image(QColor(200, 30, 30))
+        self.assertTrue(self.cache.put("a", red))
+
+        image = self.cache.get_image("a")
+        self.assertEqual(image, red)
+        self.assertIsNone(self.cache.get_image("missing"))
+
+    def test_unchanged_content_is_not_rewritten(self):
+        red = _solid_image(QColor(200, 30, 30))
+        self.assertTrue(self.cache.put("a", red))
+        self.assertFalse(self.cache.put("a", red))
+        self.assertEqual(self.cache.get_stats()["appends"], 1)
+
+    def test_image_survives_remap(self):
+        self.cache.put("a", _solid_image(QColor(200, 30, 30)))
+        image = self.cache.get_image("a")
+        # 追加后读取新条目会重新映射文件，关闭旧映射
+        self.cache.put("b", _solid_image(QColor(30, 200, 30)))
+        self.cache.get_image("b")
+
+        self.assertEqual(image.pixelColor(0, 0), QColor(200, 30, 30))
+
+    def test_image_survives_compaction(self):
+        self.cache.put("a", _solid_image(QColor(200, 30, 30)))
+        image = self.cache.get_image("a")
+        self.cache.put("a", _solid_image(QColor(30, 30, 200)))
+        self.cache.compact()
+
+        self.assertEqual(image.pixelColor(0, 0), QColor(200, 30, 30))
+        self.assertEqual(self.cache.get_image("a").pixelColor(0, 0), QColor(30, 30, 200))
+
+    def test_compaction_keeps_newest_entries_and_reopens(self):
+        for i in range(6):
+            self.cache.put(f"k{i}", _solid_image(QColor(i * 40, 0, 0)))
+        # 条目超过上限时写入会启动后台压缩，等它完成
+        for thread in threading.enumerate():
+            if thread.name == "HaropetCacheCompactor":
+                thread.join()
+        self.cache.compact()
+        self.assertEqual(sorted(self.cache._index), ["k2", "k3", "k4", "k5"])
+
+        self.cache.close()
+        reopened = PackedIconCache(self.path, max_entries=4)
+        try:
+            self.assertEqual(len(reopened), 4)
+            self.assertEqual(reopened.get_image("k5").pixelColor(0, 0), QColor(200, 0, 0))
+        finally:
+            reopened.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+渲染缓存测试
+"""
+
+import unittest
+
+from PyQt5.QtGui import QImage
+
+from haropet.render_cache import RenderCache
+
+# 48x48的图像占用 48*48*4 字节
+ICON_BYTES = 48 * 48 * 4
+
+
+def _image(size: int = 48) -> QImage:
+    return QImage(size, size, QImage.Format_ARGB32_Premultiplied)
+
+
+class RenderCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = RenderCache(3 * ICON_BYTES, "test")
+
+    def _key(self, state: str, renderer: str = "icon"):
+        return RenderCache.make_key(renderer, state, 48)
+
+    def test_tracks_bytes(self):
+        self.cache.put(self._key("a"), _image())
+        self.cache.put(self._key("b"), _image())
+        self.assertEqual(self.cache.total_bytes, 2 * ICON_BYTES)
+
+        # 替换同一个键不会重复计算
+        self.cache.put(self._key("a"), _image())
+        self.assertEqual(self.cache.total_bytes, 2 * ICON_BYTES)
+
+        self.cache.discard(self._key("b"))
+        self.assertEqual(self.cache.total_bytes, ICON_BYTES)
+
+    def test_evicts_least_recently_used(self):
+        for state in ("a", "b", "c"):
+            self.cache.put(self._key(state), _image())
+        # 访问a后，b成为最久未使用的项
+        self.assertIsNotNone(self.cache.get(self._key("a")))
+        self.cache.put(self._key("d"), _image())
+
+        self.assertNotIn(self._key("b"), self.cache)
+        for state in ("a", "c", "d"):
+            self.assertIn(self._key(state), self.cache)
+        self.assertEqual(self.cache.total_bytes, 3 * ICON_BYTES)
+        self.assertEqual(self.cache.get_stats()["evictions"], 1)
+
+    def test_large_image_evicts_several_entries(self):
+        for state in ("a", "b", "c"):
+            self.cache.put(self._key(state), _image())
+        # 80x80 的图像占用 25600 字节，预算内放不下其他任何一项
+        self.cache.put(self._key("big"), _image(80))
+
+        self.assertEqual(len(self.cache), 1)
+        self.assertIn(self._key("big"), self.cache)
+        self.assertEqual(self.cache.total_bytes, 80 * 80 * 4)
+        self.assertEqual(self.cache.get_stats()["evictions"], 3)
+
+    def test_oversized_image_is_not_cached(self):
+        self.cache.put(self._key("a"), _image())
+        self.cache.put(self._key("huge"), _image(200))
+
+        self.assertNotIn(self._key("huge"), self.cache)
+        self.assertIn(self._key("a"), self.cache)
+
+    def test_clear_by_renderer(self):
+        self.cache.put(self._key("a"), _image())
+        self.cache.put(self._key("a", "tray_fallback"), _image())
+
+        self.cache.clear("tray_fallback")
+
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cache.total_bytes, ICON_BYTES)
+
+    def test_key_separates_dpr_and_palette(self):
+        base = RenderCache.make_key("icon", "a", 48, 1.0, {"body": (1, 2, 3)})
+        self.assertNotEqual(base, RenderCache.make_key("icon", "a", 48, 2.0, {"body": (1, 2, 3)}))
+        self.assertNotEqual(base, RenderCache.make_key("icon", "a", 48, 1.0, {"body": (1, 2, 4)}))
+        self.assertEqual(base, RenderCache.make_key("icon", "a", 48, 1.001, {"body": (1, 2, 3)}))
+
+
+if __name__ == "__main__":
+    unittest.main()
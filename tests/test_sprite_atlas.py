@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+精灵图集测试
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+
+from haropet.sprite_atlas import SpriteAtlas
+
+SIZE = 64
+
+
+class SpriteAtlasTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix="haropet_atlas_")
+        self.atlas = SpriteAtlas(self.root)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_sync_path_reuses_started_prerender_job(self):
+        job = self.atlas.make_prerender_job(SIZE)
+        worker = threading.Thread(target=job.render)
+        worker.start()
+        worker.join()
+
+        self.atlas.frame("normal", SIZE)
+
+        self.assertEqual(self.atlas.get_stats()["rendered"], 1)
+
+    def test_sync_path_cancels_queued_prerender_job(self):
+        job = self.atlas.make_prerender_job(SIZE)
+        self.atlas.frame("normal", SIZE)
+
+        # 工作线程随后才开始时，任务已被取消，不会再绘制
+        self.assertIsNone(job.render())
+        self.assertEqual(self.atlas.get_stats()["rendered"], 1)
+
+    def test_saved_atlas_is_loaded_without_temp_files(self):
+        self.atlas.frame("normal", SIZE)
+        other = SpriteAtlas(self.root)
+        other.frame("normal", SIZE)
+
+        self.assertEqual(other.get_stats(), dict(other.get_stats(), rendered=0, loaded=1))
+        self.assertFalse([name for name in os.listdir(self.root) if name.endswith(".tmp")])
+
+
+if __name__ == "__main__":
+    unittest.main()
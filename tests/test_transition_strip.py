@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+过渡帧条测试
+帧条中的每一帧必须和单独绘制在48x48图像上的同一帧完全一致
+"""
+
+import os
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage, QPainter
+from PyQt5.QtWidgets import QApplication
+
+from haropet.config_manager import config_manager
+from haropet.icon_manager import IconManager
+
+
+class TransitionStripTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+        cls.icon_manager = IconManager()
+
+    def _render_single_frame(self, from_state: str, to_state: str, index: int) -> QImage:
+        """按旧的逐帧方式单独绘制一帧"""
+        manager = self.icon_manager
+        frames = config_manager.TRANSITION_FRAMES
+        palettes = manager._interpolate_palettes(
+            manager._get_state_colors(from_state), manager._get_state_colors(to_state), frames
+        )
+        progress = index / (frames - 1) if frames > 1 else 1.0
+
+        image = QImage(48, 48, QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.transparent)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        manager._apply_transition_transform(painter, progress)
+        manager._draw_haro_icon(painter, palettes[index])
+        painter.end()
+        return image
+
+    def test_cells_match_single_frame_renders(self):
+        frames = config_manager.TRANSITION_FRAMES
+        for from_state, to_state in (("normal", "excited"), ("happy", "sleeping")):
+            strip = self.icon_manager.render_transition_strip(from_state, to_state)
+            self.assertEqual((strip.width(), strip.height()), (48 * frames, 48))
+            for index in range(frames):
+                with self.subTest(pair=(from_state, to_state), frame=index):
+                    cell = strip.copy(index * 48, 0, 48, 48)
+                    expected = self._render_single_frame(from_state, to_state, index)
+                    self.assertEqual(cell, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()